@@ -0,0 +1,95 @@
+"""Índices para las columnas de filtrado más usadas
+
+Revision ID: 0001_hot_filter_indexes
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_hot_filter_indexes"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Umbral de stock bajo cubierto por el índice parcial (coincide con stock_crud.get_low_stock)
+LOW_STOCK_THRESHOLD = 5
+
+# (nombre, tabla, columnas, único, condición del índice parcial)
+# También los usa scripts/benchmark_indexes.py para comparar planes antes/después.
+# data/create_tables.sql crea los mismos índices (el único, como restricción de la
+# tabla): la migración no recrea los que ya existen.
+INDEXES = [
+    # stock: (sku, warehouse_id) único; su prefijo sirve también a los filtros por sku
+    ("uq_stock_sku_warehouse", "stock", ["sku", "warehouse_id"], True, None),
+    ("ix_stock_warehouse_id", "stock", ["warehouse_id"], False, None),
+    ("ix_stock_low_quantity", "stock", ["quantity"], False, f"quantity <= {LOW_STOCK_THRESHOLD}"),
+    # interventions: agenda por técnico y fecha, y filtros por cliente/equipo/rango de fechas
+    ("ix_interventions_technician_date", "interventions", ["technician_id", "date"], False, None),
+    ("ix_interventions_client_id", "interventions", ["client_id"], False, None),
+    ("ix_interventions_equipment_id", "interventions", ["equipment_id"], False, None),
+    ("ix_interventions_date", "interventions", ["date"], False, None),
+    # chat_messages: mensajes de una sesión en orden cronológico
+    ("ix_chat_messages_chat_timestamp", "chat_messages", ["chat_id", "message_timestamp"], False, None),
+    # order_items: elementos de un pedido
+    ("ix_order_items_order_id", "order_items", ["order_id"], False, None),
+    # contracts: vencimientos y contratos por cliente
+    ("ix_contracts_end_date", "contracts", ["end_date"], False, None),
+    ("ix_contracts_client_id", "contracts", ["client_id"], False, None),
+    # knowledge_feedback: filtros por estado y por tipo de usuario (+ estado)
+    ("ix_knowledge_feedback_status", "knowledge_feedback", ["status"], False, None),
+    ("ix_knowledge_feedback_user_type_status", "knowledge_feedback", ["user_type", "status"], False, None),
+]
+
+
+def _check_stock_duplicates() -> None:
+    """Aborta con un mensaje claro si hay (sku, warehouse_id) duplicados antes del UNIQUE"""
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT sku, warehouse_id, COUNT(*) FROM stock "
+        "GROUP BY sku, warehouse_id HAVING COUNT(*) > 1 LIMIT 5"
+    )).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            f"Existen registros de stock duplicados por (sku, warehouse_id), p. ej. {duplicates}; "
+            "consolídalos antes de aplicar esta migración"
+        )
+
+
+def _is_constraint(name: str) -> bool:
+    """True si el índice único pertenece a una restricción UNIQUE (y no se puede borrar con DROP INDEX)"""
+    if op.get_bind().dialect.name != "postgresql":
+        return False
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": name}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    _check_stock_duplicates()
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    # En PostgreSQL se crean con CONCURRENTLY para no bloquear escrituras en tablas grandes
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+                postgresql_concurrently=is_postgres,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _columns, unique, _where in reversed(INDEXES):
+            if unique and _is_constraint(name):
+                # Creado por data/create_tables.sql como restricción de la tabla
+                op.drop_constraint(name, table, type_="unique")
+            else:
+                op.drop_index(name, table_name=table, postgresql_concurrently=is_postgres, if_exists=True)
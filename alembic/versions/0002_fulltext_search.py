@@ -0,0 +1,52 @@
+"""Búsqueda de texto completo en mensajes de chat y feedback de conocimiento
+
+Revision ID: 0002_fulltext_search
+Revises: 0001_hot_filter_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_fulltext_search"
+down_revision = "0001_hot_filter_indexes"
+branch_labels = None
+depends_on = None
+
+# (tabla, columna) con búsqueda de texto; debe coincidir con search_columns de los CRUD
+SEARCH_COLUMNS = [
+    ("chat_messages", "message_text"),
+    ("knowledge_feedback", "question"),
+    ("knowledge_feedback", "expected_answer"),
+]
+
+# Debe coincidir con backend.db.fulltext.SEARCH_CONFIG
+SEARCH_CONFIG = "spanish"
+
+
+def upgrade() -> None:
+    # Solo PostgreSQL: en SQLite las tablas FTS5 se crean junto con las tablas
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            # Búsqueda ranqueada: to_tsvector('spanish', ...) @@ websearch_to_tsquery(...)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_fts ON {table} "
+                f"USING gin (to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')))"
+            )
+            # Búsquedas parciales ILIKE '%texto%' existentes (search_by_text, search_by_question...)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_trgm ON {table} "
+                f"USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table, column in reversed(SEARCH_COLUMNS):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_trgm")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_fts")
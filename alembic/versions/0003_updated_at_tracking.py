@@ -0,0 +1,50 @@
+"""Seguimiento de created_at/updated_at en productos, stock y almacenes
+
+Revision ID: 0003_updated_at_tracking
+Revises: 0002_fulltext_search
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_updated_at_tracking"
+down_revision = "0002_fulltext_search"
+branch_labels = None
+depends_on = None
+
+# Tablas con created_at/updated_at en las respuestas de sus listados
+TRACKED_TABLES = ["products", "stock", "warehouses"]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Las columnas ya vienen en data/create_tables.sql y los modelos las mantienen
+    # con onupdate; aquí se añaden a bases anteriores y el trigger cubre además las
+    # escrituras fuera del ORM (scripts de carga, SQL manual)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TRACKED_TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT now()")
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Las columnas se conservan: los modelos y esquemas de respuesta las usan
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
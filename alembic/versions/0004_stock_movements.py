@@ -0,0 +1,63 @@
+"""Libro de movimientos y reservas de stock
+
+Revision ID: 0004_stock_movements
+Revises: 0003_updated_at_tracking
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_stock_movements"
+down_revision = "0003_updated_at_tracking"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    """Las tablas también las crea data/create_tables.sql en instalaciones nuevas"""
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("stock_movements"):
+        op.create_table(
+            "stock_movements",
+            sa.Column("movement_id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("stock_id", sa.Integer(), sa.ForeignKey("stock.stock_id"), nullable=False),
+            sa.Column("sku", sa.String(), nullable=False),
+            sa.Column("warehouse_id", sa.Integer(), nullable=False),
+            sa.Column("movement_type", sa.String(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("quantity_after", sa.Integer()),
+            sa.Column("reference", sa.String()),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+    op.create_index("ix_stock_movements_stock_id", "stock_movements", ["stock_id"], if_not_exists=True)
+    op.create_index("ix_stock_movements_reference", "stock_movements", ["reference"], if_not_exists=True)
+
+    if not _has_table("stock_reservations"):
+        op.create_table(
+            "stock_reservations",
+            sa.Column("reservation_id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("stock_id", sa.Integer(), sa.ForeignKey("stock.stock_id"), nullable=False),
+            sa.Column("sku", sa.String(), nullable=False),
+            sa.Column("warehouse_id", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("reference", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False, server_default="reservada"),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+    op.create_index(
+        "ix_stock_reservations_reference_status", "stock_reservations", ["reference", "status"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_reservations_reference_status", table_name="stock_reservations")
+    op.drop_table("stock_reservations")
+    op.drop_index("ix_stock_movements_reference", table_name="stock_movements")
+    op.drop_index("ix_stock_movements_stock_id", table_name="stock_movements")
+    op.drop_table("stock_movements")
@@ -0,0 +1,40 @@
+"""Índice de carga de trabajo diaria por técnico
+
+Revision ID: 0005_technician_workload
+Revises: 0004_stock_movements
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_technician_workload"
+down_revision = "0004_stock_movements"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # data/create_tables.sql ya crea y rellena la tabla en instalaciones nuevas
+    if not sa.inspect(op.get_bind()).has_table("technician_workload"):
+        op.create_table(
+            "technician_workload",
+            sa.Column("technician_id", sa.Integer(), sa.ForeignKey("technicians.technician_id"), primary_key=True),
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("interventions", sa.Integer(), nullable=False, server_default="0"),
+        )
+    op.create_index("ix_technician_workload_day", "technician_workload", ["day"], if_not_exists=True)
+    # Carga inicial a partir de las intervenciones existentes (recalcula si ya había filas)
+    op.execute("""
+        INSERT INTO technician_workload (technician_id, day, interventions)
+        SELECT technician_id, date, count(*) FROM interventions
+        WHERE technician_id IS NOT NULL
+        GROUP BY technician_id, date
+        ON CONFLICT (technician_id, day) DO UPDATE SET interventions = EXCLUDED.interventions
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_technician_workload_day", table_name="technician_workload")
+    op.drop_table("technician_workload")
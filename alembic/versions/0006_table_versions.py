@@ -0,0 +1,44 @@
+"""Versión por tabla para los ETag de los listados de catálogo
+
+Revision ID: 0006_table_versions
+Revises: 0005_technician_workload
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from backend.db.table_versions import VERSIONS_TABLE, drop_table_version_ddl, table_version_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_table_versions"
+down_revision = "0005_technician_workload"
+branch_labels = None
+depends_on = None
+
+# Tablas cuyos listados usan ETag (huella: versión en table_versions)
+TRACKED_TABLES = ["products", "stock", "warehouses"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # data/create_tables.sql ya crea la tabla y los triggers en instalaciones nuevas
+    if not sa.inspect(bind).has_table(VERSIONS_TABLE):
+        op.create_table(
+            VERSIONS_TABLE,
+            sa.Column("table_name", sa.String(), primary_key=True),
+            sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+    for table in TRACKED_TABLES:
+        for statement in table_version_ddl(table, bind.dialect.name):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in TRACKED_TABLES:
+        for statement in drop_table_version_ddl(table, bind.dialect.name):
+            op.execute(statement)
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table(VERSIONS_TABLE)
@@ -5,6 +5,8 @@ Centraliza todas las rutas de los diferentes módulos
 """
 from fastapi import APIRouter
 
+from backend.crud.cache import cache_report
+
 from backend.api.v1.endpoints import (
     clients,
     products,
@@ -32,6 +34,11 @@ async def api_root():
 async def ping():
     return {"message": "pong"}
 
+# Estadísticas de la caché de entidades (ratio de aciertos por modelo)
+@api_router.get("/cache/stats")
+async def cache_stats():
+    return cache_report()
+
 # Incluir todos los routers de endpoints
 api_router.include_router(clients.router, prefix="/clients", tags=["clients"])
 api_router.include_router(products.router, prefix="/products", tags=["products"])
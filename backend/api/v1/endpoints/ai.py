@@ -9,7 +9,7 @@ from typing import Annotated, List, Dict
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.db.session import get_db, get_read_db
 from backend.services.ai_service import get_ai_service, AIService
 from backend.schemas.ai_schema import (
     SQLQueryRequest, SQLQueryResponse, BusinessInsightsResponse,
@@ -27,7 +27,7 @@ router = APIRouter()
 @router.post("/sql-query", response_model=SQLQueryResponse)
 async def execute_sql_query(
     request: SQLQueryRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> SQLQueryResponse:
     """
     Ejecuta consultas SQL en lenguaje natural usando IA
@@ -40,7 +40,7 @@ async def execute_sql_query(
     try:
         start_time = time.time()
         
-        logger.info(f"Nueva consulta SQL: '{request.query}' de rol: {request.user_role}")
+        logger.info("Nueva consulta SQL: '%s' de rol: %s", request.query, request.user_role)
         
         # Obtener servicio de IA
         ai_service = get_ai_service(db)
@@ -88,7 +88,7 @@ async def execute_sql_query(
 @router.get("/insights", response_model=BusinessInsightsResponse)
 async def get_business_insights(
     user_role: UserRole = UserRole.administrador,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> BusinessInsightsResponse:
     """
     Obtiene insights automáticos del negocio
@@ -142,15 +142,16 @@ async def query_knowledge_base(
     logger = get_logger()
     
     try:
-        logger.info(f"Consulta de conocimiento RAG: '{request.query}'")
+        logger.info("Consulta de conocimiento RAG: '%s'", request.query)
         
         # Crear instancia del servicio RAG
         rag_service = RAGService(db)
         
         # Realizar la consulta al sistema RAG
+        question = f"{request.query}\n\nContexto adicional: {request.context}" if request.context else request.query
         result = await rag_service.query_knowledge(
-            query=request.query,
-            context=request.context
+            question=question,
+            include_sources=request.include_sources
         )
         
         if result["success"]:
@@ -190,7 +191,7 @@ def submit_feedback(
     Submete feedback del usuario sobre respuestas de IA
     """
     logger = get_logger()
-    logger.info(f"Recibiendo feedback: usuario_tipo={feedback.user_type}, rating={feedback.rating}")
+    logger.info("Recibiendo feedback: usuario_tipo=%s, rating=%s", feedback.user_type, feedback.rating)
     
     try:
         # Crear instancia de CRUD
@@ -309,7 +310,7 @@ async def get_query_examples():
 @router.get("/schema")
 async def get_database_schema_info(
     user_role: UserRole = UserRole.administrador,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna información del schema de la base de datos según el rol del usuario
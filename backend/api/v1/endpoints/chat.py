@@ -3,10 +3,12 @@
 Endpoints CRUD para sesiones y mensajes de chat
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.export import EXPORT_FORMAT_PATTERN, export_response
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, rows_response, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.crud import chat_session_crud, chat_message_crud
 from backend.schemas.chat_session_schema import (
     ChatSessionCreate,
@@ -16,11 +18,15 @@ from backend.schemas.chat_session_schema import (
 from backend.schemas.chat_message_schema import (
     ChatMessageCreate,
     ChatMessageUpdate,
-    ChatMessageResponse
+    ChatMessageResponse,
+    ChatMessageSearchResult
 )
 
 router = APIRouter()
 
+# Campos del listado rápido de mensajes (filas como diccionarios, ver rows_response)
+CHAT_MESSAGE_FIELDS = list(ChatMessageResponse.model_fields)
+
 # Endpoints para sesiones de chat
 @router.post("/sessions/", response_model=ChatSessionResponse)
 async def create_chat_session(
@@ -32,17 +38,23 @@ async def create_chat_session(
 
 @router.get("/sessions/", response_model=List[ChatSessionResponse])
 async def read_chat_sessions(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de sesiones de chat con paginación"""
-    return await chat_session_crud.get_multi(db=db, skip=skip, limit=limit)
+    if cursor:
+        return await paginate_by_cursor(chat_session_crud, db, response, cursor=cursor, limit=limit)
+    items = await chat_session_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, chat_session_crud.cursor_after(items, limit))
+    return items
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
 async def read_chat_session(
     session_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener una sesión de chat específica por ID"""
     session = await chat_session_crud.get(db=db, chat_id=session_id)
@@ -84,21 +96,50 @@ async def create_chat_message(
 
 @router.get("/messages/", response_model=List[ChatMessageResponse])
 async def read_chat_messages(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
     session_id: Optional[str] = Query(None, description="Filtrar por ID de sesión"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de mensajes de chat con paginación y filtros opcionales"""
-    if session_id:
-        return await chat_message_crud.get_by_chat(db=db, chat_id=session_id)
-    else:
-        return await chat_message_crud.get_multi(db=db, skip=skip, limit=limit)
+    return await rows_response(
+        chat_message_crud, db, response, fields=CHAT_MESSAGE_FIELDS, skip=skip, limit=limit, cursor=cursor,
+        filters={"chat_id": session_id}
+    )
+
+@router.get("/messages/export")
+async def export_chat_messages(
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN, description="Formato: ndjson o csv"),
+    session_id: Optional[str] = Query(None, description="Filtrar por ID de sesión"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Exportar todos los mensajes de chat en streaming (cursor de servidor, memoria constante)"""
+    rows = chat_message_crud.stream(db, filters={"chat_id": session_id})
+    return export_response(rows, ChatMessageResponse, format=format, filename="chat_messages")
+
+@router.get("/messages/search", response_model=List[ChatMessageSearchResult])
+async def search_chat_messages(
+    q: str = Query(..., min_length=1, description="Texto a buscar"),
+    session_id: Optional[str] = Query(None, description="Filtrar por ID de sesión"),
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(20, ge=1, le=100, description="Número máximo de registros a retornar"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Búsqueda de texto completo en los mensajes de chat, ordenada por relevancia"""
+    results = await chat_message_crud.search(
+        db, text=q, filters={"chat_id": session_id}, skip=skip, limit=limit
+    )
+    return [
+        ChatMessageSearchResult(**ChatMessageResponse.model_validate(message).model_dump(), rank=rank)
+        for message, rank in results
+    ]
 
 @router.get("/messages/session/{chat_id}", response_model=List[ChatMessageResponse])
 async def read_chat_messages_by_session(
     chat_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener todos los mensajes de una sesión de chat específica"""
     messages = await chat_message_crud.get_by_chat(db=db, chat_id=chat_id)
@@ -109,7 +150,7 @@ async def read_chat_messages_by_session(
 @router.get("/messages/{message_id}", response_model=ChatMessageResponse)
 async def read_chat_message(
     message_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un mensaje de chat específico por ID"""
     message = await chat_message_crud.get(db=db, message_id=message_id)
@@ -4,10 +4,11 @@
 Endpoints CRUD para clientes
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.schemas.client_schema import ClientCreate, ClientUpdate, ClientResponse
 from backend.crud import client_crud
 
@@ -23,17 +24,23 @@ async def create_client(
 
 @router.get("/", response_model=List[ClientResponse])
 async def read_clients(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de clientes con paginación"""
-    return await client_crud.get_multi(db=db, skip=skip, limit=limit)
+    if cursor:
+        return await paginate_by_cursor(client_crud, db, response, cursor=cursor, limit=limit)
+    items = await client_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, client_crud.cursor_after(items, limit))
+    return items
 
 @router.get("/{client_id}", response_model=ClientResponse)
 async def read_client(
     client_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un cliente específico por ID"""
     client = await client_crud.get(db=db, client_id=client_id)
@@ -3,16 +3,20 @@
 Endpoints CRUD para contratos
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.crud import contract_crud
 from backend.schemas.contract_schema import (
     ContractCreate,
     ContractUpdate,
-    ContractResponse
+    ContractResponse,
+    ContractExpiryBucket,
+    ContractExpirySummary
 )
+from backend.services.contract_lifecycle_service import contract_expiry_scanner
 
 router = APIRouter()
 
@@ -26,24 +30,57 @@ async def create_contract(
 
 @router.get("/", response_model=List[ContractResponse])
 async def read_contracts(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
     client_id: Optional[int] = Query(None, description="Filtrar por ID de cliente"),
     status: Optional[str] = Query(None, description="Filtrar por estado"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de contratos con paginación y filtros opcionales"""
+    if cursor:
+        return await paginate_by_cursor(
+            contract_crud, db, response, cursor=cursor, limit=limit,
+            filters={"client_id": client_id, "status": status}
+        )
     if client_id:
-        return await contract_crud.get_by_client(db=db, client_id=client_id, skip=skip, limit=limit)
+        items = await contract_crud.get_by_client(db=db, client_id=client_id, skip=skip, limit=limit)
     elif status:
-        return await contract_crud.get_by_status(db=db, status=status, skip=skip, limit=limit)
+        items = await contract_crud.get_by_status(db=db, status=status, skip=skip, limit=limit)
     else:
-        return await contract_crud.get_multi(db=db, skip=skip, limit=limit)
+        items = await contract_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, contract_crud.cursor_after(items, limit))
+    return items
+
+@router.get("/expiring", response_model=ContractExpirySummary)
+async def read_expiring_contracts(
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Contratos por vencer agrupados por horizonte (precalculados en segundo plano).
+    Si una escritura invalidó la instantánea se recalcula aquí, contra el primario.
+    """
+    return await contract_expiry_scanner.get_snapshot(db)
+
+@router.get("/expiring/{horizon_days}", response_model=ContractExpiryBucket)
+async def read_expiring_contracts_bucket(
+    horizon_days: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Contratos que vencen dentro de un horizonte configurado (y no en uno menor)"""
+    bucket = await contract_expiry_scanner.get_bucket(db, horizon_days)
+    if bucket is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Horizonte no configurado; disponibles: {contract_expiry_scanner.horizons_days}"
+        )
+    return bucket
 
 @router.get("/{contract_id}", response_model=ContractResponse)
 async def read_contract(
     contract_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un contrato específico por ID"""
     contract = await contract_crud.get(db=db, contract_id=contract_id)
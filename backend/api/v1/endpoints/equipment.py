@@ -3,10 +3,11 @@
 Endpoints CRUD para equipos instalados
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.crud import equipment_crud
 from backend.schemas.equipment_schema import (
     InstalledEquipmentCreate,
@@ -26,17 +27,23 @@ async def create_equipment(
 
 @router.get("/", response_model=List[InstalledEquipmentResponse])
 async def read_equipment(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de equipos instalados con paginación"""
-    return await equipment_crud.get_multi(db=db, skip=skip, limit=limit)
+    if cursor:
+        return await paginate_by_cursor(equipment_crud, db, response, cursor=cursor, limit=limit)
+    items = await equipment_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, equipment_crud.cursor_after(items, limit))
+    return items
 
 @router.get("/{equipment_id}", response_model=InstalledEquipmentResponse)
 async def read_equipment_item(
     equipment_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un equipo instalado específico por ID"""
     equipment = await equipment_crud.get(db=db, id=equipment_id)
@@ -2,20 +2,33 @@
 """
 Endpoints CRUD para intervenciones
 """
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.export import EXPORT_FORMAT_PATTERN, export_response
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, rows_response
+from backend.db.session import get_db, get_read_db
 from backend.crud import intervention_crud
 from backend.schemas.intervention_schema import (
     InterventionCreate,
     InterventionUpdate,
-    InterventionResponse
+    InterventionResponse,
+    TechnicianSchedule
 )
 
 router = APIRouter()
 
+# Campos del listado rápido (filas como diccionarios, ver rows_response)
+INTERVENTION_FIELDS = list(InterventionResponse.model_fields)
+
+def _list_filters(technician_id: Optional[int], status: Optional[str]) -> dict:
+    """Filtros del listado: technician_id tiene prioridad sobre status, no se combinan"""
+    if technician_id:
+        return {"technician_id": technician_id}
+    return {"status": status}
+
 @router.post("/", response_model=InterventionResponse)
 async def create_intervention(
     intervention: InterventionCreate,
@@ -26,24 +39,51 @@ async def create_intervention(
 
 @router.get("/", response_model=List[InterventionResponse])
 async def read_interventions(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
     technician_id: Optional[int] = Query(None, description="Filtrar por ID de técnico"),
     status: Optional[str] = Query(None, description="Filtrar por estado"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de intervenciones con paginación y filtros opcionales"""
-    if technician_id:
-        return await intervention_crud.get_by_technician(db=db, technician_id=technician_id, skip=skip, limit=limit)
-    elif status:
-        return await intervention_crud.get_by_status(db=db, status=status, skip=skip, limit=limit)
-    else:
-        return await intervention_crud.get_multi(db=db, skip=skip, limit=limit)
+    return await rows_response(
+        intervention_crud, db, response, fields=INTERVENTION_FIELDS, skip=skip, limit=limit, cursor=cursor,
+        filters=_list_filters(technician_id, status)
+    )
+
+@router.get("/upcoming", response_model=List[TechnicianSchedule])
+async def read_upcoming_interventions(
+    per_technician: int = Query(3, ge=1, le=50, description="Intervenciones por técnico"),
+    from_date: Optional[date] = Query(None, description="Desde esta fecha (por defecto hoy)"),
+    zone: Optional[str] = Query(None, description="Filtrar por zona del técnico"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Próximas N intervenciones de cada técnico en una sola consulta"""
+    schedule = await intervention_crud.get_upcoming_by_technician(
+        db=db, per_technician=per_technician, from_date=from_date, zone=zone
+    )
+    return [
+        {"technician_id": technician_id, "interventions": interventions}
+        for technician_id, interventions in schedule.items()
+    ]
+
+@router.get("/export")
+async def export_interventions(
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN, description="Formato: ndjson o csv"),
+    technician_id: Optional[int] = Query(None, description="Filtrar por ID de técnico"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Exportar todas las intervenciones en streaming (cursor de servidor, memoria constante)"""
+    rows = intervention_crud.stream(db, filters=_list_filters(technician_id, status))
+    return export_response(rows, InterventionResponse, format=format, filename="interventions")
 
 @router.get("/{intervention_id}", response_model=InterventionResponse)
 async def read_intervention(
     intervention_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener una intervención específica por ID"""
     intervention = await intervention_crud.get(db=db, intervention_id=intervention_id)
@@ -3,21 +3,30 @@
 Endpoints CRUD para feedback de conocimiento
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.crud import knowledge_feedback_crud
 from backend.schemas.knowledge_feedback_schema import (
     KnowledgeFeedbackCreate,
     KnowledgeFeedbackUpdate,
     KnowledgeFeedbackResponse,
+    KnowledgeFeedbackSearchResult,
     UserType,
     FeedbackStatus
 )
 
 router = APIRouter()
 
+# Columnas sobre las que busca /search según el parámetro `field`
+SEARCH_FIELDS = {
+    "all": ["question", "expected_answer"],
+    "question": ["question"],
+    "answer": ["expected_answer"],
+}
+
 @router.post("/", response_model=KnowledgeFeedbackResponse)
 async def create_knowledge_feedback(
     feedback: KnowledgeFeedbackCreate,
@@ -28,26 +37,53 @@ async def create_knowledge_feedback(
 
 @router.get("/", response_model=List[KnowledgeFeedbackResponse])
 async def read_knowledge_feedback(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
     user_type: Optional[str] = Query(None, description="Filtrar por tipo de usuario"),
     status: Optional[str] = Query(None, description="Filtrar por estado"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de feedback de conocimiento con paginación y filtros opcionales"""
+    if cursor:
+        return await paginate_by_cursor(
+            knowledge_feedback_crud, db, response, cursor=cursor, limit=limit,
+            filters={"user_type": user_type, "status": status}
+        )
     if user_type and status:
-        return await knowledge_feedback_crud.get_by_user_type_and_status(db=db, user_type=user_type, status=status, skip=skip, limit=limit)
+        items = await knowledge_feedback_crud.get_by_user_type_and_status(db=db, user_type=user_type, status=status, skip=skip, limit=limit)
     elif user_type:
-        return await knowledge_feedback_crud.get_by_user_type(db=db, user_type=user_type, skip=skip, limit=limit)
+        items = await knowledge_feedback_crud.get_by_user_type(db=db, user_type=user_type, skip=skip, limit=limit)
     elif status:
-        return await knowledge_feedback_crud.get_by_status(db=db, status=status, skip=skip, limit=limit)
+        items = await knowledge_feedback_crud.get_by_status(db=db, status=status, skip=skip, limit=limit)
     else:
-        return await knowledge_feedback_crud.get_multi(db=db, skip=skip, limit=limit)
+        items = await knowledge_feedback_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, knowledge_feedback_crud.cursor_after(items, limit))
+    return items
+
+@router.get("/search", response_model=List[KnowledgeFeedbackSearchResult])
+async def search_knowledge_feedback(
+    q: str = Query(..., min_length=1, description="Texto a buscar"),
+    field: str = Query("all", pattern="^(all|question|answer)$", description="Buscar en pregunta, respuesta o ambas"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(20, ge=1, le=100, description="Número máximo de registros a retornar"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Búsqueda de texto completo en el feedback de conocimiento, ordenada por relevancia"""
+    results = await knowledge_feedback_crud.search(
+        db, text=q, columns=SEARCH_FIELDS[field], filters={"status": status}, skip=skip, limit=limit
+    )
+    return [
+        KnowledgeFeedbackSearchResult(**KnowledgeFeedbackResponse.model_validate(feedback).model_dump(), rank=rank)
+        for feedback, rank in results
+    ]
 
 @router.get("/{feedback_id}", response_model=KnowledgeFeedbackResponse)
 async def read_knowledge_feedback_item(
     feedback_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un feedback de conocimiento específico por ID"""
     feedback = await knowledge_feedback_crud.get(db=db, feedback_id=feedback_id)
@@ -3,19 +3,45 @@
 Endpoints CRUD para pedidos
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
-from backend.crud import order_crud
+from backend.api.v1.export import EXPORT_FORMAT_PATTERN, export_response
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
+from backend.crud import order_crud, order_item_crud, unit_of_work
 from backend.schemas.order_schema import (
     OrderCreate,
+    OrderCreateWithItems,
     OrderUpdate,
-    OrderResponse
+    OrderResponse,
+    OrderWithItems,
+    OrderItemBulkCreate,
+    OrderItemResponse,
+    OrderItemDetail,
+    OrderFull
 )
+from backend.schemas.product_schema import ProductResponse
 
 router = APIRouter()
 
+# Máximo de elementos aceptados por operación masiva
+BULK_MAX_ITEMS = 1000
+
+
+def _order_full_response(order, details) -> OrderFull:
+    """Construye la respuesta anidada de un pedido a partir de (elemento, producto)"""
+    return OrderFull(
+        **OrderResponse.model_validate(order).model_dump(),
+        items=[
+            OrderItemDetail(
+                **OrderItemResponse.model_validate(item).model_dump(),
+                product=ProductResponse.model_validate(product, from_attributes=True) if product else None
+            )
+            for item, product in details
+        ]
+    )
+
 @router.post("/", response_model=OrderResponse)
 async def create_order(
     order: OrderCreate,
@@ -24,19 +50,66 @@ async def create_order(
     """Crear un nuevo pedido"""
     return await order_crud.create(db=db, obj_in=order)
 
+@router.post("/with-items", response_model=OrderWithItems)
+async def create_order_with_items(
+    order: OrderCreateWithItems,
+    db: AsyncSession = Depends(get_db)
+):
+    """Crear un pedido y sus elementos de forma atómica (una única transacción)"""
+    if len(order.items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} elementos por operación")
+    async with unit_of_work(db):
+        created_order = await order_crud.create(db=db, obj_in=order.model_dump(exclude={"items"}))
+        items = await order_item_crud.create_many(
+            db=db,
+            objs_in=[{**item.model_dump(), "order_id": created_order.order_id} for item in order.items]
+        )
+    return OrderWithItems(
+        **OrderResponse.model_validate(created_order).model_dump(),
+        items=[OrderItemResponse.model_validate(item) for item in items]
+    )
+
 @router.get("/", response_model=List[OrderResponse])
 async def read_orders(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de pedidos con paginación"""
-    return await order_crud.get_multi(db=db, skip=skip, limit=limit)
+    if cursor:
+        return await paginate_by_cursor(order_crud, db, response, cursor=cursor, limit=limit)
+    items = await order_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, order_crud.cursor_after(items, limit))
+    return items
+
+@router.get("/export")
+async def export_orders(
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN, description="Formato: ndjson o csv"),
+    client_id: Optional[int] = Query(None, description="Filtrar por ID de cliente"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Exportar todos los pedidos en streaming (cursor de servidor, memoria constante)"""
+    rows = order_crud.stream(db, filters={"client_id": client_id, "status": status})
+    return export_response(rows, OrderResponse, format=format, filename="orders")
+
+@router.get("/client/{client_id}/full", response_model=List[OrderFull])
+async def read_client_orders_full(
+    client_id: int,
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtener los pedidos de un cliente con sus elementos y productos"""
+    orders = await order_crud.get_full_by_client(db=db, client_id=client_id, skip=skip, limit=limit)
+    return [_order_full_response(order, details) for order, details in orders]
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def read_order(
     order_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un pedido específico por ID"""
     order = await order_crud.get(db=db, order_id=order_id)
@@ -44,6 +117,17 @@ async def read_order(
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
     return order
 
+@router.get("/{order_id}/full", response_model=OrderFull)
+async def read_order_full(
+    order_id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtener un pedido con sus elementos y los productos referenciados"""
+    full = await order_crud.get_full(db=db, order_id=order_id)
+    if not full:
+        raise HTTPException(status_code=404, detail="Pedido no encontrado")
+    return _order_full_response(*full)
+
 @router.put("/{order_id}", response_model=OrderResponse)
 async def update_order(
     order_id: str,
@@ -65,4 +149,19 @@ async def delete_order(
     order = await order_crud.get(db=db, order_id=order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
-    return await order_crud.remove(db=db, order_id=order_id)
\ No newline at end of file
+    return await order_crud.remove(db=db, order_id=order_id)
+
+@router.post("/{order_id}/items/bulk", response_model=List[OrderItemResponse])
+async def create_order_items_bulk(
+    order_id: str,
+    items: List[OrderItemBulkCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Añadir varios elementos a un pedido en una sola transacción"""
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} elementos por operación")
+    order = await order_crud.get(db=db, order_id=order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Pedido no encontrado")
+    rows = [{**item.model_dump(), "order_id": order_id} for item in items]
+    return await order_item_crud.create_many(db=db, objs_in=rows)
@@ -2,16 +2,38 @@
 """
 Endpoints CRUD para stock
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
-from backend.schemas.stock_schema import StockCreate, StockUpdate, StockResponse
+from backend.api.v1.etag import not_modified_response
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, rows_response
+from backend.db.session import get_db, get_read_db
+from backend.schemas.stock_schema import (
+    StockCreate, StockUpdate, StockResponse, StockBulkUpdate,
+    StockMovementRequest, StockReservationResponse, StockMovementResponse,
+    StockAvailabilityRequest, StockAvailability, StockAlert, StockAlertThreshold
+)
 from backend.crud import stock_crud
+from backend.crud.base_crud import RecordsNotFoundError
+from backend.crud.stock_crud import InsufficientStockError
+from backend.services.stock_alert_service import stock_alert_monitor
 
 router = APIRouter()
 
+# Máximo de elementos aceptados por operación masiva
+BULK_MAX_ITEMS = 1000
+
+# Intervalo de los comentarios keep-alive del streaming de alertas
+ALERT_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# Campos del listado rápido (filas como diccionarios, ver rows_response)
+STOCK_FIELDS = list(StockResponse.model_fields)
+
 @router.post("/", response_model=StockResponse)
 async def create_stock(
     stock: StockCreate,
@@ -20,33 +42,189 @@ async def create_stock(
     """Crear un nuevo registro de stock"""
     return await stock_crud.create(db=db, obj_in=stock)
 
+@router.post("/bulk", response_model=List[StockResponse])
+async def create_stock_bulk(
+    stock_items: List[StockCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Crear varios registros de stock en una sola transacción"""
+    if len(stock_items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    return await stock_crud.create_many(db=db, objs_in=stock_items)
+
+@router.put("/bulk", response_model=List[StockResponse])
+async def update_stock_bulk(
+    stock_updates: List[StockBulkUpdate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Actualizar varios registros de stock por ID con una sola sentencia; 404 si falta alguno"""
+    if len(stock_updates) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    try:
+        return await stock_crud.update_many(db=db, objs_in=stock_updates)
+    except RecordsNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Stock no encontrado: {', '.join(map(str, e.ids))}")
+
+@router.delete("/bulk", response_model=List[StockResponse])
+async def delete_stock_bulk(
+    stock_ids: List[int] = Body(..., description="IDs de stock a eliminar"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Eliminar varios registros de stock en una sola sentencia"""
+    if len(stock_ids) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    return await stock_crud.remove_many(db=db, ids=stock_ids)
+
 @router.get("/", response_model=List[StockResponse])
 async def read_stock(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
     product_id: Optional[str] = Query(None, description="Filtrar por ID de producto"),
     warehouse_id: Optional[int] = Query(None, description="Filtrar por ID de almacén"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de stock con paginación y filtros opcionales"""
-    if product_id and warehouse_id:
-        # Filtrar por producto y almacén específicos
-        stock_item = await stock_crud.get_by_product_and_warehouse(db=db, product_id=product_id, warehouse_id=warehouse_id)
-        return [stock_item] if stock_item else []
-    elif product_id:
-        # Filtrar solo por producto
-        return await stock_crud.get_by_product(db=db, product_id=product_id, skip=skip, limit=limit)
-    elif warehouse_id:
-        # Filtrar solo por almacén
-        return await stock_crud.get_by_warehouse(db=db, warehouse_id=warehouse_id, skip=skip, limit=limit)
-    else:
-        # Sin filtros, obtener todo
-        return await stock_crud.get_multi(db=db, skip=skip, limit=limit)
+    not_modified = await not_modified_response(request, response, db, stock_crud.model)
+    if not_modified:
+        return not_modified
+    return await rows_response(
+        stock_crud, db, response, fields=STOCK_FIELDS, skip=skip, limit=limit, cursor=cursor,
+        filters={"sku": product_id, "warehouse_id": warehouse_id}
+    )
+
+@router.get("/alerts", response_model=List[StockAlert])
+async def read_stock_alerts(
+    sku: Optional[str] = Query(None, description="Filtrar por SKU"),
+    warehouse_id: Optional[int] = Query(None, description="Filtrar por ID de almacén"),
+):
+    """Alertas de stock bajo activas (conjunto en memoria, sin consultar la tabla)"""
+    return stock_alert_monitor.get_alerts(sku=sku, warehouse_id=warehouse_id)
+
+async def _alert_events(request: Request) -> AsyncIterator[bytes]:
+    """Eventos SSE: estado inicial y después cada cambio del conjunto de alertas"""
+    # Suscrito antes de tomar la instantánea: ningún cambio queda entre ambas
+    async with stock_alert_monitor.subscribe() as events:
+        yield b"event: snapshot\ndata: " + orjson.dumps(stock_alert_monitor.get_alerts()) + b"\n\n"
+        while not await request.is_disconnected():
+            try:
+                event, alert = await asyncio.wait_for(events.get(), ALERT_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: ".encode() + orjson.dumps(alert) + b"\n\n"
+
+@router.get("/alerts/stream")
+async def stream_stock_alerts(request: Request):
+    """Suscripción a las alertas de stock bajo (Server-Sent Events)"""
+    return StreamingResponse(
+        _alert_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@router.get("/alerts/thresholds", response_model=List[StockAlertThreshold])
+async def read_stock_alert_thresholds():
+    """Umbrales de alerta personalizados por SKU y almacén"""
+    return stock_alert_monitor.list_thresholds()
+
+@router.put("/alerts/thresholds", response_model=List[StockAlertThreshold])
+async def update_stock_alert_thresholds(
+    thresholds: List[StockAlertThreshold],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Fijar umbrales de alerta y reevaluar solo las líneas de los SKU afectados.
+
+    Los umbrales no se guardan en la base de datos: viven en el monitor de este
+    proceso, así que con varios workers hay que fijarlos en cada uno y se
+    pierden al reiniciar (vuelve STOCK_ALERT_DEFAULT_THRESHOLD). La
+    reevaluación lee del primario para partir de las cantidades confirmadas.
+    """
+    for item in thresholds:
+        stock_alert_monitor.set_threshold(item.sku, item.warehouse_id, item.threshold)
+    if thresholds:
+        await stock_alert_monitor.resync(db, skus=sorted({item.sku for item in thresholds}))
+    return stock_alert_monitor.list_thresholds()
+
+@router.post("/availability", response_model=List[StockAvailability])
+async def read_stock_availability(
+    availability: StockAvailabilityRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Disponibilidad total, por almacén y reservada de varios SKU en una sola consulta"""
+    if len(availability.skus) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    return await stock_crud.get_availability(db=db, skus=availability.skus)
+
+@router.post("/decrement", response_model=List[StockResponse])
+async def decrement_stock(
+    movement: StockMovementRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Descontar de forma atómica todas las líneas de un pedido (todas o ninguna)"""
+    if len(movement.lines) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    try:
+        return await stock_crud.decrement_many(db=db, lines=movement.lines, reference=movement.reference)
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/reservations", response_model=List[StockReservationResponse])
+async def reserve_stock(
+    movement: StockMovementRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Reservar de forma atómica todas las líneas de un pedido (todas o ninguna)"""
+    if len(movement.lines) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo {BULK_MAX_ITEMS} registros por operación")
+    try:
+        return await stock_crud.reserve(db=db, lines=movement.lines, reference=movement.reference)
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/reservations/{reference}/commit", response_model=List[StockReservationResponse])
+async def commit_stock_reservation(
+    reference: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Confirmar las reservas activas de una referencia"""
+    reservations = await stock_crud.commit_reservation(db=db, reference=reference)
+    if not reservations:
+        raise HTTPException(status_code=404, detail="No hay reservas activas para la referencia")
+    return reservations
+
+@router.post("/reservations/{reference}/release", response_model=List[StockReservationResponse])
+async def release_stock_reservation(
+    reference: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Liberar las reservas activas de una referencia devolviendo las unidades al stock"""
+    reservations = await stock_crud.release_reservation(db=db, reference=reference)
+    if not reservations:
+        raise HTTPException(status_code=404, detail="No hay reservas activas para la referencia")
+    return reservations
+
+@router.get("/movements", response_model=List[StockMovementResponse])
+async def read_stock_movements(
+    skip: int = Query(0, ge=0, description="Número de registros a omitir"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
+    sku: Optional[str] = Query(None, description="Filtrar por SKU"),
+    warehouse_id: Optional[int] = Query(None, description="Filtrar por ID de almacén"),
+    reference: Optional[str] = Query(None, description="Filtrar por referencia (p. ej. ID de pedido)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtener el libro de movimientos de stock, del más reciente al más antiguo"""
+    return await stock_crud.get_movements(
+        db=db, sku=sku, warehouse_id=warehouse_id, reference=reference, skip=skip, limit=limit
+    )
 
 @router.get("/{stock_id}", response_model=StockResponse)
 async def read_stock_item(
     stock_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un registro de stock específico por ID"""
     stock_item = await stock_crud.get(db=db, stock_id=stock_id)
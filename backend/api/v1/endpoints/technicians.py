@@ -2,16 +2,19 @@
 """
 Endpoints CRUD para técnicos
 """
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.crud import technician_crud
 from backend.schemas.technician_schema import (
     TechnicianCreate,
     TechnicianUpdate,
-    TechnicianResponse
+    TechnicianResponse,
+    TechnicianAvailability
 )
 
 router = APIRouter()
@@ -26,17 +29,37 @@ async def create_technician(
 
 @router.get("/", response_model=List[TechnicianResponse])
 async def read_technicians(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de técnicos con paginación"""
-    return await technician_crud.get_multi(db=db, skip=skip, limit=limit)
+    if cursor:
+        return await paginate_by_cursor(technician_crud, db, response, cursor=cursor, limit=limit)
+    items = await technician_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, technician_crud.cursor_after(items, limit))
+    return items
+
+@router.get("/available", response_model=List[TechnicianAvailability])
+async def read_available_technicians(
+    zone: str = Query(..., description="Zona de trabajo"),
+    day: date = Query(..., description="Día a planificar (YYYY-MM-DD)"),
+    capacity: int = Query(1, ge=1, le=50, description="Intervenciones por día a partir de las que el técnico no está libre"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Técnicos libres de una zona en un día, de menor a mayor carga"""
+    technicians = await technician_crud.get_free_in_zone(db=db, zone=zone, day=day, capacity=capacity)
+    return [
+        TechnicianAvailability.model_validate(technician).model_copy(update={"interventions": interventions})
+        for technician, interventions in technicians
+    ]
 
 @router.get("/{technician_id}", response_model=TechnicianResponse)
 async def read_technician(
     technician_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un técnico específico por ID"""
     technician = await technician_crud.get(db=db, technician_id=technician_id)
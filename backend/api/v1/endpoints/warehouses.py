@@ -3,10 +3,12 @@
 Endpoints CRUD para almacenes
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.api.v1.etag import not_modified_response
+from backend.api.v1.pagination import CURSOR_DESCRIPTION, paginate_by_cursor, set_next_cursor
+from backend.db.session import get_db, get_read_db
 from backend.schemas.warehouse_schema import WarehouseCreate, WarehouseUpdate, WarehouseResponse
 from backend.crud import warehouse_crud
 
@@ -22,17 +24,27 @@ async def create_warehouse(
 
 @router.get("/", response_model=List[WarehouseResponse])
 async def read_warehouses(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a retornar"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener lista de almacenes con paginación"""
-    return await warehouse_crud.get_multi(db=db, skip=skip, limit=limit)
+    not_modified = await not_modified_response(request, response, db, warehouse_crud.model)
+    if not_modified:
+        return not_modified
+    if cursor:
+        return await paginate_by_cursor(warehouse_crud, db, response, cursor=cursor, limit=limit)
+    items = await warehouse_crud.get_multi(db=db, skip=skip, limit=limit)
+    set_next_cursor(response, warehouse_crud.cursor_after(items, limit))
+    return items
 
 @router.get("/{warehouse_id}", response_model=WarehouseResponse)
 async def read_warehouse(
     warehouse_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obtener un almacén específico por ID"""
     warehouse = await warehouse_crud.get(db=db, warehouse_id=warehouse_id)
@@ -0,0 +1,62 @@
+#backend/api/v1/etag.py
+"""
+GET condicional (ETag / If-None-Match) para listados de catálogo.
+
+El ETag se deriva de la versión de la tabla (contador que mantienen triggers de
+la base de datos, ver backend/db/table_versions.py) combinada con la ruta y los
+parámetros de la petición, de modo que un cliente que sondea repetidamente
+recibe 304 tras una única lectura por clave primaria y sin que se serialice nada.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.table_version_model import TableVersion
+
+
+async def table_fingerprint(db: AsyncSession, model: Any) -> str:
+    """
+    Huella de la tabla: su versión en table_versions (0 si aún no se ha escrito).
+
+    Cualquier alta, modificación o baja confirmada la cambia, también las que
+    confirman después de otra más reciente; max(updated_at) no lo garantizaba
+    porque en PostgreSQL now() es la hora de inicio de la transacción.
+    """
+    version = await db.scalar(
+        select(TableVersion.version).where(TableVersion.table_name == model.__tablename__)
+    )
+    return f"{model.__tablename__}:{version or 0}"
+
+
+def compute_etag(fingerprint: str, request: Request) -> str:
+    """ETag débil para la huella de la tabla y la petición concreta (ruta + query)"""
+    raw = f"{fingerprint}|{request.url.path}|{sorted(request.query_params.multi_items())}"
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Comparación débil de If-None-Match (admite lista de ETags y '*')"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == bare for candidate in candidates)
+
+
+async def not_modified_response(
+    request: Request, response: Response, db: AsyncSession, model: Any
+) -> Optional[Response]:
+    """
+    Devuelve una respuesta 304 si el ETag del cliente sigue vigente; si no,
+    añade la cabecera ETag a la respuesta y devuelve None para continuar.
+    """
+    etag = compute_etag(await table_fingerprint(db, model), request)
+    if etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
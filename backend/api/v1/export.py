@@ -0,0 +1,75 @@
+#backend/api/v1/export.py
+"""
+Utilidades de exportación en streaming (NDJSON / CSV) para tablas grandes
+"""
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# Formatos de exportación soportados y su media type
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Filas serializadas por cada bloque escrito en la respuesta
+EXPORT_CHUNK_ROWS = 500
+
+# Validación del parámetro de consulta `format`
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+async def _ndjson_chunks(rows: AsyncIterator[Any], schema: Type[BaseModel]) -> AsyncIterator[str]:
+    """Serializa los registros como JSON por línea, agrupados en bloques"""
+    buffer = []
+    async for row in rows:
+        data = schema.model_validate(row).model_dump(mode="json")
+        buffer.append(json.dumps(data, ensure_ascii=False))
+        if len(buffer) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+async def _csv_chunks(rows: AsyncIterator[Any], schema: Type[BaseModel]) -> AsyncIterator[str]:
+    """Serializa los registros como CSV con cabecera, agrupados en bloques"""
+    fields = list(schema.model_fields)
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    async for row in rows:
+        writer.writerow(schema.model_validate(row).model_dump(mode="json"))
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+    if output.tell():
+        yield output.getvalue()
+
+
+def export_response(
+    rows: AsyncIterator[Any],
+    schema: Type[BaseModel],
+    *,
+    format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Construye una respuesta en streaming a partir de un iterador asíncrono de registros.
+
+    La sesión de base de datos de la dependencia sigue abierta mientras se envía
+    la respuesta, de modo que el cursor de servidor se consume de forma incremental.
+    """
+    chunks = _csv_chunks(rows, schema) if format == "csv" else _ndjson_chunks(rows, schema)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -0,0 +1,64 @@
+#backend/api/v1/pagination.py
+"""
+Utilidades de paginación por cursor (keyset) para los endpoints de listado
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.responses import FastJSONResponse
+
+# Cabecera en la que se devuelve el cursor de la página siguiente
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CURSOR_DESCRIPTION = "Cursor opaco devuelto en la cabecera X-Next-Cursor; si se indica, se ignora skip"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Añade el cursor de la página siguiente a la respuesta, si existe"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+async def paginate_by_cursor(
+    crud: Any,
+    db: AsyncSession,
+    response: Response,
+    *,
+    cursor: str,
+    limit: int,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """Obtiene una página por cursor con el CRUD dado y fija la cabecera X-Next-Cursor"""
+    try:
+        items, next_cursor = await crud.get_page(db, cursor=cursor, limit=limit, filters=filters)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+    set_next_cursor(response, next_cursor)
+    return items
+
+
+async def rows_response(
+    crud: Any,
+    db: AsyncSession,
+    response: Response,
+    *,
+    fields: Sequence[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> FastJSONResponse:
+    """
+    Vía rápida para listados grandes: filas como diccionarios serializadas con
+    orjson, sin objetos ORM ni validación del response_model. Admite tanto
+    skip/limit como cursor y conserva las cabeceras ya fijadas (ETag, cursor).
+    """
+    try:
+        rows, next_cursor = await crud.get_rows(
+            db, fields=fields, skip=skip, limit=limit, cursor=cursor, filters=filters
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+    set_next_cursor(response, next_cursor)
+    return FastJSONResponse(rows, headers=dict(response.headers))
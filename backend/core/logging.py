@@ -1,24 +1,88 @@
 #backend/core/logging.py
 """
 Sistema de logging profesional para AInstalia
+
+Los loggers de la aplicación no escriben en disco ni en consola: un único
+QueueHandler deja cada registro, sin formatear, en una cola acotada y un
+QueueListener en un hilo aparte lo formatea y lo envía a los ficheros rotativos
+y a la consola. En el camino caliente (cada consulta SQL o RAG) un log cuesta lo
+que encolar un objeto, y los niveles desactivados se descartan antes de crear el
+registro.
+
+Si la cola se llena (disco lento, ráfaga de logs), la política LOG_QUEUE_FULL_POLICY
+decide: "drop" descarta los registros por debajo de ERROR y espera como mucho
+LOG_QUEUE_BLOCK_TIMEOUT_SECONDS por los de ERROR o superiores; "block" espera ese
+tiempo por cualquier registro. Los descartes se cuentan y se avisan en el log en
+cuanto vuelve a haber sitio.
 """
+import atexit
 import logging
 import logging.handlers
-import os
+import queue
+import threading
 from pathlib import Path
-from datetime import datetime
+from typing import Any, Dict, Mapping, Optional
 
 # Crear directorio de logs si no existe
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
-def setup_logging():
-    """
-    Configura el sistema de logging con múltiples handlers
-    """
-    # Configuración básica
-    logging.basicConfig(level=logging.INFO)
-    
+DEFAULT_QUEUE_SIZE = 10000
+QUEUE_FULL_POLICIES = ("drop", "block")
+
+_queue_handler: Optional["BoundedQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler sobre una cola acotada con política de descarte y sin formateo en el hilo que registra"""
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._reported = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El formateo (msg % args, traceback) se hace en el hilo del listener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        blocking = self.policy == "block" or record.levelno >= logging.ERROR
+        try:
+            if blocking and self.block_timeout > 0:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self.dropped != self._reported:
+            self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        """Encola un aviso con los registros descartados desde el último aviso"""
+        with self._lock:
+            pending = self.dropped - self._reported
+            self._reported = self.dropped
+        if pending <= 0:
+            return
+        warning = logging.LogRecord(
+            "ainstalia.logging", logging.WARNING, __file__, 0,
+            "Cola de logging llena: %d registros descartados", (pending,), None,
+        )
+        try:
+            self.queue.put_nowait(warning)
+        except queue.Full:
+            with self._lock:
+                self._reported -= pending
+
+
+def _build_handlers() -> list:
+    """Handlers de destino: se ejecutan en el hilo del QueueListener"""
     # Crear formatters
     detailed_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
@@ -26,7 +90,7 @@ def setup_logging():
     simple_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     )
-    
+
     # Handler para archivo principal
     app_handler = logging.handlers.RotatingFileHandler(
         LOGS_DIR / "app.log",
@@ -35,7 +99,7 @@ def setup_logging():
     )
     app_handler.setLevel(logging.INFO)
     app_handler.setFormatter(detailed_formatter)
-    
+
     # Handler para errores
     error_handler = logging.handlers.RotatingFileHandler(
         LOGS_DIR / "errors.log",
@@ -44,8 +108,8 @@ def setup_logging():
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    
-    # Handler para tests
+
+    # Handler para tests (solo registros de ainstalia.tests)
     test_handler = logging.handlers.RotatingFileHandler(
         LOGS_DIR / "tests.log",
         maxBytes=5242880,  # 5MB
@@ -53,32 +117,99 @@ def setup_logging():
     )
     test_handler.setLevel(logging.DEBUG)
     test_handler.setFormatter(detailed_formatter)
-    
+    test_handler.addFilter(logging.Filter("ainstalia.tests"))
+
     # Handler para consola (desarrollo)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    
-    # Configurar logger principal
+
+    return [app_handler, error_handler, test_handler, console_handler]
+
+
+def setup_logging(queue_size: int = DEFAULT_QUEUE_SIZE, policy: str = "drop", block_timeout: float = 0.05):
+    """
+    Configura el sistema de logging: cola acotada + listener con múltiples handlers
+    """
+    global _queue_handler, _listener
+    if policy not in QUEUE_FULL_POLICIES:
+        raise ValueError(f"Política de cola de logging no válida: {policy} (usa {', '.join(QUEUE_FULL_POLICIES)})")
+
+    # Configuración básica (librerías de terceros)
+    logging.basicConfig(level=logging.INFO)
+
     logger = logging.getLogger("ainstalia")
-    logger.setLevel(logging.DEBUG)
-    logger.addHandler(app_handler)
-    logger.addHandler(error_handler)
-    logger.addHandler(console_handler)
-    
+    if _listener is not None:
+        # Reconfiguración: vaciar la cola actual antes de sustituirla
+        shutdown_logging()
+        logger.removeHandler(_queue_handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, policy=policy, block_timeout=block_timeout)
+    _listener = logging.handlers.QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+    # Configurar logger principal: la consola ya la atiende el listener, sin pasar por root
+    logger.setLevel(logging.INFO)
+    logger.addHandler(_queue_handler)
+    logger.propagate = False
+
     # Logger específico para tests
-    test_logger = logging.getLogger("ainstalia.tests")
-    test_logger.setLevel(logging.DEBUG)
-    test_logger.addHandler(test_handler)
-    test_logger.addHandler(console_handler)
-    
+    logging.getLogger("ainstalia.tests").setLevel(logging.DEBUG)
+
     return logger
 
+
+def configure_logging(settings: Any) -> None:
+    """
+    Aplica la configuración de logging de settings: nivel global, niveles por
+    módulo (LOG_MODULE_LEVELS, p. ej. {"ainstalia.db": "WARNING"}) y cola.
+
+    Se llama desde backend.main: este módulo no importa la configuración para
+    que los scripts puedan fijar variables de entorno después de importarlo.
+    """
+    if (_queue_handler is None
+            or _queue_handler.queue.maxsize != settings.LOG_QUEUE_SIZE
+            or _queue_handler.policy != settings.LOG_QUEUE_FULL_POLICY
+            or _queue_handler.block_timeout != settings.LOG_QUEUE_BLOCK_TIMEOUT_SECONDS):
+        setup_logging(settings.LOG_QUEUE_SIZE, settings.LOG_QUEUE_FULL_POLICY, settings.LOG_QUEUE_BLOCK_TIMEOUT_SECONDS)
+    logging.getLogger("ainstalia").setLevel(settings.LOG_LEVEL.upper())
+    set_module_levels(settings.LOG_MODULE_LEVELS)
+
+
+def set_module_levels(levels: Mapping[str, str]) -> None:
+    """Fija el nivel de cada logger indicado ({"ainstalia.rag_service": "DEBUG"})"""
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def get_logging_stats() -> Dict[str, int]:
+    """Estado de la cola de logging: registros pendientes y descartados"""
+    if _queue_handler is None:
+        return {"queued": 0, "capacity": 0, "dropped": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+def shutdown_logging() -> None:
+    """Procesa los registros pendientes, detiene el listener y cierra sus ficheros"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger(name: str = "ainstalia"):
     """
     Obtiene un logger configurado
     """
     return logging.getLogger(name)
 
-# Configurar logging al importar
-setup_logging() 
\ No newline at end of file
+# Configurar logging al importar (valores por defecto hasta configure_logging)
+setup_logging()
+atexit.register(shutdown_logging)
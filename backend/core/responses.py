@@ -0,0 +1,35 @@
+#backend/core/responses.py
+"""
+Respuesta JSON rápida basada en orjson
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(value: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa"""
+    if isinstance(value, Decimal):
+        # Igual que Pydantic en modo JSON: Decimal como cadena, sin pérdida de precisión
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse serializada con orjson (datetime/date/UUID nativos, Decimal como cadena).
+
+    Es la clase de respuesta por defecto de la aplicación; también permite devolver
+    directamente filas como diccionarios sin pasar por los response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -1,5 +1,7 @@
 # Operaciones CRUD
 
+from .base_crud import unit_of_work
+
 # CRUD existentes
 from .client_crud import CRUDClient
 from .product_crud import CRUDProduct
@@ -32,6 +34,8 @@ chat_session_crud = CRUDChatSession()
 chat_message_crud = CRUDChatMessage()
 
 __all__ = [
+    # Transacciones
+    "unit_of_work",
     # Clases CRUD
     "CRUDClient", "CRUDProduct", "CRUDTechnician", "CRUDInstalledEquipment",
     "CRUDIntervention", "CRUDContract", "CRUDOrder", "CRUDOrderItem",
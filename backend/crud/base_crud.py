@@ -2,55 +2,422 @@
 """
 Base CRUD con operaciones genéricas
 """
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
+)
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean, case, column, delete, event, insert, inspect, literal, or_, select, tuple_, update, values
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from backend.crud.cache import EntityCache
 from backend.db.base import Base
+from backend.db.fulltext import ranked_search_query, register_sqlite_fts
+from backend.db.session import READ_REPLICA_KEY
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Clave en session.info que marca una unidad de trabajo activa
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+# Clave en session.info con los efectos que esperan al commit (invalidación de caché, _after_write)
+AFTER_COMMIT_KEY = "after_commit"
+
+
+class RecordsNotFoundError(LookupError):
+    """Alguna de las claves primarias no existe; no se aplica ningún cambio"""
+
+    def __init__(self, ids: Sequence[Any]):
+        self.ids = list(ids)
+        super().__init__(f"Registros no encontrados: {', '.join(str(id) for id in self.ids)}")
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    """Indica si la sesión está dentro de una unidad de trabajo"""
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Programa un efecto para cuando se confirme la transacción en curso. Lo
+    ejecutan CRUDBase._finish y unit_of_work tras su commit; quien confirme con
+    db.commit() directamente debe llamar después a run_after_commit(db).
+    Si la transacción se deshace, los efectos se descartan.
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def run_after_commit(db: AsyncSession) -> None:
+    """Ejecuta, en orden, los efectos programados con on_commit"""
+    for callback in db.info.pop(AFTER_COMMIT_KEY, []):
+        await callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    """Una transacción deshecha no escribió nada: sus efectos pendientes no aplican"""
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def can_fill_cache(db: AsyncSession) -> bool:
+    """
+    Solo se cachean lecturas confirmadas del primario: ni dentro de una unidad
+    de trabajo o con escrituras sin confirmar, ni desde la réplica de lectura
+    (con lag podría volver a cachear una fila recién invalidada).
+    """
+    return not (in_unit_of_work(db) or db.info.get(AFTER_COMMIT_KEY) or db.info.get(READ_REPLICA_KEY))
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Agrupa varias operaciones CRUD en una única transacción.
+
+    Dentro del bloque los métodos de CRUDBase solo hacen flush; al salir se
+    hace un único commit, o rollback si se produce una excepción. Los bloques
+    anidados se integran en la unidad de trabajo exterior.
+
+    Uso:
+        async with unit_of_work(db):
+            order = await order_crud.create(db, obj_in=order_in)
+            await order_item_crud.create_many(db, objs_in=items)
+    """
+    if in_unit_of_work(db):
+        yield db
+        return
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+    await run_after_commit(db)
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType]):
+    def __init__(
+        self,
+        model: Type[ModelType],
+        sort_column: Optional[str] = None,
+        search_columns: Optional[Sequence[str]] = None,
+        cache: Optional[EntityCache] = None
+    ):
         """
         Objeto CRUD con métodos CRUD por defecto para Create, Read, Update, Delete (CRUD).
         
         **Parámetros**
         * `model`: Clase modelo SQLAlchemy
-        * `schema`: Esquema Pydantic
+        * `sort_column`: Atributo por el que se ordena y pagina por cursor (por defecto la clave primaria)
+        * `search_columns`: Columnas de texto indexadas para búsqueda de texto completo
+        * `cache`: Caché read-through para `get` por clave primaria (se invalida tras el commit de update/delete)
         """
         self.model = model
         self.primary_key_name = self.model.__table__.primary_key.columns[0].name
+        self.sort_column_name = sort_column or self.primary_key_name
+        self.search_columns = list(search_columns or [])
+        self.cache = cache
+        if self.search_columns:
+            register_sqlite_fts(self.model.__table__, self.search_columns)
+
+    def _order_columns(self) -> tuple:
+        """Columnas de la clave de orden: (columna de orden, clave primaria)"""
+        pk_column = getattr(self.model, self.primary_key_name)
+        if self.sort_column_name == self.primary_key_name:
+            return (pk_column,)
+        return (getattr(self.model, self.sort_column_name), pk_column)
+
+    def _sort_nullable(self) -> bool:
+        """Indica si la columna de orden (distinta de la clave primaria) admite NULL"""
+        if self.sort_column_name == self.primary_key_name:
+            return False
+        return bool(getattr(self.model, self.sort_column_name).property.columns[0].nullable)
+
+    def _stable_order(self) -> tuple:
+        """
+        Orden total usado por listados y cursores. Si la columna de orden admite
+        NULL, esas filas van al final (NULLS LAST explícito: PostgreSQL y SQLite
+        difieren por defecto) y la condición keyset las tiene en cuenta.
+        """
+        columns = self._order_columns()
+        if self._sort_nullable():
+            return (columns[0].asc().nulls_last(), columns[1])
+        return columns
+
+    def _cursor_values(self, obj: ModelType) -> List[Any]:
+        """Valores de la clave de orden de un registro"""
+        names = [self.primary_key_name]
+        if self.sort_column_name != self.primary_key_name:
+            names.insert(0, self.sort_column_name)
+        if isinstance(obj, Mapping):
+            return [obj[name] for name in names]
+        return [getattr(obj, name) for name in names]
+
+    def encode_cursor(self, obj: ModelType) -> str:
+        """Genera un cursor opaco que apunta justo después del registro dado"""
+        values = []
+        for value in self._cursor_values(obj):
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            values.append(value)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        """Decodifica un cursor opaco; lanza ValueError si no es válido"""
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        columns = [column.property.columns[0] for column in self._order_columns()]
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Cursor inválido")
+        decoded = []
+        for column, value in zip(columns, values):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+            elif value is not None and python_type is Decimal:
+                value = Decimal(value)
+            decoded.append(value)
+        return decoded
+
+    def cursor_after(self, items: Sequence[ModelType], limit: int) -> Optional[str]:
+        """Cursor para continuar tras una página de listado ya obtenida (None si la página no está llena)"""
+        if not items or len(items) < limit:
+            return None
+        return self.encode_cursor(items[-1])
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Obtener una página por keyset (cursor) en lugar de OFFSET.
+
+        El coste es el mismo en la primera página que en la página 10.000.
+        Devuelve los registros y el cursor de la página siguiente (None si no hay más).
+        """
+        query = self._filtered_select(select(self.model), filters, cursor)
+        result = await db.execute(query.order_by(*self._stable_order()).limit(limit + 1))
+        items = result.scalars().all()
+        next_cursor = self.encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return items[:limit], next_cursor
+
+    def _filtered_select(self, query, filters: Optional[Dict[str, Any]], cursor: Optional[str]):
+        """Aplica filtros de igualdad (ignorando None) y la condición keyset del cursor"""
+        for name, value in (filters or {}).items():
+            if value is not None:
+                query = query.filter(getattr(self.model, name) == value)
+        if cursor:
+            order = self._order_columns()
+            values = self.decode_cursor(cursor)
+            if len(order) == 1:
+                query = query.filter(order[0] > values[0])
+            elif not self._sort_nullable():
+                query = query.filter(tuple_(*order) > tuple_(*values))
+            elif values[0] is None:
+                # Ya en el tramo final de NULL: solo queda avanzar por clave primaria
+                query = query.filter(order[0].is_(None), order[1] > values[1])
+            else:
+                # La comparación de tuplas descarta los NULL, que van después de todo valor
+                query = query.filter(or_(tuple_(*order) > tuple_(*values), order[0].is_(None)))
+        return query
+
+    async def get_rows(
+        self,
+        db: AsyncSession,
+        *,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Listado rápido como diccionarios, construidos directamente de las tuplas de
+        filas sin instanciar objetos ORM ni validar con Pydantic.
+
+        `fields` son los campos del esquema de respuesta; los que no son columnas
+        del modelo se devuelven como None. Pagina por cursor si se indica, o por
+        skip/limit. Devuelve las filas y el cursor de la página siguiente.
+        """
+        column_attrs = {attr.key for attr in inspect(self.model).column_attrs}
+        columns = [
+            getattr(self.model, name).label(name) if name in column_attrs else literal(None).label(name)
+            for name in fields
+        ]
+        # La clave de orden se selecciona siempre para poder generar el cursor
+        order_names = [name for name in (self.sort_column_name, self.primary_key_name) if name not in fields]
+        columns += [getattr(self.model, name).label(name) for name in dict.fromkeys(order_names)]
+        query = self._filtered_select(select(*columns), filters, cursor).order_by(*self._stable_order())
+        if not cursor:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit + 1))
+        rows = [dict(row) for row in result.mappings()]
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        rows = rows[:limit]
+        if order_names:
+            for row in rows:
+                for name in order_names:
+                    row.pop(name, None)
+        return rows, next_cursor
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[ModelType]:
+        """
+        Recorrer todos los registros con un cursor de servidor (yield_per).
+
+        Los registros se obtienen en lotes de `batch_size`, por lo que la memoria
+        es constante con independencia del tamaño de la tabla.
+        """
+        query = select(self.model)
+        for name, value in (filters or {}).items():
+            if value is not None:
+                query = query.filter(getattr(self.model, name) == value)
+        query = query.order_by(*self._stable_order()).execution_options(yield_per=batch_size)
+        result = await db.stream_scalars(query)
+        async for obj in result:
+            yield obj
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        text: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[Tuple[ModelType, float]]:
+        """
+        Búsqueda de texto completo con ranking de relevancia y paginación.
+
+        Usa tsvector + GIN en PostgreSQL y FTS5 en SQLite. Devuelve pares
+        (registro, puntuación) ordenados de mayor a menor relevancia.
+        """
+        columns = list(columns or self.search_columns)
+        unknown = set(columns) - set(self.search_columns)
+        if not columns or unknown:
+            raise ValueError(f"Columnas de búsqueda no indexadas: {sorted(unknown) or columns}")
+        query = ranked_search_query(self.model, columns, text, db.bind.dialect.name)
+        if query is None:
+            return []
+        for name, value in (filters or {}).items():
+            if value is not None:
+                query = query.filter(getattr(self.model, name) == value)
+        pk_column = getattr(self.model, self.primary_key_name)
+        query = query.order_by(query.selected_columns.search_rank.desc(), pk_column).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return [(obj, float(rank or 0)) for obj, rank in result.all()]
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
-        """Obtener registro por ID"""
+        """Obtener registro por ID (pasando por la caché si el CRUD tiene una)"""
+        if self.cache is not None:
+            row = await self.cache.get(id)
+            if row is not None:
+                return await self._from_cache(db, row)
         result = await db.execute(select(self.model).filter(getattr(self.model, self.primary_key_name) == id))
-        return result.scalars().first()
+        obj = result.scalars().first()
+        if obj is not None and self.cache is not None and can_fill_cache(db):
+            await self.cache.set(id, self._column_values(obj))
+        return obj
+
+    def _column_values(self, obj: ModelType) -> Dict[str, Any]:
+        """Valores de columna de un registro, tal como se guardan en la caché"""
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs}
+
+    async def _from_cache(self, db: AsyncSession, row: Dict[str, Any]) -> ModelType:
+        """Reconstruye un registro (cacheado o devuelto por RETURNING) como persistente en la sesión, sin SELECT"""
+        snapshot = self.model(**row)
+        make_transient_to_detached(snapshot)
+        return await db.merge(snapshot, load=False)
+
+    async def _invalidate(self, ids: Sequence[Any]) -> None:
+        """Invalida en la caché los registros escritos (se llama ya confirmada la escritura)"""
+        if self.cache is not None:
+            for id in ids:
+                await self.cache.invalidate(id)
+
+    async def _before_commit(self, db: AsyncSession, db_objs: Sequence[Any], *, removed: bool = False) -> None:
+        """
+        Gancho antes de confirmar cada escritura, dentro de su misma transacción.
+        Por defecto no hace nada; las subclases lo usan para mantener tablas
+        derivadas que deben confirmarse (o deshacerse) junto con la escritura.
+        """
+
+    async def _after_write(self, db: AsyncSession, db_objs: Sequence[Any], *, removed: bool = False) -> None:
+        """
+        Gancho tras el commit de cada escritura (alta, modificación o baja, con
+        removed=True) con los registros afectados. Por defecto no hace nada; las
+        subclases lo usan para mantener vistas derivadas (resúmenes cacheados,
+        alertas...).
+        """
+
+    async def _complete_write(
+        self,
+        db: AsyncSession,
+        db_objs: Sequence[Any],
+        *,
+        commit: bool,
+        invalidate: Sequence[Any] = (),
+        removed: bool = False
+    ) -> None:
+        """
+        Cierra una escritura ya enviada (flush): _before_commit en la misma
+        transacción, commit (o flush) y, una vez confirmada, invalidación de la
+        caché y _after_write. Con commit=False o dentro de una unidad de trabajo
+        los efectos esperan al commit de quien gestiona la transacción.
+        """
+        await self._before_commit(db, db_objs, removed=removed)
+        ids = list(invalidate)
+
+        async def after_commit() -> None:
+            await self._invalidate(ids)
+            await self._after_write(db, db_objs, removed=removed)
+
+        on_commit(db, after_commit)
+        await self._finish(db, commit=commit)
 
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """Obtener múltiples registros con paginación"""
-        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        result = await db.execute(select(self.model).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        """Crear nuevo registro"""
-        if hasattr(obj_in, 'model_dump'):
-            # Es un objeto Pydantic
-            obj_in_data = obj_in.model_dump()
-        else:
-            # Es un diccionario
-            obj_in_data = obj_in
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType, commit: bool = True) -> ModelType:
+        """Crear nuevo registro (INSERT ... RETURNING, sin SELECT de refresco)"""
+        obj_in_data = self._to_dict(obj_in)
+        result = await db.scalars(insert(self.model).returning(self.model), [obj_in_data])
+        db_obj = result.one()
+        await self._complete_write(db, [db_obj], commit=commit)
         return db_obj
 
     async def update(
@@ -58,7 +425,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db: AsyncSession,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True
     ) -> ModelType:
         """Actualizar registro existente"""
         obj_data = jsonable_encoder(db_obj)
@@ -70,15 +438,147 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
+        # Solo se recargan las columnas generadas en el servidor (p. ej. updated_at)
+        unloaded = inspect(db_obj).unloaded
+        if unloaded:
+            await db.refresh(db_obj, attribute_names=list(unloaded))
+        await self._complete_write(db, [db_obj], commit=commit, invalidate=[getattr(db_obj, self.primary_key_name)])
         return db_obj
 
-    async def remove(self, db: AsyncSession, *, id: Any) -> ModelType:
+    async def remove(self, db: AsyncSession, *, id: Any, commit: bool = True) -> ModelType:
         """Eliminar registro por ID"""
         result = await db.execute(select(self.model).filter(getattr(self.model, self.primary_key_name) == id))
         obj = result.scalars().first()
         if obj:
             await db.delete(obj)
+            await db.flush()
+            await self._complete_write(db, [obj], commit=commit, invalidate=[id], removed=True)
+        return obj
+
+    async def _finish(self, db: AsyncSession, *, commit: bool) -> None:
+        """
+        Confirma la transacción y ejecuta los efectos pendientes (on_commit), o
+        solo hace flush si commit=False o hay una unidad de trabajo activa
+        """
+        if commit and not in_unit_of_work(db):
             await db.commit()
-        return obj 
\ No newline at end of file
+            await run_after_commit(db)
+        else:
+            await db.flush()
+
+    def _to_dict(self, obj_in: Union[BaseModel, Dict[str, Any]], *, exclude_unset: bool = False) -> Dict[str, Any]:
+        """Convierte un esquema Pydantic o un diccionario en un diccionario de columnas"""
+        if isinstance(obj_in, dict):
+            return obj_in
+        return obj_in.model_dump(exclude_unset=exclude_unset)
+
+    async def create_many(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True
+    ) -> List[ModelType]:
+        """Crear varios registros con un único INSERT multi-fila ... RETURNING en una transacción"""
+        rows = [self._to_dict(obj_in) for obj_in in objs_in]
+        if not rows:
+            return []
+        result = await db.scalars(insert(self.model).returning(self.model), rows)
+        db_objs = result.all()
+        await self._complete_write(db, db_objs, commit=commit)
+        return db_objs
+
+    def _update_many_statement(self, db: AsyncSession, rows: Sequence[Dict[str, Any]]):
+        """
+        UPDATE ... RETURNING único para varias filas con campos distintos.
+
+        En PostgreSQL: UPDATE ... FROM (VALUES ...) unido por clave primaria; los
+        campos que no vienen en todas las filas llevan una columna set_<campo>
+        para distinguir "no se actualiza" de "se pone a NULL". En el resto de
+        motores (sin VALUES con nombres de columna): SET campo = CASE pk WHEN ...
+        """
+        pk_name = self.primary_key_name
+        pk = getattr(self.model, pk_name)
+        fields = list(dict.fromkeys(name for row in rows for name in row if name != pk_name))
+        partial_fields = [name for name in fields if any(name not in row for row in rows)]
+        if db.bind.dialect.name == "postgresql":
+            lines = values(
+                column(pk_name, pk.type),
+                *(column(name, getattr(self.model, name).type) for name in fields),
+                *(column(f"set_{name}", Boolean) for name in partial_fields),
+                name="lines"
+            ).data([
+                (row[pk_name], *(row.get(name) for name in fields), *(name in row for name in partial_fields))
+                for row in rows
+            ])
+            new_values = {
+                name: case((lines.c[f"set_{name}"], lines.c[name]), else_=getattr(self.model, name))
+                if name in partial_fields else lines.c[name]
+                for name in fields
+            }
+            query = update(self.model).where(pk == lines.c[pk_name])
+        else:
+            new_values = {
+                name: case(
+                    *((pk == row[pk_name], literal(row[name], getattr(self.model, name).type)) for row in rows if name in row),
+                    else_=getattr(self.model, name)
+                )
+                for name in fields
+            }
+            query = update(self.model).where(pk.in_([row[pk_name] for row in rows]))
+        # Columnas con la clave del atributo (p. ej. scheduled_date de la columna "date")
+        return query.values(new_values).returning(
+            *(getattr(self.model, attr.key).label(attr.key) for attr in inspect(self.model).column_attrs)
+        )
+
+    async def update_many(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[UpdateSchemaType, Dict[str, Any]]],
+        commit: bool = True
+    ) -> List[ModelType]:
+        """
+        Actualizar varios registros por clave primaria con una sola sentencia
+        UPDATE ... RETURNING.
+
+        Cada elemento debe incluir la clave primaria; solo se actualizan los
+        campos presentes. Devuelve los registros actualizados en el orden pedido.
+        Si alguna clave no existe se lanza RecordsNotFoundError y la transacción
+        debe deshacerse (con commit=True se deshace aquí).
+        """
+        rows = [self._to_dict(obj_in, exclude_unset=True) for obj_in in objs_in]
+        if not rows:
+            return []
+        missing_pk = [row for row in rows if row.get(self.primary_key_name) is None]
+        if missing_pk:
+            raise ValueError(f"Cada elemento debe incluir '{self.primary_key_name}'")
+        # Una fila por clave (la última gana): el UPDATE no puede casar dos veces la misma fila
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            merged.setdefault(row[self.primary_key_name], {}).update(row)
+        ids = list(merged)
+        result = await db.execute(
+            self._update_many_statement(db, list(merged.values())),
+            execution_options={"synchronize_session": False}
+        )
+        # Las filas devueltas sustituyen el estado de las instancias ya cargadas en la sesión
+        updated = {
+            row[self.primary_key_name]: await self._from_cache(db, dict(row)) for row in result.mappings().all()
+        }
+        missing = [id for id in ids if id not in updated]
+        if missing:
+            if commit and not in_unit_of_work(db):
+                await db.rollback()
+            raise RecordsNotFoundError(missing)
+        db_objs = [updated[id] for id in ids]
+        await self._complete_write(db, db_objs, commit=commit, invalidate=ids)
+        return db_objs
+
+    async def remove_many(self, db: AsyncSession, *, ids: Sequence[Any], commit: bool = True) -> List[ModelType]:
+        """Eliminar varios registros con un único DELETE ... WHERE pk IN (...) RETURNING"""
+        if not ids:
+            return []
+        result = await db.scalars(
+            delete(self.model)
+            .where(getattr(self.model, self.primary_key_name).in_(list(ids)))
+            .returning(self.model)
+        )
+        db_objs = result.all()
+        await self._complete_write(db, db_objs, commit=commit, invalidate=ids, removed=True)
+        return db_objs
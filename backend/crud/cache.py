@@ -0,0 +1,294 @@
+#backend/crud/cache.py
+"""
+Caché read-through para entidades pequeñas y de lectura mayoritaria (productos,
+almacenes, técnicos).
+
+Dos niveles:
+- LRU en proceso con TTL y tamaño máximo por modelo.
+- Nivel compartido opcional (Redis si CACHE_SHARED_URL apunta a redis://, o un
+  sustituto local en memoria con CACHE_SHARED_URL=local para desarrollo y tests).
+
+Se guardan los valores de columna de cada registro, nunca instancias ligadas a
+una sesión; CRUDBase reconstruye el objeto en la sesión del llamante sin SELECT.
+En el nivel compartido van serializados con orjson (nunca pickle: quien pudiera
+escribir en Redis podría ejecutar código en la API al leerlos); Decimal, date y
+datetime se guardan como texto y se restauran con su tipo.
+
+CRUDBase invalida tras el commit de cada escritura y no rellena la caché desde
+la réplica de lectura ni con escrituras sin confirmar. La invalidación borra el
+nivel compartido y el LRU del proceso que escribe, pero no el LRU de los demás
+procesos (workers, réplicas de la API): ahí un registro modificado puede servirse
+hasta que caduque su TTL, así que el TTL local acota la desactualización
+entre procesos.
+"""
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+import orjson
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+
+logger = get_logger("ainstalia.cache")
+
+
+# Tipos que JSON no conserva: se guardan como texto y se restauran con su tipo
+_DECODERS = {"decimal": Decimal, "datetime": datetime.fromisoformat, "date": date.fromisoformat}
+
+
+def encode_row(row: Dict[str, Any]) -> bytes:
+    """
+    Serializa los valores de columna de un registro para el nivel compartido.
+    El tipo de cada valor Decimal/date/datetime va en un mapa aparte ("types"),
+    para no confundirlo con el contenido de una columna JSON. Cualquier otro
+    tipo no JSON lanza TypeError.
+    """
+    values: Dict[str, Any] = {}
+    types: Dict[str, str] = {}
+    for name, value in row.items():
+        if isinstance(value, Decimal):
+            values[name], types[name] = str(value), "decimal"
+        elif isinstance(value, datetime):
+            values[name], types[name] = value.isoformat(), "datetime"
+        elif isinstance(value, date):
+            values[name], types[name] = value.isoformat(), "date"
+        else:
+            values[name] = value
+    return orjson.dumps(
+        {"values": values, "types": types},
+        option=orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+def decode_row(raw: bytes) -> Dict[str, Any]:
+    """Inverso de encode_row; lanza ValueError/KeyError/TypeError si el valor no es válido"""
+    payload = orjson.loads(raw)
+    values = payload["values"]
+    for name, kind in payload["types"].items():
+        values[name] = _DECODERS[kind](values[name])
+    return values
+
+
+class CacheStats:
+    """Contadores de uso de una caché de entidad"""
+
+    def __init__(self):
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.shared_hits + self.misses
+        return (self.hits + self.shared_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class LRUCache:
+    """LRU en proceso con expiración por TTL"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> int:
+        """Guarda un valor; devuelve el número de entradas expulsadas"""
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalSharedCache:
+    """Sustituto local del nivel compartido (misma interfaz que RedisSharedCache)"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisSharedCache:
+    """Nivel compartido sobre Redis (requiere el paquete `redis`)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # Dependencia opcional
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._client.set(key, value, px=int(ttl_seconds * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def clear(self) -> None:
+        # Solo se borran las claves de esta aplicación
+        async for key in self._client.scan_iter(match="ainstalia:*"):
+            await self._client.delete(key)
+
+
+def _build_shared_backend() -> Optional[Any]:
+    """Crea el nivel compartido según CACHE_SHARED_URL"""
+    url = settings.CACHE_SHARED_URL
+    if not url:
+        return None
+    if url == "local":
+        return LocalSharedCache()
+    try:
+        return RedisSharedCache(url)
+    except ImportError:
+        logger.warning("CACHE_SHARED_URL configurada pero el paquete 'redis' no está instalado; solo caché local")
+        return None
+
+
+shared_backend = _build_shared_backend()
+
+
+class EntityCache:
+    """Caché read-through de registros de un modelo, indexados por clave primaria"""
+
+    def __init__(self, name: str, *, ttl_seconds: float, max_size: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.local = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.stats = CacheStats()
+
+    def _shared_key(self, key: Any) -> str:
+        return f"ainstalia:{self.name}:{key}"
+
+    async def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Devuelve los valores de columna cacheados o None si no están"""
+        if not settings.CACHE_ENABLED:
+            return None
+        row = self.local.get(key)
+        if row is not None:
+            self.stats.hits += 1
+            return row
+        if shared_backend is not None:
+            try:
+                raw = await shared_backend.get(self._shared_key(key))
+                row = decode_row(raw) if raw is not None else None
+            except Exception as e:
+                # Incluye valores no válidos: se tratan como fallo y se recargan de la BD
+                logger.warning(f"Error leyendo caché compartida {self.name}: {e}")
+                row = None
+            if row is not None:
+                self.stats.evictions += self.local.set(key, row)
+                self.stats.shared_hits += 1
+                return row
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: Any, row: Dict[str, Any]) -> None:
+        """Guarda los valores de columna de un registro en ambos niveles"""
+        if not settings.CACHE_ENABLED:
+            return
+        self.stats.evictions += self.local.set(key, row)
+        if shared_backend is not None:
+            try:
+                await shared_backend.set(self._shared_key(key), encode_row(row), self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Error escribiendo caché compartida {self.name}: {e}")
+
+    async def invalidate(self, key: Any) -> None:
+        """Elimina un registro de ambos niveles tras una escritura (solo el LRU de este proceso)"""
+        self.local.delete(key)
+        self.stats.invalidations += 1
+        if shared_backend is not None:
+            try:
+                await shared_backend.delete(self._shared_key(key))
+            except Exception as e:
+                logger.warning(f"Error invalidando caché compartida {self.name}: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "size": len(self.local),
+            "max_size": self.local.max_size,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Cachés registradas, por nombre de tabla
+cache_registry: Dict[str, EntityCache] = {}
+
+
+def entity_cache(name: str, *, ttl_seconds: float, max_size: int) -> EntityCache:
+    """Crea (o devuelve) la caché de una entidad y la registra para el informe"""
+    if name not in cache_registry:
+        cache_registry[name] = EntityCache(name, ttl_seconds=ttl_seconds, max_size=max_size)
+    return cache_registry[name]
+
+
+def cache_report() -> Dict[str, Any]:
+    """Estadísticas de todas las cachés registradas (ratio de aciertos, tamaño...)"""
+    return {
+        "enabled": settings.CACHE_ENABLED,
+        "shared_tier": type(shared_backend).__name__ if shared_backend is not None else None,
+        "caches": {name: cache.report() for name, cache in cache_registry.items()},
+    }
+
+
+async def clear_caches() -> None:
+    """Vacía todas las cachés (p. ej. entre tests o tras una recarga masiva de datos)"""
+    for cache in cache_registry.values():
+        cache.local.clear()
+        cache.stats = CacheStats()
+    if shared_backend is not None:
+        await shared_backend.clear()
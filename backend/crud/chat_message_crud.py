@@ -14,7 +14,7 @@ from backend.crud.base_crud import CRUDBase
 
 class CRUDChatMessage(CRUDBase[ChatMessage, ChatMessageCreate, ChatMessageUpdate]):
     def __init__(self):
-        super().__init__(ChatMessage)
+        super().__init__(ChatMessage, sort_column="message_timestamp", search_columns=["message_text"])
 
     async def get(self, db: AsyncSession, message_id: int) -> Optional[ChatMessage]:
         """Obtener mensaje por ID"""
@@ -22,7 +22,7 @@ class CRUDChatMessage(CRUDBase[ChatMessage, ChatMessageCreate, ChatMessageUpdate
 
     async def get_by_chat(self, db: AsyncSession, *, chat_id: str) -> List[ChatMessage]:
         """Obtener todos los mensajes de una sesión de chat"""
-        result = await db.execute(select(ChatMessage).filter(ChatMessage.chat_id == chat_id).order_by(ChatMessage.message_timestamp))
+        result = await db.execute(select(ChatMessage).filter(ChatMessage.chat_id == chat_id).order_by(*self._stable_order()))
         return result.scalars().all()
 
     async def get_by_sender(self, db: AsyncSession, *, sender: str) -> List[ChatMessage]:
@@ -35,7 +35,7 @@ class CRUDChatMessage(CRUDBase[ChatMessage, ChatMessageCreate, ChatMessageUpdate
         result = await db.execute(select(ChatMessage).filter(
             ChatMessage.chat_id == chat_id,
             ChatMessage.sender == sender
-        ).order_by(ChatMessage.message_timestamp))
+        ).order_by(*self._stable_order()))
         return result.scalars().all()
 
     async def get_by_date_range(
@@ -68,11 +68,11 @@ class CRUDChatMessage(CRUDBase[ChatMessage, ChatMessageCreate, ChatMessageUpdate
         """Obtener solo mensajes del agente en una sesión"""
         return await self.get_by_chat_and_sender(db, chat_id=chat_id, sender="agente")
 
-    async def remove(self, db: AsyncSession, *, message_id: int) -> Optional[ChatMessage]:
+    async def remove(self, db: AsyncSession, *, message_id: int, commit: bool = True) -> Optional[ChatMessage]:
         """Eliminar mensaje por ID"""
-        return await super().remove(db, id=message_id)
+        return await super().remove(db, id=message_id, commit=commit)
 
     async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ChatMessage]:
         """Obtener múltiples mensajes de chat con paginación"""
-        result = await db.execute(select(ChatMessage).offset(skip).limit(limit))
+        result = await db.execute(select(ChatMessage).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all() 
\ No newline at end of file
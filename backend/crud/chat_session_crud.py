@@ -60,11 +60,11 @@ class CRUDChatSession(CRUDBase[ChatSession, ChatSessionCreate, ChatSessionUpdate
         result = await db.execute(select(ChatSession).filter(ChatSession.topic.ilike(f"%{topic}%")))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, chat_id: str) -> Optional[ChatSession]:
+    async def remove(self, db: AsyncSession, *, chat_id: str, commit: bool = True) -> Optional[ChatSession]:
         """Eliminar sesión de chat por ID"""
-        return await super().remove(db, id=chat_id)
+        return await super().remove(db, id=chat_id, commit=commit)
 
     async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ChatSession]:
         """Obtener múltiples sesiones de chat con paginación"""
-        result = await db.execute(select(ChatSession).offset(skip).limit(limit))
+        result = await db.execute(select(ChatSession).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all() 
\ No newline at end of file
@@ -39,6 +39,6 @@ class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
         result = await db.execute(select(Client).filter(Client.city == city))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, client_id: int) -> Optional[Client]:
+    async def remove(self, db: AsyncSession, *, client_id: int, commit: bool = True) -> Optional[Client]:
         """Eliminar cliente por ID"""
-        return await super().remove(db, id=client_id) 
\ No newline at end of file
+        return await super().remove(db, id=client_id, commit=commit) 
\ No newline at end of file
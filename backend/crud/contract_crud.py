@@ -2,7 +2,7 @@
 """
 Operaciones CRUD para Contrato
 """
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -10,6 +10,7 @@ from sqlalchemy import select
 from backend.models.contract_model import Contract
 from backend.schemas.contract_schema import ContractCreate, ContractUpdate
 from backend.crud.base_crud import CRUDBase
+from backend.services.contract_lifecycle_service import contract_expiry_scanner
 
 
 class CRUDContract(CRUDBase[Contract, ContractCreate, ContractUpdate]):
@@ -22,17 +23,17 @@ class CRUDContract(CRUDBase[Contract, ContractCreate, ContractUpdate]):
 
     async def get_by_client(self, db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100) -> List[Contract]:
         """Obtener contratos de un cliente"""
-        result = await db.execute(select(Contract).filter(Contract.client_id == client_id).offset(skip).limit(limit))
+        result = await db.execute(select(Contract).filter(Contract.client_id == client_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_type(self, db: AsyncSession, *, contract_type: str, skip: int = 0, limit: int = 100) -> List[Contract]:
         """Obtener contratos por tipo"""
-        result = await db.execute(select(Contract).filter(Contract.contract_type == contract_type).offset(skip).limit(limit))
+        result = await db.execute(select(Contract).filter(Contract.contract_type == contract_type).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_status(self, db: AsyncSession, *, status: str, skip: int = 0, limit: int = 100) -> List[Contract]:
         """Obtener contratos por estado"""
-        result = await db.execute(select(Contract).filter(Contract.status == status).offset(skip).limit(limit))
+        result = await db.execute(select(Contract).filter(Contract.status == status).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_active_contracts(self, db: AsyncSession) -> List[Contract]:
@@ -41,7 +42,10 @@ class CRUDContract(CRUDBase[Contract, ContractCreate, ContractUpdate]):
         return result.scalars().all()
 
     async def get_expiring_contracts(self, db: AsyncSession, *, before_date: date) -> List[Contract]:
-        """Obtener contratos que expiran antes de una fecha"""
+        """
+        Obtener contratos que expiran antes de una fecha (consulta directa; para los
+        horizontes habituales usar contract_expiry_scanner, que los tiene precalculados)
+        """
         result = await db.execute(select(Contract).filter(
             Contract.end_date <= before_date,
             Contract.status == "activo"
@@ -58,6 +62,11 @@ class CRUDContract(CRUDBase[Contract, ContractCreate, ContractUpdate]):
         ))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, contract_id: int) -> Optional[Contract]:
+    async def remove(self, db: AsyncSession, *, contract_id: int, commit: bool = True) -> Optional[Contract]:
         """Eliminar contrato por ID"""
-        return await super().remove(db, id=contract_id)
\ No newline at end of file
+        return await super().remove(db, id=contract_id, commit=commit)
+
+    async def _after_write(self, db: AsyncSession, db_objs: Sequence[Any], *, removed: bool = False) -> None:
+        """Cualquier escritura de contratos invalida los buckets de vencimientos"""
+        if db_objs:
+            contract_expiry_scanner.mark_stale()
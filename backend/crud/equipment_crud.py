@@ -50,6 +50,6 @@ class CRUDInstalledEquipment(CRUDBase[InstalledEquipment, InstalledEquipmentCrea
         result = await db.execute(select(InstalledEquipment).filter(InstalledEquipment.status == "activo"))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, equipment_id: int) -> Optional[InstalledEquipment]:
+    async def remove(self, db: AsyncSession, *, equipment_id: int, commit: bool = True) -> Optional[InstalledEquipment]:
         """Eliminar equipo por ID"""
-        return await super().remove(db, id=equipment_id) 
\ No newline at end of file
+        return await super().remove(db, id=equipment_id, commit=commit) 
\ No newline at end of file
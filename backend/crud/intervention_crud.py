@@ -2,19 +2,43 @@
 """
 Operaciones CRUD para Intervención
 """
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
 
 from backend.models.intervention_model import Intervention
+from backend.models.technician_model import Technician
+from backend.models.technician_workload_model import TechnicianWorkload
 from backend.schemas.intervention_schema import InterventionCreate, InterventionUpdate
 from backend.crud.base_crud import CRUDBase
 
+WorkloadKey = Tuple[int, date]
+
+
+def rebuild_workload_statements() -> list:
+    """
+    Sentencias que reconstruyen el índice technician_workload completo desde
+    interventions (p. ej. tras una carga masiva fuera de la API). Valen tanto
+    para conexiones síncronas como asíncronas; se ejecutan en una transacción.
+    """
+    counts = (
+        select(Intervention.technician_id, Intervention.scheduled_date, func.count())
+        .where(Intervention.technician_id.is_not(None))
+        .group_by(Intervention.technician_id, Intervention.scheduled_date)
+    )
+    return [
+        delete(TechnicianWorkload),
+        insert(TechnicianWorkload).from_select(["technician_id", "day", "interventions"], counts),
+    ]
+
 
 class CRUDIntervention(CRUDBase[Intervention, InterventionCreate, InterventionUpdate]):
     def __init__(self):
-        super().__init__(Intervention)
+        super().__init__(Intervention, sort_column="scheduled_date")
 
     async def get(self, db: AsyncSession, intervention_id: int) -> Optional[Intervention]:
         """Obtener intervención por ID"""
@@ -22,22 +46,22 @@ class CRUDIntervention(CRUDBase[Intervention, InterventionCreate, InterventionUp
 
     async def get_by_client(self, db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100) -> List[Intervention]:
         """Obtener intervenciones de un cliente"""
-        result = await db.execute(select(Intervention).filter(Intervention.client_id == client_id).offset(skip).limit(limit))
+        result = await db.execute(select(Intervention).filter(Intervention.client_id == client_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_technician(self, db: AsyncSession, *, technician_id: int, skip: int = 0, limit: int = 100) -> List[Intervention]:
         """Obtener intervenciones de un técnico"""
-        result = await db.execute(select(Intervention).filter(Intervention.technician_id == technician_id).offset(skip).limit(limit))
+        result = await db.execute(select(Intervention).filter(Intervention.technician_id == technician_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_equipment(self, db: AsyncSession, *, equipment_id: int, skip: int = 0, limit: int = 100) -> List[Intervention]:
         """Obtener intervenciones de un equipo"""
-        result = await db.execute(select(Intervention).filter(Intervention.equipment_id == equipment_id).offset(skip).limit(limit))
+        result = await db.execute(select(Intervention).filter(Intervention.equipment_id == equipment_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_status(self, db: AsyncSession, *, status: str, skip: int = 0, limit: int = 100) -> List[Intervention]:
         """Obtener intervenciones por estado"""
-        result = await db.execute(select(Intervention).filter(Intervention.status == status).offset(skip).limit(limit))
+        result = await db.execute(select(Intervention).filter(Intervention.status == status).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_date_range(
@@ -55,6 +79,139 @@ class CRUDIntervention(CRUDBase[Intervention, InterventionCreate, InterventionUp
         result = await db.execute(select(Intervention).filter(Intervention.status == "pendiente"))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, intervention_id: int) -> Optional[Intervention]:
+    async def remove(self, db: AsyncSession, *, intervention_id: int, commit: bool = True) -> Optional[Intervention]:
         """Eliminar intervención por ID"""
-        return await super().remove(db, id=intervention_id) 
\ No newline at end of file
+        return await super().remove(db, id=intervention_id, commit=commit)
+
+    # ------------------------------------------------------------------
+    # Índice de carga de trabajo (technician_workload)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _workload_key(obj: Intervention) -> Optional[WorkloadKey]:
+        if obj.technician_id is None or obj.scheduled_date is None:
+            return None
+        return (obj.technician_id, obj.scheduled_date)
+
+    async def _workload_keys(self, db: AsyncSession, ids: Sequence[Any]) -> List[WorkloadKey]:
+        """(técnico, día) actuales de las intervenciones indicadas, uno por intervención"""
+        result = await db.execute(
+            select(Intervention.technician_id, Intervention.scheduled_date)
+            .where(Intervention.intervention_id.in_(list(set(ids))))
+        )
+        return [(technician_id, day) for technician_id, day in result.all() if technician_id is not None]
+
+    async def shift_workload(
+        self, db: AsyncSession, added: Iterable[Optional[WorkloadKey]] = (),
+        removed: Iterable[Optional[WorkloadKey]] = ()
+    ) -> None:
+        """
+        Suma +1/-1 al índice por cada (técnico, día) ganado o perdido con un único
+        INSERT ... ON CONFLICT DO UPDATE (interventions + EXCLUDED.interventions),
+        y borra los (técnico, día) que se quedan a 0.
+
+        Con deltas, dos escrituras concurrentes sobre la misma clave se serializan
+        en el bloqueo de su fila y ambas suman; un recuento (count(*)) vería solo
+        la instantánea de su propia transacción.
+
+        No confirma: se ejecuta en la transacción de la escritura que lo provoca,
+        de modo que el índice se confirma o se deshace junto con ella.
+        """
+        deltas = Counter(key for key in added if key is not None)
+        deltas.subtract(key for key in removed if key is not None)
+        keys = sorted(key for key, delta in deltas.items() if delta)
+        if not keys:
+            return
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(TechnicianWorkload).values([
+            {"technician_id": technician_id, "day": day, "interventions": deltas[(technician_id, day)]}
+            for technician_id, day in keys
+        ])
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[TechnicianWorkload.technician_id, TechnicianWorkload.day],
+            set_={"interventions": TechnicianWorkload.interventions + statement.excluded.interventions}
+        ))
+        await db.execute(
+            delete(TechnicianWorkload)
+            .where(
+                tuple_(TechnicianWorkload.technician_id, TechnicianWorkload.day).in_(keys),
+                TechnicianWorkload.interventions <= 0
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _before_commit(self, db: AsyncSession, db_objs: Sequence[Any], *, removed: bool = False) -> None:
+        """
+        Mantiene el índice de carga de trabajo en la misma transacción que altas,
+        modificaciones y bajas: cada registro suma su (técnico, día) actual, o lo
+        resta si se ha borrado. update/update_many restan el anterior.
+        """
+        keys = [self._workload_key(obj) for obj in db_objs]
+        if removed:
+            await self.shift_workload(db, removed=keys)
+        else:
+            await self.shift_workload(db, added=keys)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Intervention,
+        obj_in: Union[InterventionUpdate, Dict[str, Any]],
+        commit: bool = True
+    ) -> Intervention:
+        """Actualizar intervención (si cambia de técnico o de día se mueve su carga)"""
+        previous = self._workload_key(db_obj)
+        # Sin confirmar todavía: _before_commit ya ha sumado el (técnico, día) nuevo
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in, commit=False)
+        await self.shift_workload(db, removed=[previous])
+        await self._finish(db, commit=commit)
+        return db_obj
+
+    async def update_many(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[InterventionUpdate, Dict[str, Any]]],
+        commit: bool = True
+    ) -> List[Intervention]:
+        """Actualización masiva; resta también los (técnico, día) anteriores"""
+        ids = [self._to_dict(obj_in, exclude_unset=True).get(self.primary_key_name) for obj_in in objs_in]
+        previous = await self._workload_keys(db, [id for id in ids if id is not None])
+        db_objs = await super().update_many(db, objs_in=objs_in, commit=False)
+        await self.shift_workload(db, removed=previous)
+        await self._finish(db, commit=commit)
+        return db_objs
+
+    async def get_upcoming_by_technician(
+        self,
+        db: AsyncSession,
+        *,
+        per_technician: int = 3,
+        from_date: Optional[date] = None,
+        zone: Optional[str] = None
+    ) -> Dict[int, List[Intervention]]:
+        """
+        Próximas N intervenciones de cada técnico (opcionalmente de una zona) en
+        una sola consulta con row_number() por técnico.
+        """
+        position = func.row_number().over(
+            partition_by=Intervention.technician_id,
+            order_by=(Intervention.scheduled_date, Intervention.intervention_id)
+        ).label("position")
+        query = select(Intervention, position).where(
+            Intervention.technician_id.is_not(None),
+            Intervention.scheduled_date >= (from_date or date.today())
+        )
+        if zone is not None:
+            query = query.join(Technician, Technician.technician_id == Intervention.technician_id).where(
+                Technician.zone == zone
+            )
+        ranked = query.subquery()
+        upcoming = aliased(Intervention, ranked)
+        result = await db.execute(
+            select(upcoming)
+            .where(ranked.c.position <= per_technician)
+            .order_by(ranked.c.technician_id, ranked.c.position)
+        )
+        schedule: Dict[int, List[Intervention]] = {}
+        for intervention in result.scalars():
+            schedule.setdefault(intervention.technician_id, []).append(intervention)
+        return schedule
@@ -13,7 +13,7 @@ from backend.crud.base_crud import CRUDBase
 
 class CRUDKnowledgeFeedback(CRUDBase[KnowledgeFeedback, KnowledgeFeedbackCreate, KnowledgeFeedbackUpdate]):
     def __init__(self):
-        super().__init__(KnowledgeFeedback)
+        super().__init__(KnowledgeFeedback, search_columns=["question", "expected_answer"])
 
     async def get(self, db: AsyncSession, feedback_id: int) -> Optional[KnowledgeFeedback]:
         """Obtener feedback por ID"""
@@ -21,12 +21,12 @@ class CRUDKnowledgeFeedback(CRUDBase[KnowledgeFeedback, KnowledgeFeedbackCreate,
 
     async def get_by_status(self, db: AsyncSession, *, status: str, skip: int = 0, limit: int = 100) -> List[KnowledgeFeedback]:
         """Obtener feedback por estado con paginación"""
-        result = await db.execute(select(KnowledgeFeedback).filter(KnowledgeFeedback.status == status).offset(skip).limit(limit))
+        result = await db.execute(select(KnowledgeFeedback).filter(KnowledgeFeedback.status == status).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_user_type(self, db: AsyncSession, *, user_type: str, skip: int = 0, limit: int = 100) -> List[KnowledgeFeedback]:
         """Obtener feedback por tipo de usuario con paginación"""
-        result = await db.execute(select(KnowledgeFeedback).filter(KnowledgeFeedback.user_type == user_type).offset(skip).limit(limit))
+        result = await db.execute(select(KnowledgeFeedback).filter(KnowledgeFeedback.user_type == user_type).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_user_type_and_status(self, db: AsyncSession, *, user_type: str, status: str, skip: int = 0, limit: int = 100) -> List[KnowledgeFeedback]:
@@ -34,7 +34,7 @@ class CRUDKnowledgeFeedback(CRUDBase[KnowledgeFeedback, KnowledgeFeedbackCreate,
         result = await db.execute(select(KnowledgeFeedback).filter(
             KnowledgeFeedback.user_type == user_type,
             KnowledgeFeedback.status == status
-        ).offset(skip).limit(limit))
+        ).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_pending_feedback(self, db: AsyncSession) -> List[KnowledgeFeedback]:
@@ -57,11 +57,11 @@ class CRUDKnowledgeFeedback(CRUDBase[KnowledgeFeedback, KnowledgeFeedbackCreate,
         result = await db.execute(select(KnowledgeFeedback).filter(KnowledgeFeedback.expected_answer.ilike(f"%{answer}%")))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, feedback_id: int) -> Optional[KnowledgeFeedback]:
+    async def remove(self, db: AsyncSession, *, feedback_id: int, commit: bool = True) -> Optional[KnowledgeFeedback]:
         """Eliminar feedback por ID"""
-        return await super().remove(db, id=feedback_id)
+        return await super().remove(db, id=feedback_id, commit=commit)
 
     async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[KnowledgeFeedback]:
         """Obtener múltiples feedbacks con paginación"""
-        result = await db.execute(select(KnowledgeFeedback).offset(skip).limit(limit))
+        result = await db.execute(select(KnowledgeFeedback).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
\ No newline at end of file
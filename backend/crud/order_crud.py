@@ -2,12 +2,13 @@
 """
 Operaciones CRUD para Pedido y Elementos de Pedido
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from decimal import Decimal
 
 from backend.models.order_model import Order, OrderItem
+from backend.models.product_model import Product
 from backend.schemas.order_schema import OrderCreate, OrderUpdate, OrderItemCreate, OrderItemUpdate
 from backend.crud.base_crud import CRUDBase
 
@@ -50,9 +51,54 @@ class CRUDOrder(CRUDBase[Order, OrderCreate, OrderUpdate]):
         ))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, order_id: str) -> Optional[Order]:
+    async def get_full(
+        self, db: AsyncSession, *, order_id: str
+    ) -> Optional[Tuple[Order, List[Tuple[OrderItem, Optional[Product]]]]]:
+        """Obtener un pedido con sus elementos y productos (3 consultas en total)"""
+        order = await self.get(db, order_id=order_id)
+        if not order:
+            return None
+        details = await self._load_details(db, [order])
+        return order, details[order.order_id]
+
+    async def get_full_by_client(
+        self, db: AsyncSession, *, client_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Tuple[Order, List[Tuple[OrderItem, Optional[Product]]]]]:
+        """Obtener los pedidos de un cliente con elementos y productos (3 consultas en total)"""
+        result = await db.execute(
+            select(Order).filter(Order.client_id == client_id)
+            .order_by(*self._stable_order()).offset(skip).limit(limit)
+        )
+        orders = result.scalars().all()
+        details = await self._load_details(db, orders)
+        return [(order, details[order.order_id]) for order in orders]
+
+    async def _load_details(
+        self, db: AsyncSession, orders: Sequence[Order]
+    ) -> Dict[str, List[Tuple[OrderItem, Optional[Product]]]]:
+        """
+        Carga elementos y productos de varios pedidos con una consulta IN por tabla
+        (equivalente a selectinload), evitando una consulta por pedido y por SKU.
+        """
+        details: Dict[str, List[Tuple[OrderItem, Optional[Product]]]] = {order.order_id: [] for order in orders}
+        if not details:
+            return details
+        items_result = await db.execute(
+            select(OrderItem).filter(OrderItem.order_id.in_(list(details))).order_by(OrderItem.item_id)
+        )
+        items = items_result.scalars().all()
+        skus = {item.product_sku for item in items if item.product_sku}
+        products: Dict[str, Product] = {}
+        if skus:
+            products_result = await db.execute(select(Product).filter(Product.sku.in_(skus)))
+            products = {product.sku: product for product in products_result.scalars().all()}
+        for item in items:
+            details[item.order_id].append((item, products.get(item.product_sku)))
+        return details
+
+    async def remove(self, db: AsyncSession, *, order_id: str, commit: bool = True) -> Optional[Order]:
         """Eliminar pedido por ID"""
-        return await super().remove(db, id=order_id)
+        return await super().remove(db, id=order_id, commit=commit)
 
 
 class CRUDOrderItem(CRUDBase[OrderItem, OrderItemCreate, OrderItemUpdate]):
@@ -83,6 +129,6 @@ class CRUDOrderItem(CRUDBase[OrderItem, OrderItemCreate, OrderItemUpdate]):
         ))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, item_id: int) -> Optional[OrderItem]:
+    async def remove(self, db: AsyncSession, *, item_id: int, commit: bool = True) -> Optional[OrderItem]:
         """Eliminar elemento de pedido por ID"""
-        return await super().remove(db, id=item_id) 
\ No newline at end of file
+        return await super().remove(db, id=item_id, commit=commit) 
\ No newline at end of file
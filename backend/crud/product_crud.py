@@ -9,12 +9,18 @@ from decimal import Decimal
 
 from backend.models.product_model import Product
 from backend.schemas.product_schema import ProductCreate, ProductUpdate
+from backend.core.config import settings
 from backend.crud.base_crud import CRUDBase
+from backend.crud.cache import entity_cache
 
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     def __init__(self):
-        super().__init__(Product)
+        super().__init__(Product, cache=entity_cache(
+            "products",
+            ttl_seconds=settings.CACHE_PRODUCTS_TTL_SECONDS,
+            max_size=settings.CACHE_PRODUCTS_MAX_SIZE
+        ))
 
     async def get(self, db: AsyncSession, sku: str) -> Optional[Product]:
         """Obtener producto por SKU"""
@@ -45,6 +51,6 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         result = await db.execute(select(Product).filter(Product.spec_json.isnot(None)))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, sku: str) -> Optional[Product]:
+    async def remove(self, db: AsyncSession, *, sku: str, commit: bool = True) -> Optional[Product]:
         """Eliminar producto por SKU"""
-        return await super().remove(db, id=sku) 
\ No newline at end of file
+        return await super().remove(db, id=sku, commit=commit) 
\ No newline at end of file
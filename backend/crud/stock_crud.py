@@ -2,18 +2,53 @@
 """
 Operaciones CRUD para Stock/Inventario
 """
-from typing import List, Optional
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Integer, String, column, func, insert, select, update, values
 
 from backend.models.stock_model import Stock
-from backend.schemas.stock_schema import StockCreate, StockUpdate
-from backend.crud.base_crud import CRUDBase
+from backend.models.stock_movement_model import StockMovement, StockReservation
+from backend.schemas.stock_schema import StockCreate, StockUpdate, StockLine
+from backend.core.config import settings
+from backend.crud.base_crud import CRUDBase, can_fill_cache, in_unit_of_work, on_commit, unit_of_work
+from backend.crud.cache import entity_cache
+from backend.services.stock_alert_service import stock_alert_monitor
+
+# Tipos de movimiento del libro de stock
+MOVEMENT_RESERVE = "reserva"
+MOVEMENT_COMMIT = "confirmacion"
+MOVEMENT_RELEASE = "liberacion"
+MOVEMENT_DECREMENT = "salida"
+
+# Estados de una reserva
+RESERVATION_RESERVED = "reservada"
+RESERVATION_COMMITTED = "confirmada"
+RESERVATION_RELEASED = "liberada"
+
+StockKey = Tuple[str, int]
+
+
+class InsufficientStockError(ValueError):
+    """Alguna línea no existe o no tiene unidades suficientes; no se aplica ningún cambio"""
+
+    def __init__(self, lines: Sequence[StockKey]):
+        self.lines = list(lines)
+        detail = ", ".join(f"{sku} (almacén {warehouse_id})" for sku, warehouse_id in self.lines)
+        super().__init__(f"Stock insuficiente para: {detail}")
 
 
 class CRUDStock(CRUDBase[Stock, StockCreate, StockUpdate]):
     def __init__(self):
         super().__init__(Stock)
+        # Resumen de disponibilidad por SKU: caché (LRU del proceso + nivel compartido
+        # opcional), no una tabla; se invalida tras el commit de cada escritura de stock
+        self.availability_cache = entity_cache(
+            "stock_availability",
+            ttl_seconds=settings.CACHE_STOCK_AVAILABILITY_TTL_SECONDS,
+            max_size=settings.CACHE_STOCK_AVAILABILITY_MAX_SIZE
+        )
 
     async def get(self, db: AsyncSession, stock_id: int) -> Optional[Stock]:
         """Obtener stock por ID"""
@@ -31,12 +66,12 @@ class CRUDStock(CRUDBase[Stock, StockCreate, StockUpdate]):
 
     async def get_by_sku(self, db: AsyncSession, *, sku: str, skip: int = 0, limit: int = 100) -> List[Stock]:
         """Obtener todo el stock de un producto en todos los almacenes"""
-        result = await db.execute(select(Stock).filter(Stock.sku == sku).offset(skip).limit(limit))
+        result = await db.execute(select(Stock).filter(Stock.sku == sku).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_by_warehouse(self, db: AsyncSession, *, warehouse_id: int, skip: int = 0, limit: int = 100) -> List[Stock]:
         """Obtener todo el stock de un almacén"""
-        result = await db.execute(select(Stock).filter(Stock.warehouse_id == warehouse_id).offset(skip).limit(limit))
+        result = await db.execute(select(Stock).filter(Stock.warehouse_id == warehouse_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_low_stock(self, db: AsyncSession, *, min_quantity: int = 5) -> List[Stock]:
@@ -69,9 +104,324 @@ class CRUDStock(CRUDBase[Stock, StockCreate, StockUpdate]):
 
     async def get_by_product(self, db: AsyncSession, *, product_id: str, skip: int = 0, limit: int = 100) -> List[Stock]:
         """Obtener todo el stock de un producto en todos los almacenes"""
-        result = await db.execute(select(Stock).filter(Stock.sku == product_id).offset(skip).limit(limit))
+        result = await db.execute(select(Stock).filter(Stock.sku == product_id).order_by(*self._stable_order()).offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, stock_id: int) -> Optional[Stock]:
+    async def remove(self, db: AsyncSession, *, stock_id: int, commit: bool = True) -> Optional[Stock]:
         """Eliminar registro de stock por ID"""
-        return await super().remove(db, id=stock_id) 
\ No newline at end of file
+        return await super().remove(db, id=stock_id, commit=commit)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Stock,
+        obj_in: Union[StockUpdate, Dict[str, Any]],
+        commit: bool = True
+    ) -> Stock:
+        """Actualizar registro de stock (si cambia el SKU se invalida también el anterior)"""
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if update_data.get("sku", db_obj.sku) != db_obj.sku:
+            # Se programa antes de la escritura para que corra tras su mismo commit
+            on_commit(db, partial(self.availability_cache.invalidate, db_obj.sku))
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in, commit=commit)
+
+    async def _after_write(self, db: AsyncSession, db_objs: Sequence[Any], *, removed: bool = False) -> None:
+        """
+        Ya confirmada la escritura, invalida el resumen de disponibilidad de los
+        SKU escritos y notifica las nuevas cantidades al monitor de alertas.
+        """
+        skus = set()
+        for row in db_objs:
+            if isinstance(row, StockReservation):
+                # Confirmar una reserva cambia lo reservado, no la cantidad en stock
+                skus.add(row.sku)
+                continue
+            data = row if isinstance(row, dict) else {
+                "stock_id": row.stock_id, "sku": row.sku, "warehouse_id": row.warehouse_id, "quantity": row.quantity
+            }
+            skus.add(data["sku"])
+            stock_alert_monitor.observe(
+                stock_id=data["stock_id"],
+                sku=data["sku"],
+                warehouse_id=data["warehouse_id"],
+                quantity=data["quantity"],
+                removed=removed,
+            )
+        for sku in skus:
+            await self.availability_cache.invalidate(sku)
+
+    # ------------------------------------------------------------------
+    # Disponibilidad agregada
+    # ------------------------------------------------------------------
+
+    async def _query_availability(self, db: AsyncSession, skus: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Disponibilidad de varios SKU con una única consulta agrupada por
+        (sku, almacén): unidades disponibles y reservadas pendientes de confirmar.
+        """
+        reserved = (
+            select(StockReservation.stock_id, func.sum(StockReservation.quantity).label("reserved"))
+            .where(StockReservation.status == RESERVATION_RESERVED)
+            .group_by(StockReservation.stock_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Stock.sku,
+                Stock.warehouse_id,
+                func.coalesce(func.sum(Stock.quantity), 0).label("available"),
+                func.coalesce(func.sum(reserved.c.reserved), 0).label("reserved"),
+            )
+            .outerjoin(reserved, reserved.c.stock_id == Stock.stock_id)
+            .where(Stock.sku.in_(list(skus)))
+            .group_by(Stock.sku, Stock.warehouse_id)
+            .order_by(Stock.sku, Stock.warehouse_id)
+        )
+        summary = {
+            sku: {"sku": sku, "available": 0, "reserved": 0, "on_hand": 0, "warehouses": []}
+            for sku in skus
+        }
+        for row in (await db.execute(query)).mappings():
+            entry = summary[row["sku"]]
+            available, reserved_units = int(row["available"]), int(row["reserved"])
+            entry["warehouses"].append({
+                "warehouse_id": row["warehouse_id"],
+                "available": available,
+                "reserved": reserved_units,
+            })
+            entry["available"] += available
+            entry["reserved"] += reserved_units
+            entry["on_hand"] += available + reserved_units
+        return summary
+
+    async def get_availability(self, db: AsyncSession, *, skus: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Disponibilidad total, por almacén y reservada de varios SKU, en el orden
+        pedido. Los SKU sin stock se devuelven con cantidades a cero. Los SKU ya
+        cacheados no se consultan; el resto se resuelve con una sola consulta.
+
+        El resumen no es una tabla mantenida en la base de datos: es una caché
+        por SKU con TTL (CACHE_STOCK_AVAILABILITY_TTL_SECONDS) en el proceso y,
+        si está configurado, en el nivel compartido. Solo la rellenan lecturas
+        confirmadas del primario; las hechas desde la réplica se sirven sin
+        cachear para no volver a guardar una cantidad recién invalidada.
+        """
+        skus = list(dict.fromkeys(skus))
+        # Dentro de una unidad de trabajo puede haber escrituras sin confirmar
+        use_cache = not in_unit_of_work(db)
+        summary: Dict[str, Dict[str, Any]] = {}
+        if use_cache:
+            for sku in skus:
+                cached = await self.availability_cache.get(sku)
+                if cached is not None:
+                    summary[sku] = cached
+        missing = [sku for sku in skus if sku not in summary]
+        if missing:
+            fresh = await self._query_availability(db, missing)
+            if can_fill_cache(db):
+                for sku, entry in fresh.items():
+                    await self.availability_cache.set(sku, entry)
+            summary.update(fresh)
+        return [summary[sku] for sku in skus]
+
+    # ------------------------------------------------------------------
+    # Movimientos atómicos de stock
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _group_lines(lines: Sequence[Union[StockLine, Dict[str, Any]]]) -> Dict[StockKey, int]:
+        """Agrupa las líneas por (sku, almacén) sumando unidades, en orden estable"""
+        grouped: Dict[StockKey, int] = {}
+        for line in lines:
+            data = line.model_dump() if isinstance(line, StockLine) else line
+            if data["quantity"] <= 0:
+                raise ValueError("La cantidad de cada línea debe ser positiva")
+            key = (data["sku"], data["warehouse_id"])
+            grouped[key] = grouped.get(key, 0) + data["quantity"]
+        return dict(sorted(grouped.items()))
+
+    async def _apply_deltas(
+        self, db: AsyncSession, deltas: Dict[StockKey, int], *, decrement: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Suma o resta unidades con UPDATE ... SET quantity = quantity ± n RETURNING.
+
+        Al restar, la condición quantity >= n se evalúa con la fila bloqueada, por
+        lo que dos pedidos concurrentes no pueden dejar el stock en negativo. En
+        PostgreSQL todas las líneas van en una sola sentencia (UPDATE ... FROM
+        VALUES); en el resto de motores, una sentencia por línea. Si falta alguna
+        línea se lanza InsufficientStockError y la transacción debe deshacerse.
+        """
+        returning = (Stock.stock_id, Stock.sku, Stock.warehouse_id, Stock.quantity)
+        if db.bind.dialect.name == "postgresql":
+            lines = values(
+                column("sku", String), column("warehouse_id", Integer), column("n", Integer), name="lines"
+            ).data([(sku, warehouse_id, n) for (sku, warehouse_id), n in deltas.items()])
+            query = update(Stock).where(Stock.sku == lines.c.sku, Stock.warehouse_id == lines.c.warehouse_id)
+            if decrement:
+                query = query.where(Stock.quantity >= lines.c.n)
+            new_quantity = Stock.quantity - lines.c.n if decrement else Stock.quantity + lines.c.n
+            result = await db.execute(query.values(quantity=new_quantity).returning(*returning))
+            rows = [dict(row) for row in result.mappings()]
+        else:
+            rows = []
+            for (sku, warehouse_id), n in deltas.items():
+                query = update(Stock).where(Stock.sku == sku, Stock.warehouse_id == warehouse_id)
+                if decrement:
+                    query = query.where(Stock.quantity >= n)
+                new_quantity = Stock.quantity - n if decrement else Stock.quantity + n
+                row = (await db.execute(query.values(quantity=new_quantity).returning(*returning))).mappings().first()
+                if row is not None:
+                    rows.append(dict(row))
+        updated = {(row["sku"], row["warehouse_id"]) for row in rows}
+        missing = [key for key in deltas if key not in updated]
+        if missing:
+            raise InsufficientStockError(missing)
+        return sorted(rows, key=lambda row: (row["sku"], row["warehouse_id"]))
+
+    async def _record_movements(
+        self, db: AsyncSession, movement_type: str, entries: Sequence[Dict[str, Any]], reference: Optional[str]
+    ) -> None:
+        """Añade los movimientos al libro con un único INSERT multi-fila"""
+        if entries:
+            await db.execute(insert(StockMovement), [
+                {
+                    "stock_id": entry["stock_id"],
+                    "sku": entry["sku"],
+                    "warehouse_id": entry["warehouse_id"],
+                    "movement_type": movement_type,
+                    "quantity": entry["quantity"],
+                    "quantity_after": entry.get("quantity_after"),
+                    "reference": reference,
+                }
+                for entry in entries
+            ])
+
+    def _transaction(self, db: AsyncSession, *, commit: bool):
+        """Unidad de trabajo propia si commit=True; si no, el llamante gestiona la transacción"""
+        return unit_of_work(db) if commit else nullcontext(db)
+
+    async def decrement_many(
+        self,
+        db: AsyncSession,
+        *,
+        lines: Sequence[Union[StockLine, Dict[str, Any]]],
+        reference: Optional[str] = None,
+        commit: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Descuenta todas las líneas (p. ej. de un pedido) de forma atómica: o se
+        aplican todas o ninguna. Devuelve las filas de stock resultantes.
+        """
+        deltas = self._group_lines(lines)
+        async with self._transaction(db, commit=commit):
+            rows = await self._apply_deltas(db, deltas, decrement=True)
+            await self._record_movements(db, MOVEMENT_DECREMENT, [
+                {**row, "quantity": deltas[(row["sku"], row["warehouse_id"])], "quantity_after": row["quantity"]}
+                for row in rows
+            ], reference)
+            on_commit(db, partial(self._after_write, db, rows))
+        return rows
+
+    async def reserve(
+        self,
+        db: AsyncSession,
+        *,
+        lines: Sequence[Union[StockLine, Dict[str, Any]]],
+        reference: str,
+        commit: bool = True
+    ) -> List[StockReservation]:
+        """Reserva todas las líneas (descontándolas del stock disponible) o ninguna"""
+        deltas = self._group_lines(lines)
+        async with self._transaction(db, commit=commit):
+            rows = await self._apply_deltas(db, deltas, decrement=True)
+            entries = [
+                {**row, "quantity": deltas[(row["sku"], row["warehouse_id"])], "quantity_after": row["quantity"]}
+                for row in rows
+            ]
+            result = await db.scalars(insert(StockReservation).returning(StockReservation), [
+                {
+                    "stock_id": entry["stock_id"],
+                    "sku": entry["sku"],
+                    "warehouse_id": entry["warehouse_id"],
+                    "quantity": entry["quantity"],
+                    "reference": reference,
+                    "status": RESERVATION_RESERVED,
+                }
+                for entry in entries
+            ])
+            reservations = result.all()
+            await self._record_movements(db, MOVEMENT_RESERVE, entries, reference)
+            on_commit(db, partial(self._after_write, db, rows))
+        return reservations
+
+    async def _close_reservations(
+        self, db: AsyncSession, *, reference: str, status: str
+    ) -> List[StockReservation]:
+        """Pasa las reservas activas de la referencia al estado dado (UPDATE condicional)"""
+        result = await db.scalars(
+            update(StockReservation)
+            .where(StockReservation.reference == reference, StockReservation.status == RESERVATION_RESERVED)
+            .values(status=status)
+            .returning(StockReservation)
+        )
+        return result.all()
+
+    async def commit_reservation(
+        self, db: AsyncSession, *, reference: str, commit: bool = True
+    ) -> List[StockReservation]:
+        """Confirma las reservas activas de la referencia (las unidades ya salieron del stock)"""
+        async with self._transaction(db, commit=commit):
+            reservations = await self._close_reservations(db, reference=reference, status=RESERVATION_COMMITTED)
+            await self._record_movements(db, MOVEMENT_COMMIT, [
+                {
+                    "stock_id": reservation.stock_id,
+                    "sku": reservation.sku,
+                    "warehouse_id": reservation.warehouse_id,
+                    "quantity": reservation.quantity,
+                }
+                for reservation in reservations
+            ], reference)
+            on_commit(db, partial(self._after_write, db, reservations))
+        return reservations
+
+    async def release_reservation(
+        self, db: AsyncSession, *, reference: str, commit: bool = True
+    ) -> List[StockReservation]:
+        """Libera las reservas activas de la referencia devolviendo las unidades al stock"""
+        rows: List[Dict[str, Any]] = []
+        async with self._transaction(db, commit=commit):
+            reservations = await self._close_reservations(db, reference=reference, status=RESERVATION_RELEASED)
+            if reservations:
+                deltas = self._group_lines([
+                    {"sku": r.sku, "warehouse_id": r.warehouse_id, "quantity": r.quantity} for r in reservations
+                ])
+                rows = await self._apply_deltas(db, deltas, decrement=False)
+                await self._record_movements(db, MOVEMENT_RELEASE, [
+                    {**row, "quantity": deltas[(row["sku"], row["warehouse_id"])], "quantity_after": row["quantity"]}
+                    for row in rows
+                ], reference)
+            on_commit(db, partial(self._after_write, db, rows))
+        return reservations
+
+    async def get_movements(
+        self,
+        db: AsyncSession,
+        *,
+        sku: Optional[str] = None,
+        warehouse_id: Optional[int] = None,
+        reference: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[StockMovement]:
+        """Movimientos del libro de stock, del más reciente al más antiguo"""
+        query = select(StockMovement)
+        if sku is not None:
+            query = query.filter(StockMovement.sku == sku)
+        if warehouse_id is not None:
+            query = query.filter(StockMovement.warehouse_id == warehouse_id)
+        if reference is not None:
+            query = query.filter(StockMovement.reference == reference)
+        result = await db.execute(query.order_by(StockMovement.movement_id.desc()).offset(skip).limit(limit))
+        return result.scalars().all()
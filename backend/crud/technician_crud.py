@@ -2,18 +2,26 @@
 """
 Operaciones CRUD para Técnico
 """
-from typing import List, Optional
+from datetime import date
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 
 from backend.models.technician_model import Technician
+from backend.models.technician_workload_model import TechnicianWorkload
 from backend.schemas.technician_schema import TechnicianCreate, TechnicianUpdate
+from backend.core.config import settings
 from backend.crud.base_crud import CRUDBase
+from backend.crud.cache import entity_cache
 
 
 class CRUDTechnician(CRUDBase[Technician, TechnicianCreate, TechnicianUpdate]):
     def __init__(self):
-        super().__init__(Technician)
+        super().__init__(Technician, cache=entity_cache(
+            "technicians",
+            ttl_seconds=settings.CACHE_TECHNICIANS_TTL_SECONDS,
+            max_size=settings.CACHE_TECHNICIANS_MAX_SIZE
+        ))
 
     async def get(self, db: AsyncSession, technician_id: int) -> Optional[Technician]:
         """Obtener técnico por ID"""
@@ -40,6 +48,25 @@ class CRUDTechnician(CRUDBase[Technician, TechnicianCreate, TechnicianUpdate]):
         specializations = result.scalars().all()
         return [spec for spec in specializations if spec is not None]
 
-    async def remove(self, db: AsyncSession, *, technician_id: int) -> Optional[Technician]:
+    async def get_free_in_zone(
+        self, db: AsyncSession, *, zone: str, day: date, capacity: int = 1
+    ) -> List[Tuple[Technician, int]]:
+        """
+        Técnicos de una zona con menos de `capacity` intervenciones ese día,
+        junto con su carga, en una sola consulta sobre technician_workload.
+        """
+        load = func.coalesce(TechnicianWorkload.interventions, 0)
+        result = await db.execute(
+            select(Technician, load.label("interventions"))
+            .outerjoin(TechnicianWorkload, and_(
+                TechnicianWorkload.technician_id == Technician.technician_id,
+                TechnicianWorkload.day == day
+            ))
+            .where(Technician.zone == zone, load < capacity)
+            .order_by(load, Technician.technician_id)
+        )
+        return [(technician, interventions) for technician, interventions in result.all()]
+
+    async def remove(self, db: AsyncSession, *, technician_id: int, commit: bool = True) -> Optional[Technician]:
         """Eliminar técnico por ID"""
-        return await super().remove(db, id=technician_id) 
\ No newline at end of file
+        return await super().remove(db, id=technician_id, commit=commit) 
\ No newline at end of file
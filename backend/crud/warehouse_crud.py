@@ -8,12 +8,18 @@ from sqlalchemy import select
 
 from backend.models.warehouse_model import Warehouse
 from backend.schemas.warehouse_schema import WarehouseCreate, WarehouseUpdate
+from backend.core.config import settings
 from backend.crud.base_crud import CRUDBase
+from backend.crud.cache import entity_cache
 
 
 class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
     def __init__(self):
-        super().__init__(Warehouse)
+        super().__init__(Warehouse, cache=entity_cache(
+            "warehouses",
+            ttl_seconds=settings.CACHE_WAREHOUSES_TTL_SECONDS,
+            max_size=settings.CACHE_WAREHOUSES_MAX_SIZE
+        ))
 
     async def get(self, db: AsyncSession, warehouse_id: int) -> Optional[Warehouse]:
         """Obtener almacén por ID"""
@@ -29,6 +35,6 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
         result = await db.execute(select(Warehouse).filter(Warehouse.name.ilike(f"%{name}%")))
         return result.scalars().all()
 
-    async def remove(self, db: AsyncSession, *, warehouse_id: int) -> Optional[Warehouse]:
+    async def remove(self, db: AsyncSession, *, warehouse_id: int, commit: bool = True) -> Optional[Warehouse]:
         """Eliminar almacén por ID"""
-        return await super().remove(db, id=warehouse_id) 
\ No newline at end of file
+        return await super().remove(db, id=warehouse_id, commit=commit) 
\ No newline at end of file
@@ -14,12 +14,15 @@ from backend.models.product_model import Product  # noqa
 from backend.models.technician_model import Technician  # noqa
 from backend.models.order_model import Order  # noqa
 from backend.models.intervention_model import Intervention  # noqa
+from backend.models.technician_workload_model import TechnicianWorkload  # noqa
 from backend.models.stock_model import Stock  # noqa
+from backend.models.stock_movement_model import StockMovement, StockReservation  # noqa
 from backend.models.warehouse_model import Warehouse  # noqa
 from backend.models.contract_model import Contract  # noqa
 from backend.models.chat_session_model import ChatSession  # noqa
 from backend.models.chat_message_model import ChatMessage  # noqa
 from backend.models.knowledge_feedback_model import KnowledgeFeedback  # noqa
+from backend.models.table_version_model import TableVersion  # noqa
 
 # NOTA: Las importaciones de modelos están aquí para que Alembic
 # pueda detectarlos y generar migraciones automáticamente.
\ No newline at end of file
@@ -0,0 +1,102 @@
+#backend/db/fulltext.py
+"""
+Búsqueda de texto completo independiente del motor de base de datos.
+
+- PostgreSQL: to_tsvector('spanish', ...) @@ websearch_to_tsquery(...) con ts_rank,
+  servido por índices GIN de expresión (migración 0002_fulltext_search).
+- SQLite: tabla virtual FTS5 de contenido externo sincronizada por triggers, con bm25.
+- Otros motores: ILIKE sin ranking.
+"""
+import operator
+import re
+from functools import reduce
+from typing import Any, Sequence
+
+from sqlalchemy import DDL, Table, column, event, func, literal, literal_column, or_, select
+from sqlalchemy import table as sql_table
+from sqlalchemy.sql import ColumnElement
+
+# Configuración de idioma de PostgreSQL para stemming y stopwords
+SEARCH_CONFIG = "spanish"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_table_name(table: Table) -> str:
+    """Nombre de la tabla virtual FTS5 asociada a una tabla"""
+    return f"{table.name}_fts"
+
+
+def register_sqlite_fts(table: Table, columns: Sequence[str]) -> None:
+    """
+    Registra la creación de la tabla FTS5 y sus triggers de sincronización
+    cuando se crea `table` sobre SQLite (p. ej. en la BD en memoria de los tests).
+    """
+    fts = fts_table_name(table)
+    pk = table.primary_key.columns[0].name
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table.name}', content_rowid='{pk}', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table.name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new_cols}); END",
+    ]
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"))
+
+
+def to_fts5_query(text: str, columns: Sequence[str]) -> str:
+    """
+    Convierte texto libre en una consulta FTS5 segura: cada palabra como término
+    entrecomillado con prefijo (AND implícito), restringida a las columnas dadas.
+    """
+    terms = " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(text))
+    return f"{{{' '.join(columns)}}} : ({terms})" if terms else ""
+
+
+def ts_vector(expr: ColumnElement) -> ColumnElement:
+    """
+    to_tsvector de una columna. Los argumentos van como literales (no parámetros)
+    para que la expresión coincida con la de los índices GIN.
+    """
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), func.coalesce(expr, literal_column("''")))
+
+
+def ranked_search_query(model: Any, columns: Sequence[str], text: str, dialect: str):
+    """
+    Construye un SELECT (modelo, search_rank) filtrado por `text` en `columns`.
+
+    Devuelve None si el texto no contiene ningún término buscable.
+    """
+    if not _TOKEN_RE.search(text):
+        return None
+    table = model.__table__
+    pk = getattr(model, table.primary_key.columns[0].name)
+
+    if dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), text)
+        vectors = [ts_vector(getattr(model, name)) for name in columns]
+        rank = reduce(operator.add, (func.ts_rank(vector, ts_query) for vector in vectors))
+        matches = or_(*(vector.op("@@")(ts_query) for vector in vectors))
+        return select(model, rank.label("search_rank")).filter(matches)
+
+    if dialect == "sqlite":
+        fts_name = fts_table_name(table)
+        fts = sql_table(fts_name, column("rowid"))
+        rank = -func.bm25(literal_column(fts_name))
+        return (
+            select(model, rank.label("search_rank"))
+            .join_from(model, fts, pk == fts.c.rowid)
+            .filter(literal_column(fts_name).op("MATCH")(to_fts5_query(text, columns)))
+        )
+
+    matches = or_(*(getattr(model, name).ilike(f"%{text}%") for name in columns))
+    return select(model, literal(0.0).label("search_rank")).filter(matches)
@@ -2,9 +2,17 @@
 """
 Configuración de sesión de base de datos
 """
+import time
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from backend.core.config import settings
+from backend.core.logging import get_logger
+
+logger = get_logger("ainstalia.db")
 
 # Crear engine de SQLAlchemy asíncrono
 engine = create_async_engine(
@@ -21,10 +29,108 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Clave en session.info que marca las sesiones de la réplica (no rellenan cachés, ver base_crud)
+READ_REPLICA_KEY = "read_replica"
+
+# Engine opcional de solo lectura (réplica). Si no se configura, las lecturas van al primario.
+read_engine = create_async_engine(
+    settings.DATABASE_READ_URL,
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+) if settings.DATABASE_READ_URL else None
+
+AsyncReadSessionLocal = async_sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    info={READ_REPLICA_KEY: True}
+) if read_engine is not None else None
+
+
+class ReplicaHealth:
+    """Estado de la réplica de lectura: lag medido y disponibilidad, cacheados entre comprobaciones"""
+
+    def __init__(self, max_lag_seconds: float, check_interval_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.last_check: float = 0.0
+        self.last_lag: Optional[float] = None
+        self.available: bool = True
+
+    def needs_check(self) -> bool:
+        """Indica si ha pasado el intervalo mínimo desde la última comprobación"""
+        return time.monotonic() - self.last_check >= self.check_interval_seconds
+
+    async def check(self, session: AsyncSession) -> bool:
+        """
+        Mide el lag de replicación y actualiza la disponibilidad de la réplica.
+
+        Si la réplica ya ha aplicado todo el WAL recibido (LSN de recepción igual
+        al de replay) el lag es 0: sin escrituras en el primario,
+        pg_last_xact_replay_timestamp() se queda fijo y now() - timestamp crecería
+        sin que la réplica vaya retrasada. Solo con WAL pendiente de aplicar se
+        usa la antigüedad de la última transacción aplicada.
+        """
+        self.last_check = time.monotonic()
+        try:
+            if session.bind.dialect.name == "postgresql":
+                result = await session.execute(text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                ))
+                self.last_lag = float(result.scalar() or 0)
+            else:
+                await session.execute(text("SELECT 1"))
+                self.last_lag = 0.0
+            self.available = self.last_lag <= self.max_lag_seconds
+            if not self.available:
+                logger.warning(
+                    "Réplica de lectura con lag %.1fs (máximo %.1fs), usando primario",
+                    self.last_lag, self.max_lag_seconds
+                )
+        except Exception as e:
+            logger.warning("Réplica de lectura no disponible, usando primario: %s", e)
+            self.last_lag = None
+            self.available = False
+        return self.available
+
+
+replica_health = ReplicaHealth(
+    max_lag_seconds=settings.READ_REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.READ_REPLICA_CHECK_INTERVAL_SECONDS,
+)
+
 # Dependency para obtener sesión de DB asíncrona
 async def get_db():
     db: AsyncSession = AsyncSessionLocal()
     try:
         yield db
     finally:
-        await db.close()
\ No newline at end of file
+        await db.close()
+
+# Dependency para endpoints de solo lectura (listados, detalle, consultas del agente SQL)
+async def get_read_db(primary: AsyncSession = Depends(get_db)):
+    """
+    Devuelve una sesión contra la réplica de lectura si está configurada y su lag
+    es tolerable; en otro caso devuelve la sesión del primario.
+
+    La sesión del primario se recibe como dependencia para poder usarla como
+    fallback; AsyncSession no abre conexión hasta la primera consulta, así que
+    no tiene coste cuando se usa la réplica.
+    """
+    if AsyncReadSessionLocal is None:
+        yield primary
+        return
+
+    db: AsyncSession = AsyncReadSessionLocal()
+    try:
+        if replica_health.needs_check():
+            await replica_health.check(db)
+        if replica_health.available or not settings.READ_REPLICA_FALLBACK_TO_PRIMARY:
+            yield db
+        else:
+            yield primary
+    finally:
+        await db.close()
@@ -0,0 +1,87 @@
+#backend/db/table_versions.py
+"""
+Versión por tabla para los ETag de los listados de catálogo.
+
+La tabla `table_versions` guarda un contador por tabla que mantienen triggers
+de la propia base de datos, de modo que cuenta cualquier escritura (ORM, UPDATE
+directos, scripts de carga, SQL manual) y se confirma o se deshace con ella.
+Leer la huella de una tabla es una consulta por clave primaria.
+
+- PostgreSQL: trigger de restricción diferido (se ejecuta en el COMMIT) que suma
+  1 una sola vez por transacción y tabla; el bloqueo de la fila del contador
+  dura solo el commit, así que los escritores de una tabla no se serializan
+  durante toda su transacción. TRUNCATE suma con un trigger por sentencia.
+- SQLite: triggers por fila (SQLite ya serializa las escrituras).
+
+Un contador, a diferencia de max(updated_at), cambia en el orden de los commits:
+una transacción larga que confirma después de otra más reciente también cambia
+la huella.
+"""
+from typing import List
+
+from sqlalchemy import DDL, Table, event
+
+VERSIONS_TABLE = "table_versions"
+
+# Los DDL no llevan '%': sqlalchemy.DDL aplica formateo con % al texto
+PG_BUMP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+DECLARE
+    flag text := 'ainstalia.version_bumped_' || TG_TABLE_NAME;
+BEGIN
+    IF current_setting(flag, true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM set_config(flag, 'on', true);
+    INSERT INTO {VERSIONS_TABLE} (table_name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = {VERSIONS_TABLE}.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def table_version_ddl(table_name: str, dialect: str) -> List[str]:
+    """Sentencias que crean los triggers de versión de una tabla (idempotentes)"""
+    if dialect == "postgresql":
+        return [
+            PG_BUMP_FUNCTION,
+            f"DROP TRIGGER IF EXISTS trg_{table_name}_version ON {table_name}",
+            f"CREATE CONSTRAINT TRIGGER trg_{table_name}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table_name} "
+            f"DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_table_version()",
+            f"DROP TRIGGER IF EXISTS trg_{table_name}_version_truncate ON {table_name}",
+            f"CREATE TRIGGER trg_{table_name}_version_truncate AFTER TRUNCATE ON {table_name} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()",
+        ]
+    if dialect == "sqlite":
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table_name}_version_{suffix} AFTER {operation} ON {table_name} BEGIN "
+            f"INSERT INTO {VERSIONS_TABLE} (table_name, version) VALUES ('{table_name}', 1) "
+            f"ON CONFLICT (table_name) DO UPDATE SET version = version + 1; END"
+            for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+        ]
+    return []
+
+
+def drop_table_version_ddl(table_name: str, dialect: str) -> List[str]:
+    """Sentencias que eliminan los triggers de versión de una tabla"""
+    if dialect == "postgresql":
+        return [
+            f"DROP TRIGGER IF EXISTS trg_{table_name}_version ON {table_name}",
+            f"DROP TRIGGER IF EXISTS trg_{table_name}_version_truncate ON {table_name}",
+        ]
+    if dialect == "sqlite":
+        return [f"DROP TRIGGER IF EXISTS trg_{table_name}_version_{suffix}" for suffix in ("ai", "au", "ad")]
+    return []
+
+
+def register_table_version(table: Table) -> None:
+    """
+    Registra la creación de los triggers de versión cuando se crea `table` con
+    metadata.create_all (tests, benchmarks); las bases de datos existentes los
+    reciben de la migración 0006 o de data/create_tables.sql.
+    """
+    for dialect in ("postgresql", "sqlite"):
+        for statement in table_version_ddl(table.name, dialect):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect=dialect))
@@ -2,16 +2,46 @@
 """
 Arranque del servidor FastAPI
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.core.config import settings
+from backend.core.logging import configure_logging
+from backend.core.responses import FastJSONResponse
 from backend.api.v1.api_router import api_router
+from backend.db.session import AsyncSessionLocal
+from backend.services.contract_lifecycle_service import contract_expiry_scanner
+from backend.services.stock_alert_service import stock_alert_monitor
+
+configure_logging(settings)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Tareas de fondo de la aplicación (se cancelan al apagar)"""
+    tasks = [
+        asyncio.create_task(
+            stock_alert_monitor.run_resync_loop(AsyncSessionLocal, settings.STOCK_ALERT_RESYNC_SECONDS)
+        ),
+        asyncio.create_task(
+            contract_expiry_scanner.run_scan_loop(AsyncSessionLocal, settings.CONTRACT_EXPIRY_SCAN_SECONDS)
+        ),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
 # Crear instancia de FastAPI
 app = FastAPI(
     title="AInstalia - Sistema IA Multiagente",
     description="API para gestión de mantenimiento industrial con agentes IA",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -21,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # Cursor de paginación y GET condicional
 )
 
 # Incluir rutas de la API
@@ -0,0 +1,2 @@
+# Modelos SQLAlchemy
+# Las tablas se registran en Base.metadata al importar backend.db.base
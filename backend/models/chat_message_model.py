@@ -0,0 +1,18 @@
+#backend/models/chat_message_model.py
+"""
+Modelo SQLAlchemy para Mensajes de Chat
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
+
+from backend.db.base import Base
+
+
+class ChatMessage(Base):
+    """Mensaje de una sesión de chat (cliente, agente o sistema)"""
+    __tablename__ = "chat_messages"
+
+    message_id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(String, ForeignKey("chat_sessions.chat_id"))
+    message_timestamp = Column(DateTime, nullable=False, server_default=func.now())
+    sender = Column(String)  # cliente, agente, sistema
+    message_text = Column(Text)
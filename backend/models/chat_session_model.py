@@ -0,0 +1,19 @@
+#backend/models/chat_session_model.py
+"""
+Modelo SQLAlchemy para Sesiones de Chat
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+
+from backend.db.base import Base
+
+
+class ChatSession(Base):
+    """Conversación con un cliente, opcionalmente asociada a un pedido"""
+    __tablename__ = "chat_sessions"
+
+    chat_id = Column(String, primary_key=True)
+    order_id = Column(String, ForeignKey("orders.order_id"))
+    client_id = Column(Integer, ForeignKey("clients.client_id"))
+    start_timestamp = Column(DateTime, server_default=func.now())
+    end_timestamp = Column(DateTime)
+    topic = Column(String)
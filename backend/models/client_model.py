@@ -0,0 +1,18 @@
+#backend/models/client_model.py
+"""
+Modelo SQLAlchemy para Clientes
+"""
+from sqlalchemy import Column, Integer, String, Text
+
+from backend.db.base import Base
+
+
+class Client(Base):
+    """Cliente de AInstalia"""
+    __tablename__ = "clients"
+
+    client_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    email = Column(String, unique=True)
+    phone = Column(String)
+    address = Column(Text)
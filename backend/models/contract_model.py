@@ -0,0 +1,19 @@
+#backend/models/contract_model.py
+"""
+Modelo SQLAlchemy para Contratos
+"""
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
+
+from backend.db.base import Base
+
+
+class Contract(Base):
+    """Contrato de mantenimiento o servicio de un cliente"""
+    __tablename__ = "contracts"
+
+    contract_id = Column(Integer, primary_key=True, autoincrement=True)
+    client_id = Column(Integer, ForeignKey("clients.client_id"))
+    start_date = Column(Date)
+    end_date = Column(Date)
+    type = Column(String)
+    terms = Column(Text)
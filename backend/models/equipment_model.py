@@ -0,0 +1,20 @@
+#backend/models/equipment_model.py
+"""
+Modelo SQLAlchemy para Equipos Instalados
+"""
+from sqlalchemy import Column, Integer, String, Date, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+
+from backend.db.base import Base
+
+
+class InstalledEquipment(Base):
+    """Equipo (producto) instalado en las instalaciones de un cliente"""
+    __tablename__ = "installed_equipment"
+
+    equipment_id = Column(Integer, primary_key=True, autoincrement=True)
+    client_id = Column(Integer, ForeignKey("clients.client_id"))
+    sku = Column(String, ForeignKey("products.sku"))
+    install_date = Column(Date)
+    status = Column(String, default="activo")
+    config_json = Column(JSON().with_variant(JSONB(), "postgresql"))
@@ -0,0 +1,26 @@
+#backend/models/intervention_model.py
+"""
+Modelo SQLAlchemy para Intervenciones
+"""
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
+
+from backend.db.base import Base
+
+
+class Intervention(Base):
+    """
+    Intervención de un técnico sobre el equipo de un cliente.
+
+    La fecha se guarda en la columna `date` y se expone como `scheduled_date`.
+    """
+    __tablename__ = "interventions"
+
+    intervention_id = Column(Integer, primary_key=True, autoincrement=True)
+    technician_id = Column(Integer, ForeignKey("technicians.technician_id"))
+    client_id = Column(Integer, ForeignKey("clients.client_id"))
+    equipment_id = Column(Integer, ForeignKey("installed_equipment.equipment_id"))
+    scheduled_date = Column("date", Date, nullable=False)
+    type = Column(String)  # instalacion, mantenimiento, reparacion, retirada
+    description = Column(Text)
+    result = Column(Text)
+    document_url = Column(Text)
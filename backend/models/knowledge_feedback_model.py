@@ -0,0 +1,20 @@
+#backend/models/knowledge_feedback_model.py
+"""
+Modelo SQLAlchemy para Feedback de la Base de Conocimiento
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, func
+
+from backend.db.base import Base
+
+
+class KnowledgeFeedback(Base):
+    """Pregunta con la respuesta esperada, pendiente de revisar e incorporar al RAG"""
+    __tablename__ = "knowledge_feedback"
+
+    feedback_id = Column(Integer, primary_key=True, autoincrement=True)
+    question = Column(Text)
+    expected_answer = Column(Text)
+    user_type = Column(String)
+    status = Column(String, default="pendiente")
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
@@ -0,0 +1,33 @@
+#backend/models/order_model.py
+"""
+Modelos SQLAlchemy para Pedidos y Elementos de Pedido
+"""
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, func
+
+from backend.db.base import Base
+
+
+class Order(Base):
+    """Pedido de un cliente, opcionalmente originado en una sesión de chat"""
+    __tablename__ = "orders"
+
+    order_id = Column(String, primary_key=True)
+    client_id = Column(Integer, ForeignKey("clients.client_id"))
+    chat_id = Column(String)
+    total_amount = Column(Numeric(10, 2))
+    status = Column(String, default="pendiente")
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+
+
+class OrderItem(Base):
+    """Línea de un pedido"""
+    __tablename__ = "order_items"
+
+    item_id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(String, ForeignKey("orders.order_id"))
+    product_sku = Column(String, ForeignKey("products.sku"))
+    quantity = Column(Integer)
+    price = Column(Numeric(10, 2))
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
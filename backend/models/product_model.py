@@ -0,0 +1,26 @@
+#backend/models/product_model.py
+"""
+Modelo SQLAlchemy para Productos
+"""
+from sqlalchemy import Column, String, Text, Numeric, JSON, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from backend.db.base import Base
+from backend.db.table_versions import register_table_version
+
+
+class Product(Base):
+    """Producto del catálogo, identificado por SKU"""
+    __tablename__ = "products"
+
+    sku = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+    description = Column(Text)
+    price = Column(Numeric(10, 2))
+    spec_json = Column(JSON().with_variant(JSONB(), "postgresql"))
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+
+
+# Versión de la tabla para los ETag del listado
+register_table_version(Product.__table__)
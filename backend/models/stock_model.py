@@ -0,0 +1,28 @@
+#backend/models/stock_model.py
+"""
+Modelo SQLAlchemy para Stock
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, func
+
+from backend.db.base import Base
+from backend.db.table_versions import register_table_version
+
+
+class Stock(Base):
+    """Unidades de un producto en un almacén (una fila por sku y almacén)"""
+    __tablename__ = "stock"
+
+    stock_id = Column(Integer, primary_key=True, autoincrement=True)
+    sku = Column(String, ForeignKey("products.sku"))
+    warehouse_id = Column(Integer, ForeignKey("warehouses.warehouse_id"))
+    quantity = Column(Integer)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("sku", "warehouse_id", name="uq_stock_sku_warehouse"),
+    )
+
+
+# Versión de la tabla para los ETag del listado
+register_table_version(Stock.__table__)
@@ -0,0 +1,57 @@
+#backend/models/stock_movement_model.py
+"""
+Modelos SQLAlchemy para Movimientos y Reservas de Stock
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
+
+from backend.db.base import Base
+
+
+class StockMovement(Base):
+    """
+    Libro de movimientos de stock (solo inserción).
+
+    Cada cambio atómico de cantidad deja una fila: tipo de movimiento, unidades
+    y cantidad resultante, con la referencia (p. ej. el pedido) que lo originó.
+    """
+    __tablename__ = "stock_movements"
+
+    movement_id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stock.stock_id"), nullable=False)
+    sku = Column(String, nullable=False)
+    warehouse_id = Column(Integer, nullable=False)
+    movement_type = Column(String, nullable=False)  # reserva, confirmacion, liberacion, salida
+    quantity = Column(Integer, nullable=False)
+    quantity_after = Column(Integer)
+    reference = Column(String)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_stock_movements_stock_id", "stock_id"),
+        Index("ix_stock_movements_reference", "reference"),
+    )
+
+
+class StockReservation(Base):
+    """
+    Reserva de unidades de una línea de stock.
+
+    Al reservar se descuentan las unidades de `stock.quantity`; confirmar solo
+    cambia el estado y liberar las devuelve. Las transiciones se hacen con
+    UPDATE condicionales sobre el estado, por lo que no pueden aplicarse dos veces.
+    """
+    __tablename__ = "stock_reservations"
+
+    reservation_id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stock.stock_id"), nullable=False)
+    sku = Column(String, nullable=False)
+    warehouse_id = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    reference = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="reservada")  # reservada, confirmada, liberada
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_stock_reservations_reference_status", "reference", "status"),
+    )
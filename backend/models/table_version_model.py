@@ -0,0 +1,18 @@
+#backend/models/table_version_model.py
+"""
+Modelo SQLAlchemy para las Versiones de tabla
+"""
+from sqlalchemy import BigInteger, Column, String
+
+from backend.db.base import Base
+
+
+class TableVersion(Base):
+    """
+    Contador de escrituras por tabla: lo suman triggers de la base de datos
+    (backend/db/table_versions.py) y lo leen los ETag de los listados.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
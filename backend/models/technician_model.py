@@ -0,0 +1,18 @@
+#backend/models/technician_model.py
+"""
+Modelo SQLAlchemy para Técnicos
+"""
+from sqlalchemy import Column, Integer, String
+
+from backend.db.base import Base
+
+
+class Technician(Base):
+    """Técnico de campo asignado a una zona"""
+    __tablename__ = "technicians"
+
+    technician_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    email = Column(String, unique=True)
+    phone = Column(String)
+    zone = Column(String)
@@ -0,0 +1,25 @@
+#backend/models/technician_workload_model.py
+"""
+Modelo SQLAlchemy para la Carga de Trabajo diaria de los Técnicos
+"""
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+
+from backend.db.base import Base
+
+
+class TechnicianWorkload(Base):
+    """
+    Índice de planificación: número de intervenciones de cada técnico por día.
+
+    Es un modelo de lectura derivado de `interventions`; CRUDIntervention suma o
+    resta en cada escritura el delta de los (técnico, día) afectados.
+    """
+    __tablename__ = "technician_workload"
+
+    technician_id = Column(Integer, ForeignKey("technicians.technician_id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    interventions = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_technician_workload_day", "day"),
+    )
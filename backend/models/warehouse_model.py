@@ -0,0 +1,22 @@
+#backend/models/warehouse_model.py
+"""
+Modelo SQLAlchemy para Almacenes
+"""
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from backend.db.base import Base
+from backend.db.table_versions import register_table_version
+
+
+class Warehouse(Base):
+    """Almacén con stock de productos"""
+    __tablename__ = "warehouses"
+
+    warehouse_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+
+
+# Versión de la tabla para los ETag del listado
+register_table_version(Warehouse.__table__)
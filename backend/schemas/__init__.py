@@ -8,21 +8,25 @@ from .product_schema import (
     ProductBase, ProductCreate, ProductUpdate, ProductResponse, ProductWithRelations
 )
 from .technician_schema import (
-    TechnicianBase, TechnicianCreate, TechnicianUpdate, TechnicianResponse, TechnicianWithRelations
+    TechnicianBase, TechnicianCreate, TechnicianUpdate, TechnicianResponse, TechnicianWithRelations,
+    TechnicianAvailability
 )
 from .equipment_schema import (
     InstalledEquipmentBase, InstalledEquipmentCreate, InstalledEquipmentUpdate, 
     InstalledEquipmentResponse, InstalledEquipmentWithRelations
 )
 from .intervention_schema import (
-    InterventionBase, InterventionCreate, InterventionUpdate, InterventionResponse, InterventionWithRelations
+    InterventionBase, InterventionCreate, InterventionUpdate, InterventionResponse, InterventionWithRelations,
+    TechnicianSchedule
 )
 from .contract_schema import (
-    ContractBase, ContractCreate, ContractUpdate, ContractResponse, ContractWithRelations
+    ContractBase, ContractCreate, ContractUpdate, ContractResponse, ContractWithRelations,
+    ContractExpiring, ContractExpiryBucket, ContractExpirySummary
 )
 from .order_schema import (
     OrderBase, OrderCreate, OrderUpdate, OrderResponse, OrderWithItems,
-    OrderItemBase, OrderItemCreate, OrderItemUpdate, OrderItemResponse, OrderItemWithRelations
+    OrderItemBase, OrderItemCreate, OrderItemUpdate, OrderItemResponse, OrderItemWithRelations,
+    OrderItemBulkCreate, OrderCreateWithItems, OrderItemDetail, OrderFull
 )
 
 # Esquemas nuevos
@@ -30,16 +34,21 @@ from .warehouse_schema import (
     WarehouseBase, WarehouseCreate, WarehouseUpdate, WarehouseResponse, WarehouseWithRelations
 )
 from .stock_schema import (
-    StockBase, StockCreate, StockUpdate, StockResponse, StockWithRelations
+    StockBase, StockCreate, StockUpdate, StockResponse, StockWithRelations, StockBulkUpdate,
+    StockLine, StockMovementRequest, StockReservationResponse, StockMovementResponse,
+    StockAvailabilityRequest, StockWarehouseAvailability, StockAvailability,
+    StockAlert, StockAlertThreshold
 )
 from .knowledge_feedback_schema import (
-    KnowledgeFeedbackBase, KnowledgeFeedbackCreate, KnowledgeFeedbackUpdate, KnowledgeFeedbackResponse
+    KnowledgeFeedbackBase, KnowledgeFeedbackCreate, KnowledgeFeedbackUpdate, KnowledgeFeedbackResponse,
+    KnowledgeFeedbackSearchResult
 )
 from .chat_session_schema import (
     ChatSessionBase, ChatSessionCreate, ChatSessionUpdate, ChatSessionResponse, ChatSessionWithRelations
 )
 from .chat_message_schema import (
-    ChatMessageBase, ChatMessageCreate, ChatMessageUpdate, ChatMessageResponse, ChatMessageWithRelations
+    ChatMessageBase, ChatMessageCreate, ChatMessageUpdate, ChatMessageResponse, ChatMessageWithRelations,
+    ChatMessageSearchResult
 )
 
 # AI Schemas
@@ -56,26 +65,35 @@ __all__ = [
     "ProductBase", "ProductCreate", "ProductUpdate", "ProductResponse", "ProductWithRelations",
     # Technician schemas
     "TechnicianBase", "TechnicianCreate", "TechnicianUpdate", "TechnicianResponse", "TechnicianWithRelations",
+    "TechnicianAvailability",
     # Equipment schemas
     "InstalledEquipmentBase", "InstalledEquipmentCreate", "InstalledEquipmentUpdate", 
     "InstalledEquipmentResponse", "InstalledEquipmentWithRelations",
     # Intervention schemas
     "InterventionBase", "InterventionCreate", "InterventionUpdate", "InterventionResponse", "InterventionWithRelations",
+    "TechnicianSchedule",
     # Contract schemas
     "ContractBase", "ContractCreate", "ContractUpdate", "ContractResponse", "ContractWithRelations",
+    "ContractExpiring", "ContractExpiryBucket", "ContractExpirySummary",
     # Order schemas
     "OrderBase", "OrderCreate", "OrderUpdate", "OrderResponse", "OrderWithItems",
     "OrderItemBase", "OrderItemCreate", "OrderItemUpdate", "OrderItemResponse", "OrderItemWithRelations",
+    "OrderItemBulkCreate", "OrderCreateWithItems", "OrderItemDetail", "OrderFull",
     # Warehouse schemas
     "WarehouseBase", "WarehouseCreate", "WarehouseUpdate", "WarehouseResponse", "WarehouseWithRelations",
     # Stock schemas
-    "StockBase", "StockCreate", "StockUpdate", "StockResponse", "StockWithRelations",
+    "StockBase", "StockCreate", "StockUpdate", "StockResponse", "StockWithRelations", "StockBulkUpdate",
+    "StockLine", "StockMovementRequest", "StockReservationResponse", "StockMovementResponse",
+    "StockAvailabilityRequest", "StockWarehouseAvailability", "StockAvailability",
+    "StockAlert", "StockAlertThreshold",
     # Knowledge Feedback schemas
     "KnowledgeFeedbackBase", "KnowledgeFeedbackCreate", "KnowledgeFeedbackUpdate", "KnowledgeFeedbackResponse",
+    "KnowledgeFeedbackSearchResult",
     # Chat Session schemas
     "ChatSessionBase", "ChatSessionCreate", "ChatSessionUpdate", "ChatSessionResponse", "ChatSessionWithRelations",
     # Chat Message schemas
     "ChatMessageBase", "ChatMessageCreate", "ChatMessageUpdate", "ChatMessageResponse", "ChatMessageWithRelations",
+    "ChatMessageSearchResult",
     # AI schemas
     "UserRole", "SQLQueryRequest", "SQLQueryResponse", "BusinessInsightsResponse",
     "KnowledgeQueryRequest", "KnowledgeQueryResponse", "FeedbackRequest",
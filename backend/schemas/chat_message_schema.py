@@ -35,6 +35,10 @@ class ChatMessageResponse(ChatMessageBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Esquema de resultado de búsqueda de texto completo (con puntuación de relevancia)
+class ChatMessageSearchResult(ChatMessageResponse):
+    rank: float
+
 # Esquema de respuesta con relaciones
 class ChatMessageWithRelations(ChatMessageResponse):
     # Estas relaciones se pueden agregar cuando se necesiten
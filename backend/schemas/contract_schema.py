@@ -3,7 +3,7 @@
 Esquemas Pydantic para Contrato
 """
 from datetime import datetime, date
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, List, Union
 from decimal import Decimal
 from pydantic import BaseModel, field_validator, ConfigDict
 
@@ -59,4 +59,27 @@ class ContractResponse(ContractBase):
 
 # Esquema con relaciones
 class ContractWithRelations(ContractResponse):
-    client: Optional[Dict] = None 
\ No newline at end of file
+    client: Optional[Dict] = None 
+
+# Contrato próximo a vencer (vista ligera de los buckets de vencimientos)
+class ContractExpiring(BaseModel):
+    contract_id: int
+    client_id: int
+    type: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: date
+    days_left: int
+
+# Contratos que vencen dentro de un horizonte (y no en uno menor)
+class ContractExpiryBucket(BaseModel):
+    horizon_days: int
+    until: date
+    count: int
+    contracts: List[ContractExpiring]
+
+# Instantánea de vencimientos precalculada
+class ContractExpirySummary(BaseModel):
+    reference_date: date
+    generated_at: datetime
+    total: int
+    buckets: List[ContractExpiryBucket]
@@ -3,7 +3,7 @@
 Esquemas Pydantic para Intervención
 """
 from datetime import datetime, date
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from decimal import Decimal
 from pydantic import BaseModel, field_validator, ConfigDict
 
@@ -67,4 +67,9 @@ class InterventionResponse(InterventionBase):
 class InterventionWithRelations(InterventionResponse):
     technician: Optional[Dict] = None
     client: Optional[Dict] = None
-    equipment: Optional[Dict] = None 
\ No newline at end of file
+    equipment: Optional[Dict] = None 
+
+# Próximas intervenciones de un técnico
+class TechnicianSchedule(BaseModel):
+    technician_id: int
+    interventions: List[InterventionResponse]
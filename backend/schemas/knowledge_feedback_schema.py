@@ -43,4 +43,8 @@ class KnowledgeFeedbackResponse(KnowledgeFeedbackBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Esquema de resultado de búsqueda de texto completo (con puntuación de relevancia)
+class KnowledgeFeedbackSearchResult(KnowledgeFeedbackResponse):
+    rank: float
+
 # Sin relaciones - tabla independiente para análisis de conocimiento 
\ No newline at end of file
@@ -7,6 +7,8 @@ from typing import Optional, List
 from decimal import Decimal
 from pydantic import BaseModel, ConfigDict
 
+from backend.schemas.product_schema import ProductResponse
+
 # === ESQUEMAS PARA ORDER ===
 
 # Esquema base para pedido
@@ -55,6 +57,16 @@ class OrderItemUpdate(BaseModel):
     quantity: Optional[int] = None
     price: Optional[Decimal] = None
 
+# Esquema para alta masiva de elementos en un pedido (el order_id viene de la ruta)
+class OrderItemBulkCreate(BaseModel):
+    product_sku: str
+    quantity: int
+    price: Optional[Decimal] = None
+
+# Esquema para crear un pedido junto con sus elementos en una sola transacción
+class OrderCreateWithItems(OrderCreate):
+    items: List[OrderItemBulkCreate] = []
+
 # Esquema de respuesta para elemento de pedido
 class OrderItemResponse(OrderItemBase):
     item_id: int
@@ -71,6 +83,14 @@ class OrderWithItems(OrderResponse):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Elemento de pedido con el producto referenciado
+class OrderItemDetail(OrderItemResponse):
+    product: Optional[ProductResponse] = None
+
+# Pedido completo: elementos y productos cargados en un número fijo de consultas
+class OrderFull(OrderResponse):
+    items: List[OrderItemDetail] = []
+
 # Esquema de respuesta con relaciones para elemento de pedido
 class OrderItemWithRelations(OrderItemResponse):
     # order: Optional["OrderResponse"] = None
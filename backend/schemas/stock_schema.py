@@ -3,8 +3,8 @@
 Esquemas Pydantic para Stock/Inventario
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 # Esquema base
 class StockBase(BaseModel):
@@ -22,6 +22,10 @@ class StockUpdate(BaseModel):
     warehouse_id: Optional[int] = None
     quantity: Optional[int] = None
 
+# Esquema para actualización masiva (incluye la clave primaria)
+class StockBulkUpdate(StockUpdate):
+    stock_id: int
+
 # Esquema de respuesta
 class StockResponse(StockBase):
     stock_id: int
@@ -35,4 +39,86 @@ class StockWithRelations(StockResponse):
     # Estas relaciones se pueden agregar cuando se necesiten
     # product: Optional["ProductResponse"] = None
     # warehouse: Optional["WarehouseResponse"] = None
-    pass 
\ No newline at end of file
+    pass 
+
+
+# Línea de un movimiento de stock (unidades de un SKU en un almacén)
+class StockLine(BaseModel):
+    sku: str
+    warehouse_id: int
+    quantity: int = Field(..., gt=0)
+
+
+# Esquema para reservar o descontar varias líneas de una vez (p. ej. un pedido)
+class StockMovementRequest(BaseModel):
+    reference: str = Field(..., min_length=1, description="Referencia del movimiento, p. ej. el ID del pedido")
+    lines: List[StockLine] = Field(..., min_length=1)
+
+
+# Esquema de respuesta de una reserva
+class StockReservationResponse(BaseModel):
+    reservation_id: int
+    stock_id: int
+    sku: str
+    warehouse_id: int
+    quantity: int
+    reference: str
+    status: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Esquema de respuesta de un movimiento del libro de stock
+class StockMovementResponse(BaseModel):
+    movement_id: int
+    stock_id: int
+    sku: str
+    warehouse_id: int
+    movement_type: str
+    quantity: int
+    quantity_after: Optional[int] = None
+    reference: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Esquema para consultar la disponibilidad de varios SKU
+class StockAvailabilityRequest(BaseModel):
+    skus: List[str] = Field(..., min_length=1)
+
+
+# Disponibilidad de un SKU en un almacén
+class StockWarehouseAvailability(BaseModel):
+    warehouse_id: int
+    available: int
+    reserved: int
+
+
+# Disponibilidad agregada de un SKU (disponible + reservado = existencias físicas)
+class StockAvailability(BaseModel):
+    sku: str
+    available: int
+    reserved: int
+    on_hand: int
+    warehouses: List[StockWarehouseAvailability] = []
+
+
+# Alerta de stock bajo activa
+class StockAlert(BaseModel):
+    stock_id: int
+    sku: str
+    warehouse_id: int
+    quantity: int
+    threshold: int
+    level: str  # bajo, agotado
+    since: datetime
+
+
+# Umbral de alerta de un SKU (en todos los almacenes si warehouse_id es None)
+class StockAlertThreshold(BaseModel):
+    sku: str
+    warehouse_id: Optional[int] = None
+    threshold: Optional[int] = Field(None, ge=0, description="None elimina el umbral personalizado")
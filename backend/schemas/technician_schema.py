@@ -37,4 +37,8 @@ class TechnicianWithRelations(TechnicianResponse):
     interventions: Optional[List[Dict]] = None
     # Estas relaciones se pueden agregar cuando se necesiten
     # interventions: List["InterventionResponse"] = []
-    pass 
\ No newline at end of file
+    pass 
+
+# Técnico disponible con su carga de trabajo en el día consultado
+class TechnicianAvailability(TechnicianResponse):
+    interventions: int = 0
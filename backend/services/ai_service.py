@@ -59,14 +59,15 @@ class AIService:
         return ChatOpenAI(
             model=settings.OPENAI_MODEL,
             temperature=0,
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_BASE_URL
         )
     
     def _initialize_sql_agent(self) -> Any:
         """Inicializa el agente SQL de LangChain"""
         try:
-            # Crear conexión SQL para LangChain
-            db_url = settings.DATABASE_URL
+            # Crear conexión SQL para LangChain (contra la réplica de lectura si existe)
+            db_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
             sql_db = SQLDatabase.from_uri(db_url)
             
             # Crear toolkit SQL
@@ -212,7 +213,7 @@ EJEMPLOS DE CONSULTAS ÚTILES:
             Dict con resultado, SQL generado y metadatos
         """
         try:
-            logger.info(f"Procesando consulta SQL: '{natural_query}' para rol: {user_role}")
+            logger.info("Procesando consulta SQL: '%s' para rol: %s", natural_query, user_role)
             
             # Verificar que el agente esté inicializado
             if not self.sql_agent:
@@ -278,7 +279,7 @@ INSTRUCCIONES ADICIONALES:
                 }
             
             # Ejecutar consulta SQL validada asíncronamente
-            logger.info(f"Ejecutando SQL validado: {sql_query}")
+            logger.info("Ejecutando SQL validado: %s", sql_query)
             
             # Aquí es donde realmente ejecutas la consulta en la DB de forma asíncrona
             # Usar db_session directamente con execute para consultas SELECT
@@ -0,0 +1,159 @@
+#backend/services/contract_lifecycle_service.py
+"""
+Ciclo de vida de contratos: vencimientos agrupados por horizonte.
+
+Una tarea de fondo calcula, con una única consulta por rango sobre el índice
+de `contracts.end_date`, los contratos que vencen dentro de los horizontes
+configurados (por defecto 30/60/90 días) y guarda el resultado en memoria. Las
+lecturas (campañas de renovación, insights) devuelven esa instantánea sin
+tocar la tabla.
+
+La instantánea se marca como obsoleta cuando CRUDContract escribe contratos o
+cambia el día; la siguiente lectura o la tarea de fondo (que se despierta al
+instante) la recalculan. El recálculo se hace siempre contra el primario: una
+instantánea construida desde una réplica con lag quedaría marcada como vigente
+con los buckets anteriores a la escritura hasta el siguiente intervalo. El
+estado es por proceso: con varios workers cada uno mantiene el suyo.
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.crud.base_crud import can_fill_cache
+from backend.models.contract_model import Contract
+
+logger = get_logger("ainstalia.contract_lifecycle")
+
+
+class ContractExpiryScanner:
+    """Buckets de contratos por vencer, recalculados en segundo plano"""
+
+    def __init__(self, horizons_days: Sequence[int]):
+        self.horizons_days = sorted(set(horizons_days))
+        self.snapshot: Optional[Dict[str, Any]] = None
+        # Por horizonte (días) → bucket, para servir un horizonte concreto sin recorrer la lista
+        self._buckets: Dict[int, Dict[str, Any]] = {}
+        self._stale = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Cálculo
+    # ------------------------------------------------------------------
+
+    async def scan(self, db: AsyncSession, *, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Recalcula los buckets: una sola consulta por rango de `end_date` entre hoy y
+        el mayor horizonte; cada contrato va al menor horizonte que lo contiene.
+        """
+        today = today or date.today()
+        # Se limpia antes de consultar: una escritura durante el cálculo vuelve a marcarla
+        self._stale.clear()
+        self.snapshot, self._buckets = await self._compute(db, today)
+        return self.snapshot
+
+    async def _compute(self, db: AsyncSession, today: date) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+        """Instantánea y buckets por horizonte, sin guardarlos"""
+        until = today + timedelta(days=self.horizons_days[-1])
+        rows = (await db.execute(
+            select(Contract.contract_id, Contract.client_id, Contract.type, Contract.start_date, Contract.end_date)
+            .where(Contract.end_date >= today, Contract.end_date <= until)
+            .order_by(Contract.end_date, Contract.contract_id)
+        )).mappings().all()
+
+        buckets = {
+            days: {"horizon_days": days, "until": today + timedelta(days=days), "count": 0, "contracts": []}
+            for days in self.horizons_days
+        }
+        for row in rows:
+            days_left = (row["end_date"] - today).days
+            horizon = next(days for days in self.horizons_days if days_left <= days)
+            buckets[horizon]["contracts"].append({**row, "days_left": days_left})
+            buckets[horizon]["count"] += 1
+
+        snapshot = {
+            "reference_date": today,
+            "generated_at": datetime.utcnow(),
+            "total": len(rows),
+            "buckets": list(buckets.values()),
+        }
+        return snapshot, buckets
+
+    def is_stale(self, today: Optional[date] = None) -> bool:
+        """Sin instantánea, invalidada por una escritura o calculada otro día"""
+        return (
+            self.snapshot is None
+            or self._stale.is_set()
+            or self.snapshot["reference_date"] != (today or date.today())
+        )
+
+    def mark_stale(self) -> None:
+        """Invalida la instantánea y despierta a la tarea de fondo"""
+        self._stale.set()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    async def _current(self, db: AsyncSession) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+        """
+        Instantánea vigente, recalculada si está obsoleta. Con una sesión que no
+        puede rellenar cachés (réplica, escrituras sin confirmar) se calcula para
+        esta lectura sin guardarla ni dar por vigente la instantánea.
+        """
+        if self.is_stale():
+            if not can_fill_cache(db):
+                return await self._compute(db, date.today())
+            async with self._lock:
+                if self.is_stale():
+                    await self.scan(db)
+        return self.snapshot, self._buckets
+
+    async def get_snapshot(self, db: AsyncSession) -> Dict[str, Any]:
+        """Instantánea actual; solo consulta la base de datos si está obsoleta"""
+        snapshot, _ = await self._current(db)
+        return snapshot
+
+    async def get_bucket(self, db: AsyncSession, horizon_days: int) -> Optional[Dict[str, Any]]:
+        """Bucket de un horizonte configurado (None si el horizonte no existe)"""
+        _, buckets = await self._current(db)
+        return buckets.get(horizon_days)
+
+    # ------------------------------------------------------------------
+    # Tarea de fondo
+    # ------------------------------------------------------------------
+
+    async def run_scan_loop(self, session_factory: Any, interval_seconds: float) -> None:
+        """
+        Tarea de fondo: cálculo inicial y recálculo cada `interval_seconds` (0 = sin
+        recálculo periódico) o en cuanto una escritura marca la instantánea como obsoleta.
+        """
+        while True:
+            try:
+                async with self._lock:
+                    async with session_factory() as db:
+                        snapshot = await self.scan(db)
+                logger.info(
+                    "📅 Vencimientos de contratos recalculados: "
+                    + ", ".join(f"{b['horizon_days']}d={b['count']}" for b in snapshot["buckets"])
+                )
+            except Exception as e:
+                logger.warning(f"Error calculando vencimientos de contratos: {e}")
+            try:
+                await asyncio.wait_for(self._stale.wait(), timeout=interval_seconds if interval_seconds > 0 else None)
+            except asyncio.TimeoutError:
+                pass
+
+    def clear(self) -> None:
+        """Descarta la instantánea (p. ej. entre tests)"""
+        self.snapshot = None
+        self._buckets = {}
+        self._stale = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+
+contract_expiry_scanner = ContractExpiryScanner(settings.CONTRACT_EXPIRY_HORIZONS_DAYS)
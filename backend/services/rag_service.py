@@ -24,13 +24,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger("ainstalia.rag_service")
 
+# Troceado de documentos (también lo usa scripts/benchmark_rag.py para comparar tamaños)
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+TEXT_SEPARATORS = ["\n\n", "\n", ".", "!", "?", ";", ":", " ", ""]
+
 class RAGService:
     """Servicio de Retrieval-Augmented Generation para consultas de conocimiento"""
     
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, vector_store_path: Optional[Path] = None):
         self.db_session = db_session
         self.documents_dir = Path(__file__).parent.parent.parent / "docs" / "knowledge_base"
-        self.vector_store_path = Path(__file__).parent.parent.parent / "vector_store"
+        # Ruta alternativa del índice (benchmarks) para no tocar el vector store real
+        self.vector_store_path = vector_store_path or Path(__file__).parent.parent.parent / "vector_store"
         
         # Inicializar componentes
         self.embeddings = self._initialize_embeddings()
@@ -55,7 +61,10 @@ class RAGService:
         
         return OpenAIEmbeddings(
             model="text-embedding-3-small",
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_BASE_URL,
+            # Con un servidor local se envía texto: tiktoken descarga su vocabulario de internet
+            check_embedding_ctx_length=settings.OPENAI_BASE_URL is None
         )
     
     def _initialize_llm(self) -> ChatOpenAI:
@@ -63,16 +72,17 @@ class RAGService:
         return ChatOpenAI(
             model="gpt-4-turbo-preview",
             temperature=0.1,
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_BASE_URL
         )
     
     def _initialize_text_splitter(self) -> RecursiveCharacterTextSplitter:
         """Inicializa el divisor de texto"""
         return RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
             length_function=len,
-            separators=["\n\n", "\n", ".", "!", "?", ";", ":", " ", ""]
+            separators=TEXT_SEPARATORS
         )
     
     def _load_or_create_vector_store(self) -> None:
@@ -230,7 +240,7 @@ class RAGService:
                 k=top_k
             )
             
-            logger.info(f"Encontrados {len(relevant_docs)} documentos relevantes para: '{query}'")
+            logger.info("Encontrados %d documentos relevantes para: '%s'", len(relevant_docs), query)
             return relevant_docs
             
         except Exception as e:
@@ -305,7 +315,7 @@ RESPUESTA:
             # Calcular confianza basada en relevancia (simplificado)
             confidence = min(len(context_docs) / 5.0, 1.0)  # Máximo 1.0 con 5+ docs
             
-            logger.info(f"Respuesta RAG generada para: '{question}' con confianza {confidence}")
+            logger.info("Respuesta RAG generada para: '%s' con confianza %s", question, confidence)
             
             return {
                 "success": True,
@@ -344,7 +354,7 @@ RESPUESTA:
             Dict con respuesta completa
         """
         try:
-            logger.info(f"Procesando consulta de conocimiento: '{question}'")
+            logger.info("Procesando consulta de conocimiento: '%s'", question)
             
             # Buscar documentos relevantes
             relevant_docs = self.search_knowledge(question, top_k=top_k)
@@ -0,0 +1,194 @@
+#backend/services/stock_alert_service.py
+"""
+Monitor de alertas de stock bajo.
+
+Mantiene en memoria el conjunto de alertas activas (líneas de stock cuya
+cantidad está en o por debajo de su umbral) y lo actualiza de forma
+incremental con los eventos de escritura que emite CRUDStock, sin volver a
+recorrer la tabla. Al arrancar, y opcionalmente cada cierto tiempo para
+recoger cambios hechos fuera de la API (scripts de carga, SQL manual), se
+reconcilia con una única consulta de las filas por debajo del mayor umbral.
+
+Los cambios en el conjunto se publican a los suscriptores (streaming SSE).
+El estado (alertas y umbrales personalizados) es por proceso: con varios
+workers cada uno mantiene el suyo y nada se guarda en la base de datos.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.stock_model import Stock
+
+logger = get_logger("ainstalia.stock_alerts")
+
+# Eventos publicados a los suscriptores
+ALERT_OPENED = "abierta"
+ALERT_UPDATED = "actualizada"
+ALERT_RESOLVED = "resuelta"
+
+# Niveles de alerta
+LEVEL_LOW = "bajo"
+LEVEL_OUT = "agotado"
+
+ThresholdKey = Tuple[str, Optional[int]]
+
+
+class StockAlertMonitor:
+    """Conjunto de alertas de stock bajo mantenido a partir de eventos de escritura"""
+
+    def __init__(self, default_threshold: int, subscriber_queue_size: int = 100):
+        self.default_threshold = default_threshold
+        self.subscriber_queue_size = subscriber_queue_size
+        # Umbrales por (sku, almacén) o por sku en todos los almacenes (almacén None)
+        self.thresholds: Dict[ThresholdKey, int] = {}
+        # Alertas activas por stock_id
+        self.alerts: Dict[int, Dict[str, Any]] = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.dropped_events = 0
+
+    # ------------------------------------------------------------------
+    # Umbrales
+    # ------------------------------------------------------------------
+
+    def threshold_for(self, sku: str, warehouse_id: int) -> int:
+        """Umbral aplicable: el del almacén concreto, el del SKU o el global"""
+        threshold = self.thresholds.get((sku, warehouse_id))
+        if threshold is None:
+            threshold = self.thresholds.get((sku, None), self.default_threshold)
+        return threshold
+
+    def max_threshold(self) -> int:
+        """Mayor umbral configurado (cota de la consulta de reconciliación)"""
+        return max([self.default_threshold, *self.thresholds.values()])
+
+    def set_threshold(self, sku: str, warehouse_id: Optional[int], threshold: Optional[int]) -> None:
+        """Fija (o elimina, con threshold=None) el umbral de un SKU o de un SKU en un almacén"""
+        if threshold is None:
+            self.thresholds.pop((sku, warehouse_id), None)
+        else:
+            self.thresholds[(sku, warehouse_id)] = threshold
+
+    def list_thresholds(self) -> List[Dict[str, Any]]:
+        """Umbrales personalizados, ordenados por SKU y almacén"""
+        return [
+            {"sku": sku, "warehouse_id": warehouse_id, "threshold": threshold}
+            for (sku, warehouse_id), threshold in sorted(self.thresholds.items(), key=lambda item: (item[0][0], item[0][1] or 0))
+        ]
+
+    # ------------------------------------------------------------------
+    # Detección incremental
+    # ------------------------------------------------------------------
+
+    def observe(
+        self, *, stock_id: int, sku: str, warehouse_id: int, quantity: Optional[int], removed: bool = False
+    ) -> None:
+        """
+        Procesa la escritura de una línea de stock: abre, actualiza o resuelve
+        su alerta si la cantidad cruza el umbral. Coste constante por evento.
+        """
+        current = self.alerts.get(stock_id)
+        threshold = self.threshold_for(sku, warehouse_id)
+        quantity = quantity or 0
+        if removed or quantity > threshold:
+            if current is not None:
+                del self.alerts[stock_id]
+                self._publish(ALERT_RESOLVED, {**current, "quantity": None if removed else quantity})
+            return
+        alert = {
+            "stock_id": stock_id,
+            "sku": sku,
+            "warehouse_id": warehouse_id,
+            "quantity": quantity,
+            "threshold": threshold,
+            "level": LEVEL_OUT if quantity <= 0 else LEVEL_LOW,
+            "since": current["since"] if current is not None else datetime.utcnow(),
+        }
+        if current is None:
+            self.alerts[stock_id] = alert
+            self._publish(ALERT_OPENED, alert)
+        elif current != alert:
+            self.alerts[stock_id] = alert
+            self._publish(ALERT_UPDATED, alert)
+
+    def get_alerts(self, *, sku: Optional[str] = None, warehouse_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Alertas activas, primero las de menor cantidad"""
+        alerts = [
+            alert for alert in self.alerts.values()
+            if (sku is None or alert["sku"] == sku) and (warehouse_id is None or alert["warehouse_id"] == warehouse_id)
+        ]
+        return sorted(alerts, key=lambda alert: (alert["quantity"], alert["sku"], alert["warehouse_id"]))
+
+    async def resync(self, db: AsyncSession, *, skus: Optional[Sequence[str]] = None) -> int:
+        """
+        Reconcilia el conjunto de alertas con la base de datos (todas las líneas
+        o solo las de los SKU indicados) con una única consulta de las filas por
+        debajo del mayor umbral. Devuelve el número de alertas activas.
+        """
+        query = select(Stock.stock_id, Stock.sku, Stock.warehouse_id, Stock.quantity).where(
+            Stock.quantity <= self.max_threshold()
+        )
+        if skus is not None:
+            query = query.where(Stock.sku.in_(list(skus)))
+        rows = (await db.execute(query)).all()
+        seen = set()
+        for stock_id, sku, warehouse_id, quantity in rows:
+            seen.add(stock_id)
+            self.observe(stock_id=stock_id, sku=sku, warehouse_id=warehouse_id, quantity=quantity)
+        # Las alertas que ya no aparecen han dejado de estar por debajo de cualquier umbral
+        for stock_id, alert in list(self.alerts.items()):
+            if stock_id not in seen and (skus is None or alert["sku"] in skus):
+                del self.alerts[stock_id]
+                self._publish(ALERT_RESOLVED, alert)
+        return len(self.alerts)
+
+    async def run_resync_loop(self, session_factory: Any, interval_seconds: float) -> None:
+        """Tarea de fondo: reconciliación inicial y, si interval_seconds > 0, periódica"""
+        while True:
+            try:
+                async with session_factory() as db:
+                    active = await self.resync(db)
+                logger.info(f"🔔 Alertas de stock reconciliadas: {active} activas")
+            except Exception as e:
+                logger.warning(f"Error reconciliando alertas de stock: {e}")
+            if interval_seconds <= 0:
+                return
+            await asyncio.sleep(interval_seconds)
+
+    # ------------------------------------------------------------------
+    # Suscripción
+    # ------------------------------------------------------------------
+
+    def _publish(self, event: str, alert: Dict[str, Any]) -> None:
+        """Envía el evento a todos los suscriptores; si la cola de uno está llena se descarta"""
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((event, alert))
+            except asyncio.QueueFull:
+                self.dropped_events += 1
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        """Cola con los eventos (evento, alerta) publicados mientras dure el bloque"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    def clear(self) -> None:
+        """Vacía alertas y umbrales personalizados (p. ej. entre tests)"""
+        self.alerts.clear()
+        self.thresholds.clear()
+
+
+stock_alert_monitor = StockAlertMonitor(
+    default_threshold=settings.STOCK_ALERT_DEFAULT_THRESHOLD,
+    subscriber_queue_size=settings.STOCK_ALERT_SUBSCRIBER_QUEUE_SIZE,
+)
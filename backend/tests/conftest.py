@@ -91,6 +91,57 @@ async def async_db_session(async_test_db: create_async_engine) -> AsyncGenerator
         yield session
         await session.rollback()
 
+@pytest.fixture(params=["sqlite", "postgresql"])
+async def concurrent_sessions(request, tmp_path):
+    """
+    Dos sesiones con conexiones propias sobre la misma base de datos, para tests
+    de escrituras concurrentes. SQLite serializa las transacciones; la variante
+    PostgreSQL (la que reproduce las carreras) solo corre con TEST_POSTGRES_URL
+    apuntando a una base de datos vacía.
+    """
+    if request.param == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'concurrent.db'}"
+    else:
+        url = os.environ.get("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL no configurada")
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with session_factory() as first, session_factory() as second:
+        yield first, second
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+@pytest.fixture(autouse=True)
+async def reset_entity_caches():
+    """Vacía la caché de entidades para que no se filtren registros entre tests"""
+    from backend.crud.cache import clear_caches
+
+    await clear_caches()
+    yield
+    await clear_caches()
+
+@pytest.fixture(autouse=True)
+def reset_stock_alerts():
+    """Vacía el conjunto de alertas de stock y los umbrales personalizados"""
+    from backend.services.stock_alert_service import stock_alert_monitor
+
+    stock_alert_monitor.clear()
+    yield
+    stock_alert_monitor.clear()
+
+@pytest.fixture(autouse=True)
+def reset_contract_expiry():
+    """Descarta la instantánea de vencimientos de contratos"""
+    from backend.services.contract_lifecycle_service import contract_expiry_scanner
+
+    contract_expiry_scanner.clear()
+    yield
+    contract_expiry_scanner.clear()
+
 @pytest.fixture
 async def client(async_db_session: AsyncSession):
     """Test client con base de datos de test asíncrona"""
@@ -222,6 +273,31 @@ def sample_knowledge_feedback_data():
         "status": "pendiente"
     }
 
+@pytest.fixture
+def stock_locations(client: TestClient, sample_product_data):
+    """
+    Un producto y tres almacenes creados por la API: cada (sku, almacén) admite
+    una sola fila de stock (uq_stock_sku_warehouse)
+    """
+    sku = client.post("/api/v1/products/", json=sample_product_data).json()["sku"]
+    return [
+        {"sku": sku, "warehouse_id": client.post("/api/v1/warehouses/", json={"name": f"Almacén Test {i}"}).json()["warehouse_id"]}
+        for i in range(3)
+    ]
+
+@pytest.fixture
+async def db_stock_locations(async_db_session: AsyncSession):
+    """Como stock_locations, pero creados con los CRUD sobre la sesión de test"""
+    from backend.crud import product_crud, warehouse_crud
+    from backend.schemas.product_schema import ProductCreate
+    from backend.schemas.warehouse_schema import WarehouseCreate
+
+    product = await product_crud.create(async_db_session, obj_in=ProductCreate(sku="STOCK-TEST", name="Producto Stock"))
+    warehouses = await warehouse_crud.create_many(async_db_session, objs_in=[
+        WarehouseCreate(name=f"Almacén Stock {i}") for i in range(3)
+    ])
+    return [{"sku": product.sku, "warehouse_id": warehouse.warehouse_id} for warehouse in warehouses]
+
 @pytest.fixture
 def multiple_clients_data():
     """Datos de ejemplo para múltiples clientes"""
@@ -192,8 +192,8 @@ class TestAIEndpoints:
         # Verificar que se llamó al servicio correctamente
         mock_rag_service_class.assert_called_once_with(mock_db_session)
         mock_rag_instance.query_knowledge.assert_called_once_with(
-            query="¿Cómo instalar un equipo?",
-            context=None
+            question="¿Cómo instalar un equipo?",
+            include_sources=True
         )
         
         # Cleanup
@@ -2,19 +2,34 @@
 """
 Tests para Operaciones CRUD - Fase 0
 """
+import asyncio
+import pickle
 import pytest
+from contextlib import contextmanager
 from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
+from sqlalchemy import event, select
 
 from backend.crud import (
     client_crud, product_crud, warehouse_crud, stock_crud,
-    chat_session_crud, chat_message_crud, knowledge_feedback_crud
+    chat_session_crud, chat_message_crud, knowledge_feedback_crud,
+    order_crud, order_item_crud, technician_crud, intervention_crud, contract_crud, unit_of_work
 )
+from backend.crud import cache as cache_module
+from backend.crud.base_crud import CRUDBase
+from backend.crud.cache import EntityCache, LocalSharedCache
+from backend.crud.stock_crud import InsufficientStockError
+from backend.db.session import READ_REPLICA_KEY
 from backend.schemas.client_schema import ClientCreate, ClientUpdate
 from backend.schemas.product_schema import ProductCreate, ProductUpdate
 from backend.schemas.warehouse_schema import WarehouseCreate, WarehouseUpdate
 from backend.schemas.stock_schema import StockCreate, StockUpdate
+from backend.schemas.order_schema import OrderCreate
+from backend.schemas.technician_schema import TechnicianCreate
+from backend.schemas.intervention_schema import InterventionCreate, InterventionUpdate
+from backend.models.technician_workload_model import TechnicianWorkload
+from backend.models.contract_model import Contract
 from backend.schemas.chat_session_schema import ChatSessionCreate
 from backend.schemas.chat_message_schema import ChatMessageCreate
 from backend.schemas.knowledge_feedback_schema import KnowledgeFeedbackCreate
@@ -23,6 +38,21 @@ from backend.core.logging import get_logger
 
 logger = get_logger("ainstalia.tests")
 
+@contextmanager
+def count_queries(db: AsyncSession):
+    """Cuenta las sentencias SQL que la sesión envía a la base de datos"""
+    statements = []
+    engine = db.bind.sync_engine
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
 class TestCRUD:
     """Tests para todas las operaciones CRUD"""
     
@@ -108,6 +138,73 @@ class TestCRUD:
         
         logger.info("Product CRUD operations successful")
         
+    async def test_product_read_through_cache(self, async_db_session: AsyncSession):
+        """Test caché read-through de productos: aciertos e invalidación al actualizar"""
+        logger.info("Testing product read-through cache")
+        
+        await product_crud.create(async_db_session, obj_in=ProductCreate(sku="CACHE001", name="Producto Caché"))
+        stats = product_crud.cache.stats
+        
+        await product_crud.get(async_db_session, sku="CACHE001")
+        assert stats.misses == 1
+        cached = await product_crud.get(async_db_session, sku="CACHE001")
+        assert stats.hits == 1
+        assert cached.name == "Producto Caché"
+        
+        await product_crud.update(async_db_session, db_obj=cached, obj_in=ProductUpdate(name="Producto Renombrado"))
+        assert stats.invalidations == 1
+        refreshed = await product_crud.get(async_db_session, sku="CACHE001")
+        assert refreshed.name == "Producto Renombrado"
+        assert stats.misses == 2
+        
+    async def test_cache_invalidated_after_commit(self, async_db_session: AsyncSession):
+        """Test que la caché se invalida tras el commit y no se rellena desde la réplica"""
+        logger.info("Testing cache invalidation timing")
+        
+        product = await product_crud.create(async_db_session, obj_in=ProductCreate(sku="CACHE002", name="Original"))
+        stale = {**product_crud._column_values(product)}
+        
+        async with unit_of_work(async_db_session):
+            await product_crud.update(async_db_session, db_obj=product, obj_in=ProductUpdate(name="Nuevo"))
+            # Un lector concurrente vuelve a cachear la fila anterior antes del commit
+            await product_crud.cache.set("CACHE002", stale)
+            assert product_crud.cache.stats.invalidations == 0
+        assert await product_crud.cache.get("CACHE002") is None
+        
+        # Las lecturas desde la réplica no rellenan la caché
+        async_db_session.info[READ_REPLICA_KEY] = True
+        try:
+            assert (await product_crud.get(async_db_session, sku="CACHE002")).name == "Nuevo"
+        finally:
+            del async_db_session.info[READ_REPLICA_KEY]
+        assert await product_crud.cache.get("CACHE002") is None
+        
+    async def test_shared_cache_serializes_with_orjson(self, monkeypatch):
+        """Test que el nivel compartido conserva Decimal/date/datetime/JSON y rechaza valores pickle"""
+        logger.info("Testing shared cache serialization")
+        
+        shared = LocalSharedCache()
+        monkeypatch.setattr(cache_module, "shared_backend", shared)
+        cache = EntityCache("serialization_test", ttl_seconds=60, max_size=10)
+        row = {
+            "id": 1, "name": "Fila", "price": Decimal("12.50"), "start_date": date(2024, 5, 1),
+            "updated_at": datetime(2024, 5, 1, 10, 30, 15, 250), "attributes": {"tags": ["a", "b"], "price": "1.0"},
+            "notes": None,
+        }
+        await cache.set(1, row)
+        cache.local.clear()
+        
+        restored = await cache.get(1)
+        assert restored == row
+        assert type(restored["price"]) is Decimal
+        assert type(restored["updated_at"]) is datetime and type(restored["start_date"]) is date
+        assert cache.stats.shared_hits == 1
+        
+        # Un valor ajeno (p. ej. pickle) nunca se deserializa: cuenta como fallo
+        await shared.set(cache._shared_key(2), pickle.dumps(row), 60)
+        assert await cache.get(2) is None
+        assert cache.stats.misses == 1
+        
     async def test_warehouse_crud_operations(self, async_db_session: AsyncSession, sample_warehouse_data):
         """Test operaciones CRUD completas para Warehouse"""
         logger.info("Testing Warehouse CRUD operations")
@@ -187,6 +284,198 @@ class TestCRUD:
         assert len(low_stock_items) > 0
         assert any(item.stock_id == updated_stock.stock_id for item in low_stock_items)
         
+    async def test_stock_bulk_crud_operations(self, async_db_session: AsyncSession, db_stock_locations):
+        """Test operaciones masivas create_many/update_many/remove_many"""
+        logger.info("Testing Stock bulk CRUD operations")
+        
+        created = await stock_crud.create_many(async_db_session, objs_in=[
+            StockCreate(**location, quantity=q) for location, q in zip(db_stock_locations, (1, 2, 3))
+        ])
+        assert len(created) == 3
+        assert all(stock.stock_id is not None for stock in created)
+        
+        updated = await stock_crud.update_many(async_db_session, objs_in=[
+            {"stock_id": stock.stock_id, "quantity": 100} for stock in created
+        ])
+        assert sorted(stock.quantity for stock in updated) == [100, 100, 100]
+        # updated_at lo fija el ORM (onupdate), también en las sentencias UPDATE masivas
+        assert all(stock.updated_at is not None for stock in updated)
+        
+        removed = await stock_crud.remove_many(async_db_session, ids=[stock.stock_id for stock in created])
+        assert len(removed) == 3
+        assert await stock_crud.get_by_sku(async_db_session, sku=db_stock_locations[0]["sku"]) == []
+        
+    async def test_stock_atomic_movements(self, async_db_session: AsyncSession, db_stock_locations):
+        """Test descuento y reservas atómicas de stock con libro de movimientos"""
+        logger.info("Testing Stock atomic movements")
+        
+        line = db_stock_locations[0]
+        # El id se guarda antes: el rollback de una unidad de trabajo fallida expira los objetos de la sesión
+        stock_id = (await stock_crud.create(async_db_session, obj_in=StockCreate(**line, quantity=10))).stock_id
+        
+        rows = await stock_crud.decrement_many(async_db_session, lines=[{**line, "quantity": 4}], reference="PED-1")
+        assert rows[0]["quantity"] == 6
+        
+        # Sin unidades suficientes no se descuenta nada
+        with pytest.raises(InsufficientStockError):
+            await stock_crud.decrement_many(async_db_session, lines=[{**line, "quantity": 7}], reference="PED-2")
+        assert (await stock_crud.get(async_db_session, stock_id=stock_id)).quantity == 6
+        
+        reservations = await stock_crud.reserve(async_db_session, lines=[{**line, "quantity": 5}], reference="PED-3")
+        assert reservations[0].status == "reservada"
+        assert (await stock_crud.get(async_db_session, stock_id=stock_id)).quantity == 1
+        
+        released = await stock_crud.release_reservation(async_db_session, reference="PED-3")
+        assert [r.status for r in released] == ["liberada"]
+        assert await stock_crud.release_reservation(async_db_session, reference="PED-3") == []
+        assert (await stock_crud.get(async_db_session, stock_id=stock_id)).quantity == 6
+        
+        movements = await stock_crud.get_movements(async_db_session, sku=line["sku"])
+        assert [m.movement_type for m in movements] == ["liberacion", "reserva", "salida"]
+        
+    async def test_stock_availability_cache(self, async_db_session: AsyncSession, db_stock_locations):
+        """Test resumen de disponibilidad: se invalida tras el commit y la réplica no lo rellena"""
+        logger.info("Testing Stock availability cache")
+        
+        line = db_stock_locations[0]
+        sku = line["sku"]
+        await stock_crud.create(async_db_session, obj_in=StockCreate(**line, quantity=10))
+        
+        async_db_session.info[READ_REPLICA_KEY] = True
+        try:
+            assert (await stock_crud.get_availability(async_db_session, skus=[sku]))[0]["available"] == 10
+        finally:
+            del async_db_session.info[READ_REPLICA_KEY]
+        assert await stock_crud.availability_cache.get(sku) is None
+        
+        await stock_crud.get_availability(async_db_session, skus=[sku])
+        assert (await stock_crud.availability_cache.get(sku))["available"] == 10
+        
+        async with unit_of_work(async_db_session):
+            await stock_crud.decrement_many(async_db_session, lines=[{**line, "quantity": 4}], commit=False)
+            # Hasta el commit la entrada sigue siendo la confirmada
+            assert (await stock_crud.availability_cache.get(sku))["available"] == 10
+        assert await stock_crud.availability_cache.get(sku) is None
+        assert (await stock_crud.get_availability(async_db_session, skus=[sku]))[0]["available"] == 6
+        
+    async def test_unit_of_work_rollback(self, async_db_session: AsyncSession):
+        """Test que una unidad de trabajo es atómica: si falla, no se guarda nada"""
+        logger.info("Testing CRUD unit of work")
+        
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(async_db_session):
+                await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente UoW", email="uow@test.com"))
+                await warehouse_crud.create(async_db_session, obj_in=WarehouseCreate(name="Almacén UoW"))
+                raise RuntimeError("Fallo simulado")
+        
+        assert await client_crud.get_by_email(async_db_session, email="uow@test.com") is None
+        assert await warehouse_crud.get_by_name(async_db_session, name="Almacén UoW") is None
+        
+        async with unit_of_work(async_db_session):
+            created = await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente UoW", email="uow@test.com"))
+        assert (await client_crud.get(async_db_session, client_id=created.client_id)) is not None
+        
+    async def test_technician_workload_follows_write_transaction(self, async_db_session: AsyncSession):
+        """Test que el índice de carga se confirma o se deshace junto con la intervención"""
+        logger.info("Testing technician workload transaction")
+        
+        async def workload():
+            result = await async_db_session.execute(select(TechnicianWorkload.day, TechnicianWorkload.interventions))
+            return sorted(result.all())
+        
+        client_id = (await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente Carga", email="carga@test.com"))).client_id
+        technician_id = (await technician_crud.create(async_db_session, obj_in=TechnicianCreate(name="Técnico Carga", email="carga-tec@test.com"))).technician_id
+        intervention_in = InterventionCreate(
+            technician_id=technician_id, client_id=client_id, scheduled_date=date(2024, 6, 15), type="mantenimiento"
+        )
+        
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(async_db_session):
+                await intervention_crud.create(async_db_session, obj_in=intervention_in)
+                raise RuntimeError("Fallo simulado")
+        assert await workload() == []
+        
+        intervention_id = (await intervention_crud.create(async_db_session, obj_in=intervention_in)).intervention_id
+        assert await workload() == [(date(2024, 6, 15), 1)]
+        
+        intervention = await intervention_crud.get(async_db_session, intervention_id=intervention_id)
+        await intervention_crud.update(async_db_session, db_obj=intervention, obj_in=InterventionUpdate(scheduled_date=date(2024, 6, 16)))
+        assert await workload() == [(date(2024, 6, 16), 1)]
+        
+        await intervention_crud.update_many(async_db_session, objs_in=[{"intervention_id": intervention_id, "scheduled_date": date(2024, 6, 17)}])
+        assert await workload() == [(date(2024, 6, 17), 1)]
+        
+    async def test_technician_workload_concurrent_writes(self, concurrent_sessions):
+        """Test que dos transacciones que crean intervenciones del mismo (técnico, día) suman ambas"""
+        logger.info("Testing concurrent technician workload writes")
+        first, second = concurrent_sessions
+        
+        client_id = (await client_crud.create(first, obj_in=ClientCreate(name="Cliente Concurrente", email="concurrente@test.com"))).client_id
+        technician_id = (await technician_crud.create(first, obj_in=TechnicianCreate(name="Técnico Concurrente", email="concurrente-tec@test.com"))).technician_id
+        intervention_in = InterventionCreate(
+            technician_id=technician_id, client_id=client_id, scheduled_date=date(2024, 6, 15), type="mantenimiento"
+        )
+        
+        async def create_in_second():
+            async with unit_of_work(second):
+                await intervention_crud.create(second, obj_in=intervention_in)
+        
+        # La segunda escritura llega mientras la primera tiene la clave sin confirmar
+        async with unit_of_work(first):
+            await intervention_crud.create(first, obj_in=intervention_in)
+            pending = asyncio.create_task(create_in_second())
+            await asyncio.sleep(0.2)
+        await pending
+        
+        result = await first.execute(select(TechnicianWorkload.interventions).where(
+            TechnicianWorkload.technician_id == technician_id, TechnicianWorkload.day == date(2024, 6, 15)
+        ))
+        assert result.scalar_one() == 2
+        
+        # Al borrar ambas, el (técnico, día) desaparece del índice
+        ids = [intervention.intervention_id for intervention in await intervention_crud.get_by_technician(first, technician_id=technician_id)]
+        await intervention_crud.remove_many(first, ids=ids)
+        result = await first.execute(select(TechnicianWorkload).where(TechnicianWorkload.technician_id == technician_id))
+        assert result.scalars().all() == []
+        
+    async def test_order_full_loading(self, async_db_session: AsyncSession):
+        """Test carga de pedidos con elementos y productos en un número fijo de consultas"""
+        logger.info("Testing Order full loading")
+        
+        client = await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente Pedidos", email="pedidos@test.com"))
+        other = await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente Un Pedido", email="unpedido@test.com"))
+        await product_crud.create_many(async_db_session, objs_in=[
+            ProductCreate(sku="FULL-1", name="Producto 1", price=Decimal("10.00")),
+            ProductCreate(sku="FULL-2", name="Producto 2", price=Decimal("20.00")),
+        ])
+        orders_by_client = {client.client_id: ["ORD-FULL-1", "ORD-FULL-2", "ORD-FULL-3"], other.client_id: ["ORD-FULL-4"]}
+        for client_id, order_ids in orders_by_client.items():
+            for order_id in order_ids:
+                await order_crud.create(async_db_session, obj_in=OrderCreate(order_id=order_id, client_id=client_id))
+                await order_item_crud.create_many(async_db_session, objs_in=[
+                    {"order_id": order_id, "product_sku": "FULL-1", "quantity": 1},
+                    {"order_id": order_id, "product_sku": "FULL-2", "quantity": 2},
+                ])
+        
+        with count_queries(async_db_session) as statements:
+            order, details = await order_crud.get_full(async_db_session, order_id="ORD-FULL-1")
+        assert len(statements) == 3
+        assert order.order_id == "ORD-FULL-1"
+        assert [(item.product_sku, product.name) for item, product in details] == [
+            ("FULL-1", "Producto 1"), ("FULL-2", "Producto 2")
+        ]
+        assert await order_crud.get_full(async_db_session, order_id="NO-EXISTE") is None
+        
+        # El número de consultas no depende del número de pedidos (sin N+1)
+        with count_queries(async_db_session) as single:
+            orders = await order_crud.get_full_by_client(async_db_session, client_id=other.client_id)
+        assert [o.order_id for o, _ in orders] == ["ORD-FULL-4"]
+        with count_queries(async_db_session) as many:
+            orders = await order_crud.get_full_by_client(async_db_session, client_id=client.client_id)
+        assert [o.order_id for o, _ in orders] == ["ORD-FULL-1", "ORD-FULL-2", "ORD-FULL-3"]
+        assert all(len(items) == 2 for _, items in orders)
+        assert len(single) == len(many) == 3
+        
     async def test_chat_crud_operations(self, async_db_session: AsyncSession):
         """Test operaciones CRUD para Chat Session y Message"""
         logger.info("Testing Chat CRUD operations")
@@ -248,7 +537,12 @@ class TestCRUD:
         # SEARCH by question
         search_results = await knowledge_feedback_crud.search_by_question(async_db_session, question="configurar")
         assert len(search_results) > 0
-        
+
+        # FULL-TEXT SEARCH (FTS5 en SQLite) con ranking
+        ranked_results = await knowledge_feedback_crud.search(async_db_session, text="configurar producto")
+        assert [fb.feedback_id for fb, _ in ranked_results] == [created_feedback.feedback_id]
+        assert await knowledge_feedback_crud.search(async_db_session, text="inexistente") == []
+
     @pytest.mark.asyncio
     async def test_crud_pagination(self, async_db_session: AsyncSession):
         """Test paginación genérica de CRUD"""
@@ -281,6 +575,27 @@ class TestCRUD:
 
         logger.info("CRUD pagination test successful")
     
+    async def test_cursor_pagination_with_null_sort_values(self, async_db_session: AsyncSession):
+        """Test que la paginación por cursor no pierde filas con la columna de orden a NULL"""
+        logger.info("Testing cursor pagination with NULL sort values")
+        
+        client = await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente Cursor", email="cursor@test.com"))
+        end_dates = [date(2025, 1, 1), None, date(2024, 1, 1), None, date(2025, 1, 1)]
+        created = await contract_crud.create_many(async_db_session, objs_in=[
+            {"client_id": client.client_id, "end_date": end_date} for end_date in end_dates
+        ])
+        # La fecha de fin admite NULL: esas filas van al final y el cursor las recorre
+        by_end_date = CRUDBase(Contract, sort_column="end_date")
+        
+        seen, cursor = [], None
+        while True:
+            page, cursor = await by_end_date.get_page(async_db_session, cursor=cursor, limit=2)
+            seen += [contract.contract_id for contract in page]
+            if cursor is None:
+                break
+        ids = [contract.contract_id for contract in created]
+        assert seen == [ids[2], ids[0], ids[4], ids[1], ids[3]]
+    
     @pytest.mark.asyncio
     async def test_crud_error_handling(self, async_db_session: AsyncSession):
         """Test manejo de errores en operaciones CRUD"""
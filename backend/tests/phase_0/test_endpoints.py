@@ -2,12 +2,14 @@
 """
 Tests para endpoints de la API FastAPI
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import Depends
 from unittest.mock import patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
+from datetime import date, timedelta
 
 from backend.main import app
 from backend.db.session import get_db
@@ -20,7 +22,7 @@ from backend.crud import (
 from backend.schemas.client_schema import ClientCreate
 from backend.schemas.product_schema import ProductCreate
 from backend.schemas.warehouse_schema import WarehouseCreate
-from backend.schemas.stock_schema import StockCreate
+from backend.schemas.stock_schema import StockCreate, StockResponse
 from backend.schemas.technician_schema import TechnicianCreate
 from backend.schemas.equipment_schema import InstalledEquipmentCreate
 from backend.schemas.intervention_schema import InterventionCreate
@@ -70,6 +72,26 @@ def test_get_clients(client: TestClient, sample_client_data: dict):
     assert len(data) > 0
     assert data[0]["name"] == sample_client_data["name"]
 
+def test_get_clients_cursor_pagination(client: TestClient, sample_client_data: dict):
+    """Test paginación por cursor de clientes siguiendo la cabecera X-Next-Cursor"""
+    for i in range(3):
+        client.post("/api/v1/clients/", json={**sample_client_data, "email": f"cursor{i}@test.com"})
+
+    first = client.get("/api/v1/clients/", params={"limit": 2})
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    next_cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/v1/clients/", params={"limit": 2, "cursor": next_cursor})
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    first_ids = {c["client_id"] for c in first.json()}
+    assert second.json()[0]["client_id"] not in first_ids
+
+    invalid = client.get("/api/v1/clients/", params={"cursor": "no-es-un-cursor"})
+    assert invalid.status_code == 400
+
 def test_get_client_by_id(client: TestClient, sample_client_data: dict):
     """Test obtener cliente por ID"""
     # Crear cliente
@@ -146,6 +168,56 @@ def test_get_products(client: TestClient, sample_product_data: dict):
     assert len(data) > 0
     assert data[0]["sku"] == sample_product_data["sku"]
 
+def test_get_products_conditional_etag(client: TestClient, sample_product_data: dict):
+    """Test GET condicional: 304 con If-None-Match vigente y ETag nuevo tras una escritura"""
+    client.post("/api/v1/products/", json=sample_product_data)
+
+    first = client.get("/api/v1/products/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/v1/products/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.post("/api/v1/products/", json={**sample_product_data, "sku": "TEST-SKU-ETAG"})
+    changed = client.get("/api/v1/products/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+async def test_table_fingerprint_counts_writes_outside_orm(async_db_session: AsyncSession):
+    """Test que una escritura fuera del ORM (scripts, SQL manual) cambia la huella de la tabla"""
+    from sqlalchemy import text
+    from backend.api.v1.etag import table_fingerprint
+    from backend.models.warehouse_model import Warehouse
+
+    await warehouse_crud.create(async_db_session, obj_in=WarehouseCreate(name="Almacén Huella"))
+    before = await table_fingerprint(async_db_session, Warehouse)
+    await async_db_session.execute(text("UPDATE warehouses SET name = 'Renombrado'"))
+    await async_db_session.commit()
+    assert await table_fingerprint(async_db_session, Warehouse) != before
+
+async def test_table_fingerprint_follows_commit_order(concurrent_sessions):
+    """Test que una transacción larga que confirma después de otra más reciente cambia la huella"""
+    from backend.api.v1.etag import table_fingerprint
+    from backend.crud.base_crud import unit_of_work
+    from backend.models.product_model import Product
+
+    first, second = concurrent_sessions
+    if first.bind.dialect.name == "sqlite":
+        pytest.skip("SQLite serializa las transacciones de escritura")
+    await product_crud.create_many(first, objs_in=[
+        ProductCreate(sku="VER-1", name="Producto 1"), ProductCreate(sku="VER-2", name="Producto 2")
+    ])
+
+    async with unit_of_work(first):
+        # La transacción larga escribe primero y confirma la última
+        await product_crud.update(first, db_obj=await product_crud.get(first, sku="VER-1"), obj_in={"name": "Largo"})
+        async with unit_of_work(second):
+            await product_crud.update(second, db_obj=await product_crud.get(second, sku="VER-2"), obj_in={"name": "Corto"})
+        seen = await table_fingerprint(second, Product)
+    assert await table_fingerprint(second, Product) != seen
+
 def test_get_product_by_sku(client: TestClient, sample_product_data: dict):
     """Test obtener producto por SKU"""
     client.post("/api/v1/products/", json=sample_product_data)
@@ -216,6 +288,113 @@ def test_get_stock_with_filters(client: TestClient, sample_stock_data: dict, sam
     assert len(data) > 0
     assert data[0]["quantity"] == sample_stock_data["quantity"]
 
+def test_stock_bulk_operations(client: TestClient, stock_locations: list):
+    """Test alta, actualización y borrado masivo de stock"""
+    bulk_data = [{**location, "quantity": q} for location, q in zip(stock_locations, (5, 10, 15))]
+    response = client.post("/api/v1/stock/bulk", json=bulk_data)
+    assert response.status_code == 200
+    created = response.json()
+    assert len(created) == 3
+    assert all("stock_id" in item for item in created)
+    
+    updates = [{"stock_id": item["stock_id"], "quantity": 0} for item in created[:2]]
+    response = client.put("/api/v1/stock/bulk", json=updates)
+    assert response.status_code == 200
+    assert all(item["quantity"] == 0 for item in response.json())
+    
+    # Si algún ID no existe no se actualiza ninguno
+    response = client.put("/api/v1/stock/bulk", json=[{"stock_id": created[2]["stock_id"], "quantity": 0}, {"stock_id": 999999, "quantity": 0}])
+    assert response.status_code == 404
+    assert "999999" in response.json()["detail"]
+    assert client.get(f"/api/v1/stock/{created[2]['stock_id']}").json()["quantity"] == 15
+    
+    response = client.request("DELETE", "/api/v1/stock/bulk", json=[item["stock_id"] for item in created])
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+def test_get_stock_rows_fast_path(client: TestClient, stock_locations: list):
+    """Test listado rápido de stock: mismos campos que StockResponse, cursor y ETag"""
+    sku = stock_locations[0]["sku"]
+    client.post("/api/v1/stock/bulk", json=[{**location, "quantity": q} for location, q in zip(stock_locations, (1, 2, 3))])
+
+    response = client.get(f"/api/v1/stock/?product_id={sku}&limit=2")
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    first_page = response.json()
+    assert [item["quantity"] for item in first_page] == [1, 2]
+    assert set(first_page[0]) == set(StockResponse.model_fields)
+
+    response = client.get(f"/api/v1/stock/?limit=2&cursor={response.headers['X-Next-Cursor']}")
+    assert [item["quantity"] for item in response.json()] == [3]
+    assert "X-Next-Cursor" not in response.headers
+
+def test_stock_reservation_endpoints(client: TestClient, stock_locations: list):
+    """Test reserva, confirmación y descuento de stock; 409 si no hay unidades suficientes"""
+    line = stock_locations[0]
+    client.post("/api/v1/stock/", json={**line, "quantity": 5})
+
+    response = client.post("/api/v1/stock/reservations", json={"reference": "PED-1", "lines": [{**line, "quantity": 3}]})
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "reservada"
+
+    response = client.post("/api/v1/stock/decrement", json={"reference": "PED-2", "lines": [{**line, "quantity": 3}]})
+    assert response.status_code == 409
+
+    assert client.post("/api/v1/stock/reservations/PED-1/commit").status_code == 200
+    assert client.post("/api/v1/stock/reservations/PED-1/release").status_code == 404
+
+    response = client.get("/api/v1/stock/movements", params={"reference": "PED-1"})
+    assert [m["movement_type"] for m in response.json()] == ["confirmacion", "reserva"]
+
+def test_stock_availability(client: TestClient, stock_locations: list):
+    """Test disponibilidad agregada de varios SKU (total, por almacén y reservada)"""
+    sku = stock_locations[0]["sku"]
+    client.post("/api/v1/stock/bulk", json=[{**location, "quantity": 5} for location in stock_locations[:2]])
+    client.post("/api/v1/stock/reservations", json={
+        "reference": "PED-DISP", "lines": [{**stock_locations[0], "quantity": 2}]
+    })
+
+    response = client.post("/api/v1/stock/availability", json={"skus": [sku, "SKU-INEXISTENTE"]})
+    assert response.status_code == 200
+    found, missing = response.json()
+    assert (found["available"], found["reserved"], found["on_hand"]) == (8, 2, 10)
+    assert len(found["warehouses"]) == 2
+    assert missing == {"sku": "SKU-INEXISTENTE", "available": 0, "reserved": 0, "on_hand": 0, "warehouses": []}
+
+def test_stock_low_alerts(client: TestClient, stock_locations: list):
+    """Test alertas de stock bajo detectadas en las escrituras y umbrales por SKU"""
+    line = stock_locations[0]
+    sku, warehouse_id = line["sku"], line["warehouse_id"]
+    stock_id = client.post("/api/v1/stock/", json={"sku": sku, "warehouse_id": warehouse_id, "quantity": 8}).json()["stock_id"]
+    assert client.get("/api/v1/stock/alerts").json() == []
+
+    client.post("/api/v1/stock/decrement", json={"reference": "PED-A", "lines": [{"sku": sku, "warehouse_id": warehouse_id, "quantity": 8}]})
+    alerts = client.get("/api/v1/stock/alerts").json()
+    assert [(a["stock_id"], a["level"]) for a in alerts] == [(stock_id, "agotado")]
+
+    client.put(f"/api/v1/stock/{stock_id}", json={"quantity": 12})
+    assert client.get("/api/v1/stock/alerts").json() == []
+
+    response = client.put("/api/v1/stock/alerts/thresholds", json=[{"sku": sku, "threshold": 20}])
+    assert response.json() == [{"sku": sku, "warehouse_id": None, "threshold": 20}]
+    alerts = client.get("/api/v1/stock/alerts", params={"sku": sku}).json()
+    assert [(a["quantity"], a["threshold"], a["level"]) for a in alerts] == [(12, 20, "bajo")]
+
+async def test_stock_alert_stream_subscribes_before_snapshot():
+    """Test que el streaming de alertas se suscribe antes de enviar la instantánea"""
+    from backend.api.v1.endpoints.stock import _alert_events
+    from backend.services.stock_alert_service import stock_alert_monitor
+
+    class DisconnectedRequest:
+        async def is_disconnected(self):
+            return True
+
+    events = _alert_events(DisconnectedRequest())
+    assert (await events.__anext__()).startswith(b"event: snapshot")
+    assert len(stock_alert_monitor._subscribers) == 1
+    await events.aclose()
+    assert len(stock_alert_monitor._subscribers) == 0
+
 # ==========================================
 # Tests de Técnicos
 # ==========================================
@@ -329,6 +508,45 @@ def test_get_interventions_by_technician(client: TestClient, sample_intervention
     assert isinstance(data, list)
     assert len(data) > 0
     assert data[0]["type"] == sample_intervention_data["type"]
+    
+    # technician_id tiene prioridad: status no se combina con él
+    response = client.get(f"/api/v1/interventions/?technician_id={sample_intervention_data['technician_id']}&status=pendiente")
+    assert response.status_code == 200
+    assert len(response.json()) == len(data)
+
+def test_technician_workload_queries(client: TestClient, sample_intervention_data: dict, sample_client_data: dict, sample_technician_data: dict):
+    """Test técnicos libres por zona y próximas intervenciones por técnico"""
+    client_id = client.post("/api/v1/clients/", json=sample_client_data).json()["client_id"]
+    busy_id = client.post("/api/v1/technicians/", json=sample_technician_data).json()["technician_id"]
+    free_id = client.post(
+        "/api/v1/technicians/", json={**sample_technician_data, "name": "Técnico Libre", "email": "libre@test.com"}
+    ).json()["technician_id"]
+
+    product_sku = client.post("/api/v1/products/", json={"sku": "WORKLOAD-PROD", "name": "Producto", "price": 1.0}).json()["sku"]
+    equipment_id = client.post("/api/v1/equipment/", json={
+        "client_id": client_id, "sku": product_sku, "install_date": "2023-01-01", "status": "activo", "config_json": {}
+    }).json()["equipment_id"]
+
+    for scheduled_date in ("2024-06-15", "2024-06-16", "2024-06-17"):
+        response = client.post("/api/v1/interventions/", json={
+            **sample_intervention_data, "client_id": client_id, "equipment_id": equipment_id,
+            "technician_id": busy_id, "scheduled_date": scheduled_date,
+        })
+        assert response.status_code == 200
+
+    zone = sample_technician_data["zone"]
+    response = client.get(f"/api/v1/technicians/available?zone={zone}&day=2024-06-15")
+    assert response.status_code == 200
+    assert [(t["technician_id"], t["interventions"]) for t in response.json()] == [(free_id, 0)]
+
+    response = client.get(f"/api/v1/technicians/available?zone={zone}&day=2024-06-15&capacity=2")
+    assert {t["technician_id"]: t["interventions"] for t in response.json()} == {busy_id: 1, free_id: 0}
+
+    response = client.get(f"/api/v1/interventions/upcoming?per_technician=2&from_date=2024-06-16&zone={zone}")
+    assert response.status_code == 200
+    schedules = response.json()
+    assert [s["technician_id"] for s in schedules] == [busy_id]
+    assert [i["scheduled_date"] for i in schedules[0]["interventions"]] == ["2024-06-16", "2024-06-17"]
 
 # ==========================================
 # Tests de Contratos
@@ -361,6 +579,48 @@ def test_get_contracts_by_client(client: TestClient, sample_contract_data: dict,
     assert len(data) > 0
     assert data[0]["type"] == sample_contract_data["type"]
 
+def test_expiring_contracts_buckets(client: TestClient, sample_contract_data: dict, sample_client_data: dict):
+    """Test buckets de vencimientos de contratos (30/60/90 días)"""
+    sample_contract_data["client_id"] = client.post("/api/v1/clients/", json=sample_client_data).json()["client_id"]
+    today = date.today()
+    for days in (10, 45, 80, 200, -5):
+        client.post("/api/v1/contracts/", json={**sample_contract_data, "end_date": str(today + timedelta(days=days))})
+
+    response = client.get("/api/v1/contracts/expiring")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert [(b["horizon_days"], b["count"]) for b in data["buckets"]] == [(30, 1), (60, 1), (90, 1)]
+    assert data["buckets"][0]["contracts"][0]["days_left"] == 10
+
+    # Una escritura invalida la instantánea
+    client.post("/api/v1/contracts/", json={**sample_contract_data, "end_date": str(today + timedelta(days=20))})
+    response = client.get("/api/v1/contracts/expiring/30")
+    assert response.status_code == 200
+    assert [c["days_left"] for c in response.json()["contracts"]] == [10, 20]
+
+    assert client.get("/api/v1/contracts/expiring/15").status_code == 404
+
+async def test_expiring_contracts_not_rebuilt_from_replica(async_db_session: AsyncSession):
+    """Test que una lectura desde la réplica no da por vigente la instantánea de vencimientos"""
+    from backend.db.session import READ_REPLICA_KEY
+    from backend.services.contract_lifecycle_service import contract_expiry_scanner
+
+    client_id = (await client_crud.create(async_db_session, obj_in=ClientCreate(name="Cliente Réplica", email="replica@test.com"))).client_id
+    await contract_crud.create(async_db_session, obj_in=ContractCreate(
+        client_id=client_id, start_date=date.today(), end_date=date.today() + timedelta(days=10)
+    ))
+
+    async_db_session.info[READ_REPLICA_KEY] = True
+    try:
+        assert (await contract_expiry_scanner.get_snapshot(async_db_session))["total"] == 1
+    finally:
+        del async_db_session.info[READ_REPLICA_KEY]
+    assert contract_expiry_scanner.is_stale()
+
+    assert (await contract_expiry_scanner.get_bucket(async_db_session, 30))["count"] == 1
+    assert not contract_expiry_scanner.is_stale()
+
 # ==========================================
 # Tests de Chat
 # ==========================================
@@ -413,6 +673,31 @@ async def test_get_chat_messages_by_session(client: TestClient, sample_chat_sess
     assert len(data) > 0
     assert data[0]["message_text"] == sample_chat_message_data["message_text"]
 
+async def test_export_chat_messages(client: TestClient, sample_chat_session_data: dict, sample_chat_message_data: dict, async_db_session: AsyncSession):
+    """Test exportar mensajes de chat en NDJSON y CSV"""
+    client_data = ClientCreate(name="Test Client for Export", email="export@example.com", phone="123456789", address="Export Address")
+    created_client = await client_crud.create(async_db_session, obj_in=client_data)
+
+    sample_chat_session_data["client_id"] = created_client.client_id
+    await chat_session_crud.create(db=async_db_session, obj_in=ChatSessionCreate(**sample_chat_session_data))
+    await chat_message_crud.create(db=async_db_session, obj_in=ChatMessageCreate(**sample_chat_message_data))
+
+    response = client.get("/api/v1/chat/messages/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [line for line in response.text.splitlines() if line]
+    assert len(lines) == 1
+    assert json.loads(lines[0])["message_text"] == sample_chat_message_data["message_text"]
+
+    response = client.get("/api/v1/chat/messages/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = response.text.splitlines()
+    assert rows[0].startswith("chat_id,")
+    assert len(rows) == 2
+
+    response = client.get("/api/v1/chat/messages/export", params={"format": "xml"})
+    assert response.status_code == 422
+
 # ==========================================
 # Tests de Knowledge Feedback
 # ==========================================
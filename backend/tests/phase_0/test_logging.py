@@ -0,0 +1,76 @@
+#backend/tests/phase_0/test_logging.py
+"""
+Tests para el pipeline de logging asíncrono (cola acotada + QueueListener)
+"""
+import logging
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core.logging import BoundedQueueHandler, configure_logging, get_logging_stats, setup_logging
+
+
+def _record(level: int, msg: str = "mensaje %s", args: tuple = ("x",)) -> logging.LogRecord:
+    return logging.LogRecord("ainstalia.test_logging", level, __file__, 1, msg, args, None)
+
+
+class TestBoundedQueueHandler:
+    """Tests de la política de cola llena"""
+
+    def test_records_are_enqueued_unformatted(self):
+        """El formateo se aplaza al listener: el registro conserva msg y args"""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=10))
+        handler.handle(_record(logging.INFO))
+        record = handler.queue.get_nowait()
+        assert record.msg == "mensaje %s"
+        assert record.args == ("x",)
+
+    def test_drop_policy_discards_and_reports(self):
+        """Con la cola llena se descartan registros y se avisa al volver a haber sitio"""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), policy="drop", block_timeout=0)
+        for _ in range(5):
+            handler.handle(_record(logging.INFO))
+        assert handler.dropped == 3
+
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(_record(logging.INFO))
+        warning = handler.queue.queue[-1]
+        assert warning.levelno == logging.WARNING
+        assert warning.getMessage() == "Cola de logging llena: 3 registros descartados"
+
+    def test_errors_wait_for_room_under_drop_policy(self):
+        """Los errores esperan hasta block_timeout antes de descartarse"""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop", block_timeout=0.01)
+        handler.handle(_record(logging.INFO))
+        handler.handle(_record(logging.ERROR))
+        assert handler.dropped == 1
+
+
+class TestLoggingConfiguration:
+    """Tests de la configuración por settings"""
+
+    @pytest.fixture(autouse=True)
+    def restore_logging(self):
+        yield
+        setup_logging()
+        logging.getLogger("ainstalia.db").setLevel(logging.NOTSET)
+
+    def test_configure_logging_applies_levels_and_queue(self):
+        """Nivel global, niveles por módulo y tamaño de cola salen de settings"""
+        configure_logging(SimpleNamespace(
+            LOG_LEVEL="warning",
+            LOG_MODULE_LEVELS={"ainstalia.db": "ERROR"},
+            LOG_QUEUE_SIZE=50,
+            LOG_QUEUE_FULL_POLICY="drop",
+            LOG_QUEUE_BLOCK_TIMEOUT_SECONDS=0.05,
+        ))
+        assert logging.getLogger("ainstalia").level == logging.WARNING
+        assert not logging.getLogger("ainstalia.rag_service").isEnabledFor(logging.INFO)
+        assert logging.getLogger("ainstalia.db").level == logging.ERROR
+        assert get_logging_stats()["capacity"] == 50
+
+    def test_invalid_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            setup_logging(policy="esperar")
@@ -0,0 +1,33 @@
+#backend/tests/phase_0/test_scripts.py
+"""
+Tests de humo de los scripts de scripts/: cada uno arranca en un intérprete
+limpio (sin los modelos que ya importa conftest), de modo que un ciclo de
+importación entre servicios y modelos hace fallar el test.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[3] / "scripts"
+CLI_SCRIPTS = [
+    "benchmark_api.py",
+    "benchmark_indexes.py",
+    "benchmark_json_responses.py",
+    "benchmark_rag.py",
+    "generate_synthetic_data.py",
+    "llm_standin_server.py",
+    "load_data.py",
+]
+
+
+@pytest.mark.parametrize("script", CLI_SCRIPTS)
+def test_script_starts(script):
+    """El script importa sus dependencias y muestra la ayuda"""
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / script), "--help"],
+        cwd=SCRIPTS_DIR.parent, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "usage:" in result.stdout
@@ -13,7 +13,9 @@ sku VARCHAR PRIMARY KEY,
 name VARCHAR NOT NULL,
 description TEXT,
 price NUMERIC(10,2),
-spec_json JSONB
+spec_json JSONB,
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: technicians ---------
@@ -28,7 +30,9 @@ zone VARCHAR
 --------- Tabla: warehouses ---------
 CREATE TABLE IF NOT EXISTS warehouses (
 warehouse_id SERIAL PRIMARY KEY,
-name VARCHAR
+name VARCHAR,
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: installed_equipment ---------
@@ -49,10 +53,19 @@ client_id INT REFERENCES clients(client_id),
 equipment_id INT REFERENCES installed_equipment(equipment_id),
 date DATE NOT NULL,
 type VARCHAR CHECK (type IN ('instalacion', 'mantenimiento', 'reparacion', 'retirada')),
+description TEXT,
 result TEXT,
 document_url TEXT
 );
 
+--------- Tabla: technician_workload ---------
+CREATE TABLE IF NOT EXISTS technician_workload (
+technician_id INT REFERENCES technicians(technician_id),
+day DATE NOT NULL,
+interventions INT NOT NULL DEFAULT 0,
+PRIMARY KEY (technician_id, day)
+);
+
 --------- Tabla: contracts ---------
 CREATE TABLE IF NOT EXISTS contracts (
 contract_id SERIAL PRIMARY KEY,
@@ -69,7 +82,9 @@ order_id VARCHAR PRIMARY KEY,
 client_id INT REFERENCES clients(client_id),
 chat_id VARCHAR,
 total_amount NUMERIC(10,2),
-status VARCHAR DEFAULT 'pendiente'
+status VARCHAR DEFAULT 'pendiente',
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: order_items ---------
@@ -78,7 +93,9 @@ item_id SERIAL PRIMARY KEY,
 order_id VARCHAR REFERENCES orders(order_id),
 product_sku VARCHAR REFERENCES products(sku),
 quantity INT,
-price NUMERIC(10,2)
+price NUMERIC(10,2),
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: stock ---------
@@ -86,7 +103,36 @@ CREATE TABLE IF NOT EXISTS stock (
 stock_id SERIAL PRIMARY KEY,
 sku VARCHAR REFERENCES products(sku),
 warehouse_id INT REFERENCES warehouses(warehouse_id),
-quantity INT
+quantity INT,
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP,
+CONSTRAINT uq_stock_sku_warehouse UNIQUE (sku, warehouse_id)
+);
+
+--------- Tabla: stock_movements ---------
+CREATE TABLE IF NOT EXISTS stock_movements (
+movement_id SERIAL PRIMARY KEY,
+stock_id INT NOT NULL REFERENCES stock(stock_id),
+sku VARCHAR NOT NULL,
+warehouse_id INT NOT NULL,
+movement_type VARCHAR NOT NULL,
+quantity INT NOT NULL,
+quantity_after INT,
+reference VARCHAR,
+created_at TIMESTAMP DEFAULT now()
+);
+
+--------- Tabla: stock_reservations ---------
+CREATE TABLE IF NOT EXISTS stock_reservations (
+reservation_id SERIAL PRIMARY KEY,
+stock_id INT NOT NULL REFERENCES stock(stock_id),
+sku VARCHAR NOT NULL,
+warehouse_id INT NOT NULL,
+quantity INT NOT NULL,
+reference VARCHAR NOT NULL,
+status VARCHAR NOT NULL DEFAULT 'reservada',
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: knowledge_feedback ---------
@@ -96,7 +142,8 @@ question TEXT,
 expected_answer TEXT,
 user_type VARCHAR,
 status VARCHAR DEFAULT 'pendiente',
-created_at TIMESTAMP DEFAULT now()
+created_at TIMESTAMP DEFAULT now(),
+updated_at TIMESTAMP
 );
 
 --------- Tabla: chat_sessions ---------
@@ -118,20 +165,116 @@ CREATE TABLE IF NOT EXISTS chat_messages (
     message_text TEXT
 );
 
+--------- Tabla: table_versions ---------
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- ═══════════════════════════════════════════════════════════════
+-- ÍNDICES - Los mismos de alembic/versions/0001_hot_filter_indexes.py
+-- ═══════════════════════════════════════════════════════════════
+
+-- stock: el UNIQUE (sku, warehouse_id) de la tabla cubre también los filtros por sku
+CREATE INDEX IF NOT EXISTS ix_stock_warehouse_id ON stock (warehouse_id);
+CREATE INDEX IF NOT EXISTS ix_stock_low_quantity ON stock (quantity) WHERE quantity <= 5;
+-- interventions: agenda por técnico y fecha, y filtros por cliente/equipo/rango de fechas
+CREATE INDEX IF NOT EXISTS ix_interventions_technician_date ON interventions (technician_id, date);
+CREATE INDEX IF NOT EXISTS ix_interventions_client_id ON interventions (client_id);
+CREATE INDEX IF NOT EXISTS ix_interventions_equipment_id ON interventions (equipment_id);
+CREATE INDEX IF NOT EXISTS ix_interventions_date ON interventions (date);
+-- chat_messages: mensajes de una sesión en orden cronológico
+CREATE INDEX IF NOT EXISTS ix_chat_messages_chat_timestamp ON chat_messages (chat_id, message_timestamp);
+-- order_items: elementos de un pedido
+CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id);
+-- contracts: vencimientos y contratos por cliente
+CREATE INDEX IF NOT EXISTS ix_contracts_end_date ON contracts (end_date);
+CREATE INDEX IF NOT EXISTS ix_contracts_client_id ON contracts (client_id);
+-- knowledge_feedback: filtros por estado y por tipo de usuario (+ estado)
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_status ON knowledge_feedback (status);
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_user_type_status ON knowledge_feedback (user_type, status);
+-- stock_movements / stock_reservations: los de alembic/versions/0004_stock_movements.py
+CREATE INDEX IF NOT EXISTS ix_stock_movements_stock_id ON stock_movements (stock_id);
+CREATE INDEX IF NOT EXISTS ix_stock_movements_reference ON stock_movements (reference);
+CREATE INDEX IF NOT EXISTS ix_stock_reservations_reference_status ON stock_reservations (reference, status);
+-- technician_workload: el de alembic/versions/0005_technician_workload.py
+CREATE INDEX IF NOT EXISTS ix_technician_workload_day ON technician_workload (day);
+
+-- ═══════════════════════════════════════════════════════════════
+-- BÚSQUEDA DE TEXTO - Los de alembic/versions/0002_fulltext_search.py
+-- (configuración 'spanish' de backend/db/fulltext.py); sin ellos /search
+-- recorre las tablas completas
+-- ═══════════════════════════════════════════════════════════════
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- Búsqueda ranqueada: to_tsvector('spanish', ...) @@ websearch_to_tsquery(...)
+CREATE INDEX IF NOT EXISTS ix_chat_messages_message_text_fts ON chat_messages USING gin (to_tsvector('spanish', coalesce(message_text, '')));
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_question_fts ON knowledge_feedback USING gin (to_tsvector('spanish', coalesce(question, '')));
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_expected_answer_fts ON knowledge_feedback USING gin (to_tsvector('spanish', coalesce(expected_answer, '')));
+-- Búsquedas parciales ILIKE '%texto%'
+CREATE INDEX IF NOT EXISTS ix_chat_messages_message_text_trgm ON chat_messages USING gin (message_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_question_trgm ON knowledge_feedback USING gin (question gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_knowledge_feedback_expected_answer_trgm ON knowledge_feedback USING gin (expected_answer gin_trgm_ops);
+
+-- ═══════════════════════════════════════════════════════════════
+-- VERSIONES DE TABLA - Las de alembic/versions/0006_table_versions.py
+-- (backend/db/table_versions.py): huella de los ETag de los listados
+-- ═══════════════════════════════════════════════════════════════
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+DECLARE
+    flag text := 'ainstalia.version_bumped_' || TG_TABLE_NAME;
+BEGIN
+    IF current_setting(flag, true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM set_config(flag, 'on', true);
+    INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+-- products: +1 por transacción en el COMMIT; TRUNCATE al momento
+DROP TRIGGER IF EXISTS trg_products_version ON products;
+CREATE CONSTRAINT TRIGGER trg_products_version
+    AFTER INSERT OR UPDATE OR DELETE ON products
+    DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS trg_products_version_truncate ON products;
+CREATE TRIGGER trg_products_version_truncate AFTER TRUNCATE ON products FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+-- stock: +1 por transacción en el COMMIT; TRUNCATE al momento
+DROP TRIGGER IF EXISTS trg_stock_version ON stock;
+CREATE CONSTRAINT TRIGGER trg_stock_version
+    AFTER INSERT OR UPDATE OR DELETE ON stock
+    DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS trg_stock_version_truncate ON stock;
+CREATE TRIGGER trg_stock_version_truncate AFTER TRUNCATE ON stock FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+-- warehouses: +1 por transacción en el COMMIT; TRUNCATE al momento
+DROP TRIGGER IF EXISTS trg_warehouses_version ON warehouses;
+CREATE CONSTRAINT TRIGGER trg_warehouses_version
+    AFTER INSERT OR UPDATE OR DELETE ON warehouses
+    DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS trg_warehouses_version_truncate ON warehouses;
+CREATE TRIGGER trg_warehouses_version_truncate AFTER TRUNCATE ON warehouses FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
 -- ═══════════════════════════════════════════════════════════════
 -- CARGA DE DATOS - Ejecutar después de crear todas las tablas
 -- ═══════════════════════════════════════════════════════════════
 
 \copy clients (name,email,phone,address) FROM '/data/clients.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
-\copy products FROM '/data/products.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
+\copy products (sku,name,description,price,spec_json) FROM '/data/products.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy technicians (name,email,phone,zone) FROM '/data/technicians.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy warehouses (name) FROM '/data/warehouses.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy installed_equipment (client_id,sku,install_date,status,config_json) FROM '/data/installed_equipment.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy interventions (technician_id,client_id,equipment_id,date,type,result,document_url) FROM '/data/interventions.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy contracts (client_id,start_date,end_date,type,terms) FROM '/data/contracts.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
-\copy orders FROM '/data/orders.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8', NULL 'NULL');
+\copy orders (order_id,client_id,chat_id,total_amount,status) FROM '/data/orders.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8', NULL 'NULL');
 \copy order_items (order_id,product_sku,quantity,price) FROM '/data/order_items.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy stock (sku,warehouse_id,quantity) FROM '/data/stock.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy knowledge_feedback (question,expected_answer,user_type,status) FROM '/data/knowledge_feedback.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
 \copy chat_sessions (chat_id,order_id,client_id,start_timestamp,end_timestamp,topic) FROM '/data/chat_sessions.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
-\copy chat_messages (chat_id,message_timestamp,sender,message_text) FROM '/data/chat_messages.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
\ No newline at end of file
+\copy chat_messages (chat_id,message_timestamp,sender,message_text) FROM '/data/chat_messages.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
+
+-- Índice de carga de trabajo derivado de las intervenciones cargadas
+INSERT INTO technician_workload (technician_id, day, interventions)
+SELECT technician_id, date, count(*) FROM interventions WHERE technician_id IS NOT NULL GROUP BY technician_id, date
+ON CONFLICT (technician_id, day) DO UPDATE SET interventions = EXCLUDED.interventions;
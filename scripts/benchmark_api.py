@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo de la API.
+
+Arranca la aplicación FastAPI en el propio proceso (transporte ASGI de httpx,
+con su lifespan y tareas de fondo) contra una base de datos local, SQLite por
+defecto o PostgreSQL con --database-url, y la puebla con los CSV de --data-dir
+(data/ o un conjunto de generate_synthetic_data.py) si está vacía.
+
+El LLM, el agente SQL y los embeddings se sustituyen por dobles deterministas
+con latencia artificial configurable (--llm-latency-ms, --embedding-latency-ms):
+el resto del camino (validación del SQL, permisos por rol, consulta a la base de
+datos, troceado e indexación del RAG) es el código real de los servicios.
+
+Para cada nivel de concurrencia (--concurrency 1,8,32) se envía la misma secuencia
+de peticiones, una mezcla de CRUD, /ai/sql-query y /ai/knowledge-query (--mix), y
+se informa de p50/p95/p99, throughput y tasa de errores, en total y por operación.
+El informe se compara con la línea base guardada (--save-baseline) y se listan las
+regresiones por encima de --tolerance.
+
+La indexación del RAG en proceso usa FAISS: con knowledge en --mix el benchmark no
+arranca si falta faiss-cpu. Si alguna operación falla en el 100% de sus peticiones
+el script termina con código 1 y no guarda la línea base.
+
+Con --llm-base-url los servicios de IA reales llaman por HTTP a un servidor
+compatible con OpenAI, normalmente scripts/llm_standin_server.py, en lugar de usar
+los dobles en proceso. Con --base-url se mide un servidor ya arrancado (sin dobles
+de IA ni carga de datos).
+
+Uso:
+    python scripts/benchmark_api.py --concurrency 1,8,32 --requests 500 --output informe.json
+    python scripts/benchmark_api.py --save-baseline
+    python scripts/benchmark_api.py --fail-on-regression
+"""
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Agregar el directorio padre al path para importar el backend
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import httpx
+    from langchain_core.embeddings import Embeddings
+
+    from backend.core.logging import get_logger
+    from llm_standin_server import CANNED_SQL
+    from local_embeddings import HashingEmbedder
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+logger = get_logger("ainstalia.benchmark_api")
+
+DEFAULT_BASELINE = Path(__file__).parent.parent / "benchmarks" / "api_baseline.json"
+DEFAULT_MIX = "crud=0.85,sql=0.10,knowledge=0.05"
+PERCENTILES = (50, 95, 99)
+
+KNOWLEDGE_QUESTIONS = [
+    "¿Cada cuánto hay que cambiar el filtro del aire acondicionado?",
+    "¿Qué significa el código de error E4 en la unidad exterior?",
+    "¿Cómo reajustar el termostato inteligente después de un corte de luz?",
+    "¿Qué presión debe marcar el circuito de calefacción?",
+]
+
+
+# ----------------------------------------------------------------------
+# Dobles de los servicios de IA
+# ----------------------------------------------------------------------
+
+class LatencyModel:
+    """Latencia artificial: normal(media, desviación) truncada en 0"""
+
+    def __init__(self, mean_ms: float, jitter_ms: float, seed: int = 0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        """Latencia en segundos"""
+        if self.mean_ms <= 0:
+            return 0.0
+        return max(0.0, self.rng.gauss(self.mean_ms, self.jitter_ms)) / 1000
+
+
+class StubChatModel:
+    """Sustituto de ChatOpenAI: bloquea el hilo como una llamada HTTP síncrona"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def invoke(self, prompt: Any) -> SimpleNamespace:
+        time.sleep(self.latency.sample())
+        return SimpleNamespace(content="Según la documentación técnica, revise el manual del equipo y contacte con soporte si persiste.")
+
+
+class StubSQLAgent:
+    """Sustituto del agente SQL: devuelve el SQL asociado a la pregunta en un bloque markdown"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def run(self, prompt: str) -> str:
+        time.sleep(self.latency.sample())
+        sql = next((sql for question, sql in CANNED_SQL if question in prompt), CANNED_SQL[0][1])
+        return f"```sql\n{sql}\n```"
+
+
+class HashEmbeddings(Embeddings):
+    """Embeddings deterministas (HashingEmbedder) con latencia por llamada"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.embedder = HashingEmbedder()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency.sample())
+        return self.embedder.embed_many(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency.sample())
+        return self.embedder.embed(text).tolist()
+
+
+def install_ai_stubs(llm_latency: LatencyModel, embedding_latency: LatencyModel, vector_store_path: Path) -> None:
+    """
+    Sustituye en los endpoints de IA las fábricas de AIService y RAGService por
+    subclases que solo cambian los clientes de OpenAI por los dobles anteriores.
+    """
+    from backend.api.v1.endpoints import ai as ai_endpoints
+    from backend.services.ai_service import AIService
+    from backend.services.rag_service import RAGService
+
+    class BenchmarkAIService(AIService):
+        def _initialize_llm(self) -> StubChatModel:
+            return StubChatModel(llm_latency)
+
+        def _initialize_sql_agent(self) -> StubSQLAgent:
+            return StubSQLAgent(llm_latency)
+
+    class BenchmarkRAGService(RAGService):
+        def _initialize_embeddings(self) -> HashEmbeddings:
+            return HashEmbeddings(embedding_latency)
+
+        def _initialize_llm(self) -> StubChatModel:
+            return StubChatModel(llm_latency)
+
+    ai_endpoints.get_ai_service = BenchmarkAIService
+    ai_endpoints.RAGService = functools.partial(BenchmarkRAGService, vector_store_path=vector_store_path)
+
+
+# ----------------------------------------------------------------------
+# Base de datos
+# ----------------------------------------------------------------------
+
+async def prepare_database(data_dir: Path) -> None:
+    """Crea las tablas que falten y carga los CSV si la base de datos está vacía"""
+    from sqlalchemy import text
+
+    from backend.db.base import Base
+    from backend.db.session import AsyncSessionLocal, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        loaded = (await db.execute(text("SELECT COUNT(*) FROM clients"))).scalar()
+
+    if not loaded:
+        from load_data import DataLoader
+
+        mode = "copy" if engine.dialect.name == "postgresql" else "stream"
+        logger.info(f"📥 Cargando datos de {data_dir} (modo {mode})")
+        loader = DataLoader(mode=mode, data_dir=data_dir)
+        if not await asyncio.to_thread(loader.load_all_data):
+            raise RuntimeError(f"No se pudieron cargar los datos de {data_dir}")
+
+
+async def discover_keys(client: httpx.AsyncClient) -> Dict[str, List[Any]]:
+    """Muestra de claves (clientes, SKU, pedidos, chats) leída de la propia API para el tráfico"""
+    listings = {
+        "client_ids": ("/api/v1/clients/?limit=1000", "client_id"),
+        "skus": ("/api/v1/products/?limit=1000", "sku"),
+        "order_ids": ("/api/v1/orders/?limit=1000", "order_id"),
+        "chat_ids": ("/api/v1/chat/sessions/?limit=1000", "chat_id"),
+    }
+    keys: Dict[str, List[Any]] = {}
+    for name, (path, field) in listings.items():
+        response = await client.get(path)
+        response.raise_for_status()
+        keys[name] = [item[field] for item in response.json()]
+        if not keys[name]:
+            raise RuntimeError(f"Sin datos para generar tráfico ({path})")
+    return keys
+
+
+# ----------------------------------------------------------------------
+# Tráfico
+# ----------------------------------------------------------------------
+
+# Petición: (operación, método, ruta, cuerpo JSON)
+Request = Tuple[str, str, str, Optional[Dict[str, Any]]]
+RequestBuilder = Callable[[random.Random, Dict[str, List[Any]]], Request]
+
+CRUD_OPERATIONS: Dict[str, RequestBuilder] = {
+    "clients.get": lambda rng, keys: ("clients.get", "GET", f"/api/v1/clients/{rng.choice(keys['client_ids'])}", None),
+    "clients.list": lambda rng, keys: ("clients.list", "GET", f"/api/v1/clients/?limit=50&skip={rng.randint(0, 200)}", None),
+    "products.get": lambda rng, keys: ("products.get", "GET", f"/api/v1/products/{rng.choice(keys['skus'])}", None),
+    "orders.full": lambda rng, keys: ("orders.full", "GET", f"/api/v1/orders/{rng.choice(keys['order_ids'])}/full", None),
+    "stock.list": lambda rng, keys: ("stock.list", "GET", "/api/v1/stock/?limit=100", None),
+    "stock.availability": lambda rng, keys: (
+        "stock.availability", "POST", "/api/v1/stock/availability", {"skus": rng.sample(keys["skus"], min(5, len(keys["skus"])))}
+    ),
+    "interventions.list": lambda rng, keys: ("interventions.list", "GET", "/api/v1/interventions/?limit=50", None),
+    "chat.messages.create": lambda rng, keys: (
+        "chat.messages.create", "POST", "/api/v1/chat/messages/",
+        {"chat_id": rng.choice(keys["chat_ids"]), "sender": "cliente", "message_text": "Mensaje de prueba de carga"}
+    ),
+}
+AI_OPERATIONS: Dict[str, RequestBuilder] = {
+    "sql": lambda rng, keys: (
+        "ai.sql_query", "POST", "/api/v1/ai/sql-query",
+        {"query": rng.choice(CANNED_SQL)[0], "user_role": "administrador"}
+    ),
+    "knowledge": lambda rng, keys: (
+        "ai.knowledge_query", "POST", "/api/v1/ai/knowledge-query", {"query": rng.choice(KNOWLEDGE_QUESTIONS)}
+    ),
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'crud=0.85,sql=0.10,knowledge=0.05' → pesos normalizados"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name != "crud" and name not in AI_OPERATIONS:
+            raise ValueError(f"Tipo de tráfico desconocido en --mix: {name}")
+        weights[name] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Los pesos de --mix deben sumar más de 0")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def build_plan(mix: Dict[str, float], keys: Dict[str, List[Any]], count: int, seed: int) -> List[Request]:
+    """Secuencia determinista de peticiones (la misma para todos los niveles de concurrencia)"""
+    rng = random.Random(seed)
+    kinds, weights = list(mix), list(mix.values())
+    crud = list(CRUD_OPERATIONS.values())
+    plan = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        builder = rng.choice(crud) if kind == "crud" else AI_OPERATIONS[kind]
+        plan.append(builder(rng, keys))
+    return plan
+
+
+def check_ai_dependencies(mix: Dict[str, float]) -> None:
+    """
+    El RAG en proceso indexa con FAISS: sin faiss-cpu cada /ai/knowledge-query
+    fallaría y el informe mediría solo errores. Se aborta antes de empezar.
+    """
+    if not mix.get("knowledge"):
+        return
+    try:
+        import faiss  # noqa
+    except ImportError:
+        raise RuntimeError(
+            "faiss no está instalado (pip install faiss-cpu) y --mix incluye knowledge; "
+            "instálalo o quita knowledge de --mix"
+        ) from None
+
+
+def failed_operations(report: Dict[str, Any]) -> List[str]:
+    """Operaciones con todas sus peticiones fallidas en algún nivel"""
+    return sorted({
+        f"{name} (c={level['concurrency']})"
+        for level in report["levels"]
+        for name, operation in level["operations"].items()
+        if operation["count"] and operation["error_rate"] >= 1.0
+    })
+
+
+def is_error(response: httpx.Response) -> bool:
+    """Error HTTP, o respuesta 200 de los endpoints de IA con success=false"""
+    if response.status_code >= 400:
+        return True
+    if response.url.path.startswith("/api/v1/ai/"):
+        try:
+            return response.json().get("success") is False
+        except ValueError:
+            return True
+    return False
+
+
+# ----------------------------------------------------------------------
+# Métricas
+# ----------------------------------------------------------------------
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int) -> Dict[str, Any]:
+    """Recuento, tasa de errores y percentiles de latencia (ms)"""
+    values = sorted(latencies_ms)
+    latency = {f"p{pct}": round(percentile(values, pct), 3) for pct in PERCENTILES}
+    latency["mean"] = round(statistics.fmean(values), 3) if values else 0.0
+    latency["max"] = round(values[-1], 3) if values else 0.0
+    return {
+        "count": len(values),
+        "errors": errors,
+        "error_rate": round(errors / len(values), 4) if values else 0.0,
+        "latency_ms": latency,
+    }
+
+
+async def run_level(client: httpx.AsyncClient, plan: List[Request], concurrency: int, warmup: int) -> Dict[str, Any]:
+    """Envía el plan con `concurrency` clientes concurrentes y resume los resultados"""
+    samples: List[Tuple[str, float, bool]] = []
+    measured = plan[warmup:]
+    position = 0
+
+    async def send(request: Request) -> Tuple[str, float, bool]:
+        name, method, path, body = request
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            failed = is_error(response)
+        except Exception as e:
+            logger.debug(f"{name}: {e}")
+            failed = True
+        return name, (time.perf_counter() - start) * 1000, failed
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(measured):
+            request = measured[position]
+            position += 1
+            samples.append(await send(request))
+
+    for request in plan[:warmup]:
+        await send(request)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    by_operation: Dict[str, Tuple[List[float], int]] = {}
+    for name, latency_ms, failed in samples:
+        latencies, errors = by_operation.get(name, ([], 0))
+        latencies.append(latency_ms)
+        by_operation[name] = (latencies, errors + failed)
+
+    total = summarize([latency for _, latency, _ in samples], sum(failed for _, _, failed in samples))
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(samples) / duration, 2) if duration else 0.0,
+        **total,
+        "operations": {name: summarize(latencies, errors) for name, (latencies, errors) in sorted(by_operation.items())},
+    }
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance_pct: float) -> List[Dict[str, Any]]:
+    """
+    Regresiones frente a la línea base, por nivel de concurrencia y operación:
+    p95 o p99 más altos, o throughput más bajo, en más de `tolerance_pct` %, o
+    tasa de errores más alta en más de un punto porcentual.
+    """
+    regressions = []
+    baseline_levels = {level["concurrency"]: level for level in baseline.get("levels", [])}
+
+    def check(concurrency: int, operation: str, current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+        for metric in ("p95", "p99"):
+            before, after = previous["latency_ms"][metric], current["latency_ms"][metric]
+            if before and (after - before) / before * 100 > tolerance_pct:
+                regressions.append({"concurrency": concurrency, "operation": operation, "metric": f"{metric}_ms",
+                                    "baseline": before, "current": after, "change_pct": round((after - before) / before * 100, 1)})
+        if current["error_rate"] - previous["error_rate"] > 0.01:
+            regressions.append({"concurrency": concurrency, "operation": operation, "metric": "error_rate",
+                                "baseline": previous["error_rate"], "current": current["error_rate"]})
+
+    for level in report["levels"]:
+        previous = baseline_levels.get(level["concurrency"])
+        if previous is None:
+            continue
+        check(level["concurrency"], "total", level, previous)
+        before, after = previous["throughput_rps"], level["throughput_rps"]
+        if before and (before - after) / before * 100 > tolerance_pct:
+            regressions.append({"concurrency": level["concurrency"], "operation": "total", "metric": "throughput_rps",
+                                "baseline": before, "current": after, "change_pct": round((after - before) / before * 100, 1)})
+        for operation, current in level["operations"].items():
+            if operation in previous.get("operations", {}):
+                check(level["concurrency"], operation, current, previous["operations"][operation])
+    return regressions
+
+
+# ----------------------------------------------------------------------
+# Ejecución
+# ----------------------------------------------------------------------
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Arranca la aplicación (o usa --base-url), ejecuta todos los niveles y devuelve el informe"""
+    mix = parse_mix(args.mix)
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    work_dir = Path(tempfile.mkdtemp(prefix="ainstalia_bench_"))
+    config = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "target": args.base_url or "in-process",
+        "database": None,
+        "mix": mix,
+        "requests_per_level": args.requests,
+        "warmup": args.warmup,
+        "llm_latency_ms": [args.llm_latency_ms, args.llm_jitter_ms],
+        "embedding_latency_ms": args.embedding_latency_ms,
+        "llm_base_url": args.llm_base_url,
+        "seed": args.seed,
+    }
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        lifespan = None
+    else:
+        # La configuración se lee al importar el backend: fijar la base de datos antes
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{work_dir / 'benchmark.db'}"
+        os.environ.pop("DATABASE_READ_URL", None)
+        config["database"] = os.environ["DATABASE_URL"].split("@")[-1]
+        check_ai_dependencies(mix)
+        if args.llm_base_url:
+            os.environ["OPENAI_BASE_URL"] = args.llm_base_url
+            os.environ.setdefault("OPENAI_API_KEY", "sk-local-standin")
+        from backend.main import app
+
+        if not args.llm_base_url:
+            install_ai_stubs(
+                LatencyModel(args.llm_latency_ms, args.llm_jitter_ms, args.seed),
+                LatencyModel(args.embedding_latency_ms, args.embedding_latency_ms / 4, args.seed + 1),
+                work_dir / "vector_store",
+            )
+        await prepare_database(args.data_dir)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout)
+
+    report: Dict[str, Any] = {"config": config, "levels": []}
+    try:
+        plan = build_plan(mix, await discover_keys(client), args.warmup + args.requests, args.seed)
+        for concurrency in concurrency_levels:
+            logger.info(f"🚦 Concurrencia {concurrency}: {args.requests} peticiones")
+            report["levels"].append(await run_level(client, plan, concurrency, args.warmup))
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Muestra los resultados por nivel y las regresiones detectadas"""
+    logger.info("\n📊 Resultados")
+    for level in report["levels"]:
+        latency = level["latency_ms"]
+        logger.info(
+            f"   c={level['concurrency']:>3}: {level['throughput_rps']:8.1f} req/s  "
+            f"p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  p99 {latency['p99']:8.1f} ms  "
+            f"errores {level['error_rate']:.1%}"
+        )
+        for name, operation in level["operations"].items():
+            latency = operation["latency_ms"]
+            logger.info(
+                f"         {name:<22} n={operation['count']:<5} p50 {latency['p50']:8.1f}  "
+                f"p95 {latency['p95']:8.1f}  p99 {latency['p99']:8.1f}  errores {operation['error_rate']:.1%}"
+            )
+    for regression in report.get("regressions", []):
+        logger.warning(
+            f"⚠️ Regresión c={regression['concurrency']} {regression['operation']} {regression['metric']}: "
+            f"{regression['baseline']} → {regression['current']}"
+        )
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Benchmark de extremo a extremo de la API")
+    parser.add_argument("--database-url", help="URL async de la base de datos (por defecto SQLite temporal)")
+    parser.add_argument("--data-dir", type=Path, default=Path(__file__).parent.parent / "data",
+                        help="CSV con los que poblar la base de datos si está vacía")
+    parser.add_argument("--base-url", help="Medir un servidor ya arrancado en lugar de la aplicación en proceso")
+    parser.add_argument("--concurrency", default="1,8,32", help="Niveles de concurrencia separados por comas")
+    parser.add_argument("--requests", type=int, default=500, help="Peticiones medidas por nivel")
+    parser.add_argument("--warmup", type=int, default=20, help="Peticiones de calentamiento por nivel (no se miden)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Pesos del tráfico: crud, sql, knowledge")
+    parser.add_argument("--llm-base-url", help="Servidor compatible con OpenAI para los servicios de IA reales (p. ej. http://localhost:8100/v1)")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="Latencia media simulada del LLM")
+    parser.add_argument("--llm-jitter-ms", type=float, default=200, help="Desviación de la latencia del LLM")
+    parser.add_argument("--embedding-latency-ms", type=float, default=50, help="Latencia media simulada de los embeddings")
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout por petición en segundos")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de la secuencia de peticiones")
+    parser.add_argument("--output", type=Path, help="Fichero JSON donde guardar el informe")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Línea base con la que comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar este informe como línea base")
+    parser.add_argument("--tolerance", type=float, default=20, help="Empeoramiento tolerado respecto a la línea base (%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Salir con código 1 si hay regresiones")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(args))
+    except Exception as e:
+        logger.error(f"💥 Error en el benchmark: {e}")
+        return 1
+
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["baseline"] = str(args.baseline)
+        report["regressions"] = compare_with_baseline(report, baseline, args.tolerance)
+
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"💾 Informe guardado en {args.output}")
+    failed = failed_operations(report)
+    if failed:
+        # Una operación que solo devuelve errores no mide nada: no puede ser línea base
+        logger.error(f"💥 Operaciones con 100% de errores: {', '.join(failed)}")
+        if args.save_baseline:
+            logger.error("💥 Línea base no guardada")
+        return 1
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"📌 Línea base guardada en {args.baseline}")
+    if args.fail_on_regression and report.get("regressions"):
+        logger.error(f"💥 {len(report['regressions'])} regresiones respecto a la línea base")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
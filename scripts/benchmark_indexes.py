@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark de planes de consulta antes y después de la migración de índices.
+
+Crea un esquema temporal en PostgreSQL con las tablas de filtrado más usadas,
+lo puebla con un volumen escalado (generate_series), ejecuta EXPLAIN ANALYZE
+sobre las consultas que lanza la capa CRUD sin índices y con los índices de
+alembic/versions/0001_hot_filter_indexes.py, y muestra la comparación.
+
+Uso:
+    python scripts/benchmark_indexes.py --scale 100 --output plans.json
+"""
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import create_engine, text
+
+# Agregar el directorio padre al path para importar configuración
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from backend.core.config import settings
+    from backend.core.logging import get_logger
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+logger = get_logger("ainstalia.benchmark_indexes")
+
+MIGRATION_PATH = Path(__file__).parent.parent / "alembic" / "versions" / "0001_hot_filter_indexes.py"
+BENCH_SCHEMA = "bench_indexes"
+
+# Filas por tabla con scale=1; se multiplican por --scale
+BASE_ROWS = {
+    "stock": 2_000,
+    "interventions": 2_000,
+    "chat_messages": 5_000,
+    "order_items": 3_000,
+    "contracts": 500,
+    "knowledge_feedback": 500,
+}
+
+# Tablas mínimas (sin claves foráneas para poblar rápido) con las columnas consultadas
+SCHEMA_DDL = [
+    """CREATE TABLE stock (
+        stock_id SERIAL PRIMARY KEY, sku VARCHAR, warehouse_id INT, quantity INT)""",
+    """CREATE TABLE interventions (
+        intervention_id SERIAL PRIMARY KEY, technician_id INT, client_id INT,
+        equipment_id INT, date DATE NOT NULL, type VARCHAR, result TEXT)""",
+    """CREATE TABLE chat_messages (
+        message_id SERIAL PRIMARY KEY, chat_id VARCHAR,
+        message_timestamp TIMESTAMP NOT NULL, sender VARCHAR, message_text TEXT)""",
+    """CREATE TABLE order_items (
+        item_id SERIAL PRIMARY KEY, order_id VARCHAR, product_sku VARCHAR,
+        quantity INT, price NUMERIC(10,2))""",
+    """CREATE TABLE contracts (
+        contract_id SERIAL PRIMARY KEY, client_id INT, start_date DATE,
+        end_date DATE, type VARCHAR)""",
+    """CREATE TABLE knowledge_feedback (
+        feedback_id SERIAL PRIMARY KEY, question TEXT, user_type VARCHAR, status VARCHAR)""",
+]
+
+# Datos sintéticos; :n es el número de filas de la tabla.
+# stock genera combinaciones (sku, warehouse_id) únicas para admitir el índice UNIQUE.
+POPULATE_SQL = {
+    "stock": """
+        INSERT INTO stock (sku, warehouse_id, quantity)
+        SELECT 'SKU-' || lpad((g / 20)::text, 6, '0'), g % 20, (random() * 200)::int
+        FROM generate_series(0, :n - 1) g""",
+    "interventions": """
+        INSERT INTO interventions (technician_id, client_id, equipment_id, date, type, result)
+        SELECT (random() * 200)::int, (random() * 5000)::int, (random() * 10000)::int,
+               DATE '2020-01-01' + (random() * 2000)::int,
+               (ARRAY['instalacion','mantenimiento','reparacion','retirada'])[1 + (g % 4)],
+               'Resultado ' || g
+        FROM generate_series(1, :n) g""",
+    "chat_messages": """
+        INSERT INTO chat_messages (chat_id, message_timestamp, sender, message_text)
+        SELECT 'CHAT-' || (g % (:n / 10 + 1)), TIMESTAMP '2024-01-01' + g * INTERVAL '1 minute',
+               (ARRAY['cliente','agente','sistema'])[1 + (g % 3)], 'Mensaje ' || g
+        FROM generate_series(1, :n) g""",
+    "order_items": """
+        INSERT INTO order_items (order_id, product_sku, quantity, price)
+        SELECT 'ORD-' || (g / 3), 'SKU-' || lpad((g % 1000)::text, 6, '0'),
+               1 + (g % 5), (random() * 500)::numeric(10,2)
+        FROM generate_series(1, :n) g""",
+    "contracts": """
+        INSERT INTO contracts (client_id, start_date, end_date, type)
+        SELECT (random() * 5000)::int, CURRENT_DATE - (random() * 1000)::int,
+               CURRENT_DATE + (random() * 1000)::int - 300, 'mantenimiento'
+        FROM generate_series(1, :n) g""",
+    "knowledge_feedback": """
+        INSERT INTO knowledge_feedback (question, user_type, status)
+        SELECT 'Pregunta ' || g, (ARRAY['cliente','tecnico','comercial'])[1 + (g % 3)],
+               (ARRAY['pendiente','revisado','aprobado','rechazado'])[1 + (g % 4)]
+        FROM generate_series(1, :n) g""",
+}
+
+# Consultas equivalentes a las que genera la capa CRUD
+QUERIES: List[Tuple[str, str]] = [
+    ("stock por sku", "SELECT * FROM stock WHERE sku = 'SKU-000042'"),
+    ("stock por almacén", "SELECT * FROM stock WHERE warehouse_id = 3 ORDER BY stock_id LIMIT 100"),
+    ("stock por sku y almacén", "SELECT * FROM stock WHERE sku = 'SKU-000042' AND warehouse_id = 2"),
+    ("stock bajo (<= 5)", "SELECT * FROM stock WHERE quantity <= 5"),
+    ("stock agotado", "SELECT * FROM stock WHERE quantity = 0"),
+    ("intervenciones por técnico",
+     "SELECT * FROM interventions WHERE technician_id = 17 ORDER BY date LIMIT 100"),
+    ("intervenciones por cliente", "SELECT * FROM interventions WHERE client_id = 123"),
+    ("intervenciones por equipo", "SELECT * FROM interventions WHERE equipment_id = 456"),
+    ("intervenciones por rango de fechas",
+     "SELECT * FROM interventions WHERE date BETWEEN DATE '2022-03-01' AND DATE '2022-03-07'"),
+    ("mensajes de una sesión",
+     "SELECT * FROM chat_messages WHERE chat_id = 'CHAT-42' ORDER BY message_timestamp"),
+    ("elementos de un pedido", "SELECT * FROM order_items WHERE order_id = 'ORD-42'"),
+    ("contratos que vencen en 30 días",
+     "SELECT * FROM contracts WHERE end_date BETWEEN CURRENT_DATE AND CURRENT_DATE + 30"),
+    ("feedback por estado", "SELECT * FROM knowledge_feedback WHERE status = 'pendiente' LIMIT 100"),
+    ("feedback por tipo y estado",
+     "SELECT * FROM knowledge_feedback WHERE user_type = 'tecnico' AND status = 'aprobado' LIMIT 100"),
+]
+
+
+def load_index_specs() -> List[Tuple[str, str, List[str], bool, Any]]:
+    """Carga la lista INDEXES de la migración para no duplicar su definición"""
+    spec = importlib.util.spec_from_file_location("hot_filter_indexes", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.INDEXES
+
+
+def index_ddl(name: str, table: str, columns: List[str], unique: bool, where: Any) -> str:
+    """SQL CREATE INDEX equivalente a una entrada de INDEXES"""
+    sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"
+    return f"{sql} WHERE {where}" if where else sql
+
+
+def _plan_summary(node: Dict[str, Any]) -> List[str]:
+    """Aplana el árbol del plan en una lista 'Tipo de nodo (índice)'"""
+    label = node["Node Type"]
+    if node.get("Index Name"):
+        label += f" ({node['Index Name']})"
+    nodes = [label]
+    for child in node.get("Plans", []):
+        nodes.extend(_plan_summary(child))
+    return nodes
+
+
+def explain_all(conn) -> Dict[str, Dict[str, Any]]:
+    """Ejecuta EXPLAIN (ANALYZE, BUFFERS) de cada consulta y resume el plan"""
+    results = {}
+    for label, sql in QUERIES:
+        raw = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+        plan = raw[0] if isinstance(raw, list) else json.loads(raw)[0]
+        results[label] = {
+            "plan": _plan_summary(plan["Plan"]),
+            "execution_ms": round(plan["Execution Time"], 3),
+            "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks", 0),
+            "shared_read_blocks": plan["Plan"].get("Shared Read Blocks", 0),
+        }
+    return results
+
+
+def run(scale: int, keep: bool) -> Dict[str, Any]:
+    """Prepara el esquema, mide sin y con índices y devuelve el informe"""
+    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""), echo=False)
+    if engine.dialect.name != "postgresql":
+        raise RuntimeError("El benchmark de índices requiere PostgreSQL (EXPLAIN ANALYZE en JSON)")
+
+    report: Dict[str, Any] = {"scale": scale, "rows": {}, "before": {}, "after": {}}
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {BENCH_SCHEMA}"))
+        try:
+            for ddl in SCHEMA_DDL:
+                conn.execute(text(ddl))
+            for table, sql in POPULATE_SQL.items():
+                rows = BASE_ROWS[table] * scale
+                start = time.perf_counter()
+                conn.execute(text(sql), {"n": rows})
+                report["rows"][table] = rows
+                logger.info(f"📁 {table}: {rows:,} filas en {time.perf_counter() - start:.2f}s")
+            conn.execute(text("ANALYZE"))
+
+            logger.info("🔍 Planes sin índices secundarios...")
+            report["before"] = explain_all(conn)
+
+            for name, table, columns, unique, where in load_index_specs():
+                conn.execute(text(index_ddl(name, table, columns, unique, where)))
+            conn.execute(text("ANALYZE"))
+
+            logger.info("🔍 Planes con los índices de la migración...")
+            report["after"] = explain_all(conn)
+        finally:
+            if not keep:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+    engine.dispose()
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Muestra la comparación de tiempos y nodos del plan por consulta"""
+    logger.info(f"\n📊 Resultados (scale={report['scale']})")
+    for label, _sql in QUERIES:
+        before, after = report["before"][label], report["after"][label]
+        speedup = before["execution_ms"] / after["execution_ms"] if after["execution_ms"] else float("inf")
+        logger.info(
+            f"   {label}: {before['execution_ms']:.3f} ms → {after['execution_ms']:.3f} ms (x{speedup:.1f})\n"
+            f"      antes:   {' > '.join(before['plan'])}\n"
+            f"      después: {' > '.join(after['plan'])}"
+        )
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Benchmark de planes de consulta con/sin índices")
+    parser.add_argument("--scale", type=int, default=100, help="Factor de escala del volumen de datos")
+    parser.add_argument("--output", type=Path, help="Fichero JSON donde guardar el informe")
+    parser.add_argument("--keep", action="store_true", help=f"No borrar el esquema {BENCH_SCHEMA} al terminar")
+    args = parser.parse_args()
+
+    try:
+        report = run(args.scale, args.keep)
+    except Exception as e:
+        logger.error(f"💥 Error en el benchmark: {e}")
+        return 1
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"💾 Informe guardado en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
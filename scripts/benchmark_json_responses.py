@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de listados: vía ORM + response_model frente a la
+vía rápida de filas como diccionarios serializadas con orjson.
+
+Puebla una base SQLite en memoria con los modelos reales, y para páginas de
+--page-size filas de stock y mensajes de chat mide:
+- antes: objetos ORM → validación Pydantic (from_attributes) → jsonable_encoder → json.dumps
+  (lo que hace FastAPI con response_model y JSONResponse)
+- después: CRUDBase.get_rows → FastJSONResponse (orjson)
+
+Uso:
+    python scripts/benchmark_json_responses.py --page-size 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+# Agregar el directorio padre al path para importar el backend
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from backend.core.logging import get_logger
+    from backend.core.responses import FastJSONResponse
+    from backend.crud import chat_message_crud, stock_crud
+    from backend.db.base import Base
+    from backend.models.chat_message_model import ChatMessage
+    from backend.models.stock_model import Stock
+    from backend.schemas.chat_message_schema import ChatMessageResponse
+    from backend.schemas.stock_schema import StockResponse
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+logger = get_logger("ainstalia.benchmark_json")
+
+# (nombre, CRUD, esquema de respuesta)
+TARGETS = [
+    ("stock", stock_crud, StockResponse),
+    ("chat_messages", chat_message_crud, ChatMessageResponse),
+]
+
+
+async def seed(db: AsyncSession, rows: int) -> None:
+    """Inserta `rows` registros de stock y de mensajes de chat"""
+    start = datetime(2024, 1, 1)
+    db.add_all(
+        Stock(sku=f"SKU-{i // 20:06d}", warehouse_id=i % 20, quantity=i % 200)
+        for i in range(rows)
+    )
+    db.add_all(
+        ChatMessage(
+            chat_id=f"CHAT-{i // 10}",
+            message_timestamp=start + timedelta(minutes=i),
+            sender=("cliente", "agente", "sistema")[i % 3],
+            message_text=f"Mensaje de prueba número {i} sobre la instalación del equipo",
+        )
+        for i in range(rows)
+    )
+    await db.commit()
+
+
+async def measure(fn: Callable[[], Awaitable[bytes]], repeat: int) -> Dict[str, float]:
+    """Ejecuta `fn` `repeat` veces y devuelve la mediana y el p95 en milisegundos"""
+    timings: List[float] = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(await fn())
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "bytes": size,
+    }
+
+
+async def run(page_size: int, repeat: int) -> Dict[str, Any]:
+    """Mide ambas vías para cada listado y devuelve el informe"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    report: Dict[str, Any] = {"page_size": page_size, "repeat": repeat, "results": {}}
+    async with session_factory() as db:
+        await seed(db, page_size)
+
+    for name, crud, schema in TARGETS:
+        adapter = TypeAdapter(List[schema])
+        fields = list(schema.model_fields)
+
+        async def before() -> bytes:
+            async with session_factory() as db:
+                items = await crud.get_multi(db=db, skip=0, limit=page_size)
+                validated = adapter.validate_python(items, from_attributes=True)
+                return JSONResponse(jsonable_encoder(validated)).body
+
+        async def after() -> bytes:
+            async with session_factory() as db:
+                rows, _ = await crud.get_rows(db, fields=fields, skip=0, limit=page_size)
+                return FastJSONResponse(rows).body
+
+        # Comprobar que ambas vías producen el mismo contenido
+        if json.loads(await before()) != json.loads(await after()):
+            logger.warning(f"⚠️ {name}: las dos vías no devuelven el mismo JSON")
+
+        report["results"][name] = {
+            "before": await measure(before, repeat),
+            "after": await measure(after, repeat),
+        }
+    await engine.dispose()
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Muestra la comparación por listado"""
+    logger.info(f"\n📊 Resultados (páginas de {report['page_size']} filas, {report['repeat']} repeticiones)")
+    for name, result in report["results"].items():
+        before, after = result["before"], result["after"]
+        speedup = before["median_ms"] / after["median_ms"] if after["median_ms"] else float("inf")
+        logger.info(
+            f"   {name}: {before['median_ms']:.2f} ms → {after['median_ms']:.2f} ms (x{speedup:.1f}) "
+            f"p95 {before['p95_ms']:.2f} → {after['p95_ms']:.2f} ms, {after['bytes']:,} bytes"
+        )
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--page-size", type=int, default=1000, help="Filas por página")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeticiones por medición")
+    parser.add_argument("--output", type=Path, help="Fichero JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(args.page_size, args.repeat))
+    except Exception as e:
+        logger.error(f"💥 Error en el benchmark: {e}")
+        return 1
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"💾 Informe guardado en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de recuperación del RAG y evaluación de recall.
+
+Trocea docs/knowledge_base/*.txt igual que RAGService (RecursiveCharacterTextSplitter
+con sus separadores) para cada tamaño de chunk (--chunk-sizes; solapamiento del 20 %),
+añade N chunks sintéticos de relleno (--synthetic-chunks) para simular el crecimiento
+del corpus, y con un embedder local determinista construye cada tipo de índice
+(--index-types):
+
+- flat: búsqueda exacta por producto escalar (numpy)
+- ivf: k-means esférico con listas invertidas, búsqueda en --nprobe listas (numpy)
+- faiss-flat / faiss-hnsw: índices de FAISS (el vector store del servicio es un
+  IndexFlat de FAISS); se omiten si faiss no está instalado
+
+Mide el tiempo de embedding y de construcción, la memoria (tamaño del índice y pico
+de asignaciones durante la construcción), la latencia por consulta (embedding +
+búsqueda, p50/p95/p99) y recall@k y MRR sobre un conjunto de preguntas etiquetadas:
+
+- docs: una pregunta por sección (encabezado markdown) de la base de conocimiento;
+  son relevantes los chunks que cubren al menos la mitad de la sección o del chunk,
+  lo que hace comparable el recall entre tamaños de chunk.
+- feedback: preguntas de data/knowledge_feedback.csv etiquetadas con la sección que
+  más términos (ponderados por IDF y normalizados por el tamaño de la sección)
+  comparte con la pregunta y su respuesta esperada; solo se usan las que comparten
+  al menos --min-shared-terms términos.
+
+recall@k es la fracción de preguntas con algún chunk relevante entre los k primeros.
+Los chunks sintéticos nunca son relevantes: miden cuánto degrada el ruido el recall.
+
+Uso:
+    python scripts/benchmark_rag.py --chunk-sizes 500,1000,2000 --synthetic-chunks 0,10000,100000
+    python scripts/benchmark_rag.py --index-types flat,ivf,faiss-hnsw --output rag.json
+"""
+import argparse
+import csv
+import json
+import math
+import random
+import re
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Agregar el directorio padre al path para importar el backend
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import numpy as np
+    from langchain_text_splitters.character import RecursiveCharacterTextSplitter
+
+    from backend.core.logging import get_logger
+    # backend.db.base registra todos los modelos: importarlo antes que rag_service
+    # evita el ciclo knowledge_feedback_model -> backend.db.base -> knowledge_feedback_model
+    import backend.db.base  # noqa
+    from backend.services.rag_service import CHUNK_OVERLAP, CHUNK_SIZE, TEXT_SEPARATORS
+    from local_embeddings import HashingEmbedder
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+logger = get_logger("ainstalia.benchmark_rag")
+
+ROOT = Path(__file__).parent.parent
+KNOWLEDGE_DIR = ROOT / "docs" / "knowledge_base"
+FEEDBACK_CSV = ROOT / "data" / "knowledge_feedback.csv"
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*$", re.M)
+MIN_SECTION_CHARS = 200
+
+
+@dataclass
+class Chunk:
+    text: str
+    source: Optional[str] = None  # None en los chunks sintéticos
+    start: int = 0
+
+
+@dataclass
+class Section:
+    source: str
+    heading: str
+    start: int
+    end: int
+
+
+@dataclass
+class Question:
+    text: str
+    kind: str  # docs | feedback
+    section: Section
+
+
+# ----------------------------------------------------------------------
+# Corpus y preguntas etiquetadas
+# ----------------------------------------------------------------------
+
+def load_documents() -> Dict[str, str]:
+    """Documentos de la base de conocimiento por nombre de fichero"""
+    documents = {path.name: path.read_text(encoding="utf-8") for path in sorted(KNOWLEDGE_DIR.glob("*.txt"))}
+    if not documents:
+        raise RuntimeError(f"No hay documentos .txt en {KNOWLEDGE_DIR}")
+    return documents
+
+
+def split_sections(documents: Dict[str, str]) -> List[Section]:
+    """Secciones (de un encabezado al siguiente) con cuerpo suficiente para preguntar por ellas"""
+    sections = []
+    for name, text in documents.items():
+        headings = list(HEADING.finditer(text))
+        for current, following in zip(headings, headings[1:] + [None]):
+            end = following.start() if following else len(text)
+            if len(current.group(1)) > 1 and end - current.end() >= MIN_SECTION_CHARS:
+                sections.append(Section(name, current.group(2), current.start(), end))
+    return sections
+
+
+def clean_heading(heading: str) -> str:
+    """Encabezado sin numeración, paréntesis ni marcas markdown"""
+    heading = re.sub(r"\(.*?\)|[*_`#]", "", heading)
+    heading = re.sub(r"^\s*[\dIVX]+[.)]\s*", "", heading)
+    return heading.strip(" :-").lower()
+
+
+def label_feedback(sections: List[Section], documents: Dict[str, str], min_shared_terms: int) -> List[Question]:
+    """Etiqueta cada pregunta de feedback con la sección con la que más términos (IDF) comparte"""
+    section_terms = [set(HashingEmbedder.tokens(documents[s.source][s.start:s.end])) for s in sections]
+    document_frequency = Counter(term for terms in section_terms for term in terms)
+    idf = {term: math.log(len(sections) / count) for term, count in document_frequency.items()}
+
+    questions = []
+    with open(FEEDBACK_CSV, encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle, skipinitialspace=True):
+            terms = set(HashingEmbedder.tokens(f"{row['question']} {row['expected_answer']}"))
+            # Normalizado por el tamaño de la sección para no favorecer siempre las más largas
+            scored = [
+                (sum(idf[term] for term in shared) / math.sqrt(len(section_term_set)), len(shared), section)
+                for section, section_term_set in zip(sections, section_terms)
+                for shared in [terms & section_term_set]
+            ]
+            _, shared, section = max(scored, key=lambda item: item[0])
+            if shared >= min_shared_terms:
+                questions.append(Question(row["question"], "feedback", section))
+    return questions
+
+
+def build_questions(documents: Dict[str, str], min_shared_terms: int) -> List[Question]:
+    """Preguntas de las secciones de la documentación y del feedback de usuarios"""
+    sections = split_sections(documents)
+    questions = [
+        Question(f"¿Qué indica la documentación sobre {clean_heading(section.heading)}?", "docs", section)
+        for section in sections if clean_heading(section.heading)
+    ]
+    return questions + label_feedback(sections, documents, min_shared_terms)
+
+
+def chunk_documents(documents: Dict[str, str], chunk_size: int) -> List[Chunk]:
+    """Trocea los documentos como RAGService, conservando la posición de cada chunk"""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_size * CHUNK_OVERLAP // CHUNK_SIZE,
+        length_function=len,
+        separators=TEXT_SEPARATORS,
+        add_start_index=True,
+    )
+    chunks = []
+    for name, text in documents.items():
+        for document in splitter.create_documents([text]):
+            chunks.append(Chunk(document.page_content, name, document.metadata["start_index"]))
+    return chunks
+
+
+def synthetic_chunks(documents: Dict[str, str], count: int, chunk_size: int, seed: int) -> List[Chunk]:
+    """
+    Chunks de relleno con el vocabulario del corpus: frases reales barajadas con
+    modelos y SKU inventados (vecinos difíciles, nunca relevantes).
+    """
+    rng = random.Random(seed)
+    sentences = [s.strip() for text in documents.values() for s in re.split(r"(?<=[.!?])\s+|\n+", text) if len(s.strip()) > 30]
+    chunks = []
+    for _ in range(count):
+        parts, size = [], 0
+        while size < chunk_size * 0.8:
+            sentence = rng.choice(sentences)
+            sentence = re.sub(r"AC\d{6}", lambda _: f"AC{rng.randint(0, 999999):06d}", sentence)
+            parts.append(sentence)
+            size += len(sentence) + 1
+        chunks.append(Chunk(" ".join(parts)))
+    return chunks
+
+
+def is_relevant(chunk: Chunk, section: Section) -> bool:
+    """El chunk cubre al menos la mitad de la sección o la mitad del chunk está en la sección"""
+    if chunk.source != section.source:
+        return False
+    overlap = min(chunk.start + len(chunk.text), section.end) - max(chunk.start, section.start)
+    return overlap >= 0.5 * min(len(chunk.text), section.end - section.start)
+
+
+# ----------------------------------------------------------------------
+# Índices
+# ----------------------------------------------------------------------
+
+class FlatIndex:
+    """Búsqueda exacta por producto escalar (vectores normalizados)"""
+
+    def build(self, vectors: np.ndarray) -> None:
+        self.vectors = vectors
+
+    def search(self, query: np.ndarray, k: int) -> np.ndarray:
+        scores = self.vectors @ query
+        top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+        return top[np.argsort(-scores[top])]
+
+    def nbytes(self) -> int:
+        return self.vectors.nbytes
+
+
+class IVFIndex(FlatIndex):
+    """K-means esférico con listas invertidas; busca en las `nprobe` listas más cercanas"""
+
+    def __init__(self, nprobe: int, seed: int, iterations: int = 10):
+        self.nprobe = nprobe
+        self.seed = seed
+        self.iterations = iterations
+
+    def build(self, vectors: np.ndarray) -> None:
+        self.vectors = vectors
+        rng = np.random.default_rng(self.seed)
+        nlist = max(1, round(math.sqrt(len(vectors))))
+        # Entrenamiento sobre una muestra (~50 vectores por lista), asignación de todos después
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), 50 * nlist), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(self.iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1)
+        self.centroids = centroids
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(nlist)]
+
+    def search(self, query: np.ndarray, k: int) -> np.ndarray:
+        probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        candidates = np.concatenate([self.lists[probe] for probe in probes])
+        if not len(candidates):
+            return candidates
+        scores = self.vectors[candidates] @ query
+        top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+        return candidates[top[np.argsort(-scores[top])]]
+
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + self.centroids.nbytes + sum(ids.nbytes for ids in self.lists)
+
+
+class FaissIndex:
+    """Índice de FAISS por producto escalar: exacto (flat) o HNSW"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def build(self, vectors: np.ndarray) -> None:
+        dimensions = vectors.shape[1]
+        if self.kind == "hnsw":
+            self.index = faiss.IndexHNSWFlat(dimensions, 32, faiss.METRIC_INNER_PRODUCT)
+        else:
+            self.index = faiss.IndexFlatIP(dimensions)
+        self.index.add(vectors)
+
+    def search(self, query: np.ndarray, k: int) -> np.ndarray:
+        _, ids = self.index.search(query.reshape(1, -1), k)
+        return ids[0][ids[0] >= 0]
+
+    def nbytes(self) -> int:
+        return int(faiss.serialize_index(self.index).nbytes)
+
+
+def make_index(index_type: str, nprobe: int, seed: int):
+    """Instancia el índice pedido (None si necesita faiss y no está instalado)"""
+    if index_type == "flat":
+        return FlatIndex()
+    if index_type == "ivf":
+        return IVFIndex(nprobe, seed)
+    if index_type in ("faiss-flat", "faiss-hnsw"):
+        return FaissIndex(index_type.split("-")[1]) if faiss is not None else None
+    raise ValueError(f"Tipo de índice desconocido: {index_type}")
+
+
+# ----------------------------------------------------------------------
+# Medición
+# ----------------------------------------------------------------------
+
+def latency_summary(values_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 (rango más cercano) y media en milisegundos"""
+    values = sorted(values_ms)
+    summary = {f"p{pct}": round(values[max(1, math.ceil(pct / 100 * len(values))) - 1], 4) for pct in (50, 95, 99)}
+    summary["mean"] = round(statistics.fmean(values), 4)
+    return summary
+
+
+def evaluate(
+    index: Any, embedder: HashingEmbedder, chunks: List[Chunk], questions: List[Question], ks: Sequence[int], repeat: int
+) -> Dict[str, Any]:
+    """Latencias por consulta y recall@k / MRR por tipo de pregunta"""
+    top_k = max(ks)
+    query_ms, search_ms = [], []
+    hits: Dict[str, Dict[int, int]] = {}
+    reciprocal_ranks: Dict[str, List[float]] = {}
+    for question in questions:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            vector = embedder.embed(question.text)
+            embedded = time.perf_counter()
+            ids = index.search(vector, top_k)
+            done = time.perf_counter()
+            query_ms.append((done - start) * 1000)
+            search_ms.append((done - embedded) * 1000)
+        rank = next((position for position, chunk_id in enumerate(ids, start=1)
+                     if is_relevant(chunks[chunk_id], question.section)), None)
+        for kind in (question.kind, "all"):
+            kind_hits = hits.setdefault(kind, {k: 0 for k in ks})
+            for k in ks:
+                kind_hits[k] += rank is not None and rank <= k
+            reciprocal_ranks.setdefault(kind, []).append(1 / rank if rank else 0.0)
+
+    return {
+        "query_latency_ms": latency_summary(query_ms),
+        "search_latency_ms": latency_summary(search_ms),
+        "recall_at_k": {
+            kind: {str(k): round(count / len(reciprocal_ranks[kind]), 4) for k, count in kind_hits.items()}
+            for kind, kind_hits in hits.items()
+        },
+        "mrr": {kind: round(statistics.fmean(ranks), 4) for kind, ranks in reciprocal_ranks.items()},
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Construye y evalúa cada combinación de tamaño de chunk, corpus e índice"""
+    documents = load_documents()
+    questions = build_questions(documents, args.min_shared_terms)
+    counts = Counter(question.kind for question in questions)
+    logger.info(f"📝 {len(questions)} preguntas etiquetadas ({', '.join(f'{k}={v}' for k, v in sorted(counts.items()))})")
+
+    ks = [int(k) for k in args.k.split(",")]
+    embedder = HashingEmbedder(args.dimensions)
+    report: Dict[str, Any] = {
+        "documents": len(documents),
+        "questions": dict(counts),
+        "dimensions": args.dimensions,
+        "faiss_available": faiss is not None,
+        "results": [],
+    }
+    for chunk_size in [int(size) for size in args.chunk_sizes.split(",")]:
+        real = chunk_documents(documents, chunk_size)
+        for synthetic_count in [int(count) for count in args.synthetic_chunks.split(",")]:
+            chunks = real + synthetic_chunks(documents, synthetic_count, chunk_size, args.seed)
+            start = time.perf_counter()
+            vectors = embedder.embed_many([chunk.text for chunk in chunks])
+            embed_seconds = time.perf_counter() - start
+            logger.info(f"📚 chunk={chunk_size} corpus={len(chunks):,} ({len(real)} reales) embebido en {embed_seconds:.1f}s")
+
+            for index_type in args.index_types.split(","):
+                index = make_index(index_type, args.nprobe, args.seed)
+                if index is None:
+                    logger.warning(f"⚠️ {index_type} omitido: faiss no está instalado")
+                    continue
+                tracemalloc.start()
+                start = time.perf_counter()
+                index.build(vectors)
+                build_seconds = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                result = {
+                    "chunk_size": chunk_size,
+                    "real_chunks": len(real),
+                    "synthetic_chunks": synthetic_count,
+                    "index_type": index_type,
+                    "embed_seconds": round(embed_seconds, 3),
+                    "build_seconds": round(build_seconds, 3),
+                    "index_bytes": index.nbytes(),
+                    "build_peak_bytes": peak,
+                    **evaluate(index, embedder, chunks, questions, ks, args.repeat),
+                }
+                report["results"].append(result)
+                logger.info(
+                    f"   {index_type:<10} build {build_seconds * 1000:8.1f} ms  "
+                    f"p95 {result['query_latency_ms']['p95']:.3f} ms  "
+                    f"recall@{ks[-1]} {result['recall_at_k']['all'][str(ks[-1])]:.2f}"
+                )
+    # ru_maxrss: KiB en Linux
+    report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Tabla resumen por tamaño de chunk, corpus e índice"""
+    logger.info(f"\n📊 Resultados ({report['documents']} documentos, preguntas {report['questions']})")
+    for result in report["results"]:
+        recall = result["recall_at_k"]["all"]
+        logger.info(
+            f"   chunk={result['chunk_size']:<5} corpus={result['real_chunks'] + result['synthetic_chunks']:<8,} "
+            f"{result['index_type']:<10} build {result['build_seconds']:7.3f}s  "
+            f"{result['index_bytes'] / 1e6:8.1f} MB  p50 {result['query_latency_ms']['p50']:.3f} ms  "
+            f"p99 {result['query_latency_ms']['p99']:.3f} ms  "
+            f"recall {' '.join(f'@{k}={v:.2f}' for k, v in recall.items())}  MRR {result['mrr']['all']:.3f}"
+        )
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark de recuperación del RAG")
+    parser.add_argument("--chunk-sizes", default=f"500,{CHUNK_SIZE},2000", help="Tamaños de chunk (caracteres)")
+    parser.add_argument("--synthetic-chunks", default="0,10000", help="Chunks sintéticos añadidos al corpus")
+    parser.add_argument("--index-types", default="flat,ivf,faiss-flat,faiss-hnsw", help="Tipos de índice")
+    parser.add_argument("--k", default="1,3,5,10", help="Valores de k para recall@k")
+    parser.add_argument("--nprobe", type=int, default=8, help="Listas exploradas por consulta (ivf)")
+    parser.add_argument("--dimensions", type=int, default=384, help="Dimensiones del embedder local")
+    parser.add_argument("--min-shared-terms", type=int, default=4, help="Términos mínimos para etiquetar una pregunta de feedback")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada consulta para la latencia")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del corpus sintético y de k-means")
+    parser.add_argument("--output", type=Path, help="Fichero JSON donde guardar el informe")
+    args = parser.parse_args()
+
+    try:
+        report = run(args)
+    except Exception as e:
+        logger.error(f"💥 Error en el benchmark: {e}")
+        return 1
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"💾 Informe guardado en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Generador de datos sintéticos para pruebas de escala.
+
+Produce los mismos CSV que data/ (mismas columnas y orden que los \\copy de
+data/create_tables.sql, que se leen del propio esquema) con integridad
+referencial completa y a cualquier factor de escala:
+
+- clientes, técnicos y feedback crecen linealmente con la escala; el catálogo
+  de productos y los almacenes, con su raíz cuadrada (el catálogo no crece al
+  mismo ritmo que la base de clientes);
+- equipos, intervenciones, contratos, pedidos, líneas, sesiones y mensajes se
+  generan por cliente con distribuciones parecidas a las de data/: pocos
+  clientes concentran muchos pedidos, los productos populares se repiten más,
+  mantenimiento anual tras la instalación, estados y tipos con las mismas
+  proporciones, textos en español.
+
+Las claves SERIAL no se escriben: son la posición del registro en el CSV, como
+al cargarlos con DataLoader (que vacía con RESTART IDENTITY). Todo se escribe en
+streaming: la memoria no depende de la escala.
+
+Uso:
+    python scripts/generate_synthetic_data.py --scale 100 --output-dir data/synthetic/x100
+    python scripts/load_data.py --data-dir data/synthetic/x100
+"""
+import argparse
+import bisect
+import csv
+import itertools
+import json
+import math
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Agregar el directorio padre al path para importar el backend
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from backend.core.logging import get_logger
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+logger = get_logger("ainstalia.synthetic_data")
+
+SCHEMA_PATH = Path(__file__).parent.parent / "data" / "create_tables.sql"
+
+# Filas de data/ a escala 1
+BASE_ROWS = {"clients": 46, "products": 150, "technicians": 10, "warehouses": 3, "knowledge_feedback": 62}
+
+# Medias por entidad padre observadas en data/
+EQUIPMENT_PER_CLIENT = 8.2
+CONTRACTS_PER_CLIENT = 2.5
+ITEMS_PER_ORDER = 3.3
+MESSAGES_PER_SESSION = 5.1
+SESSION_PROBABILITY = 0.875
+INSTALLATION_RECORDED = 0.28
+MAINTENANCE_RECORDED = 0.35
+REPAIRS_PER_EQUIPMENT = 0.36
+# Pedidos por cliente: cola larga (Pareto), media ≈ 2.6
+ORDERS_PARETO_ALPHA = 1.45
+
+# Pesos (valor, peso) tomados de data/. Los tipos de intervención salen del
+# modelo de visitas (instalación, revisión anual, averías, retirada).
+EQUIPMENT_STATUSES = [("activo", 372), ("retirado", 4), ("en_mantenimiento", 1), ("en_servicio_tecnico", 1)]
+ORDER_STATUSES = [("completado", 88), ("en proceso", 16), ("pendiente", 11), ("cancelado", 5)]
+CONTRACT_TYPES = [
+    ("mantenimiento preventivo", 45), ("servicio integral", 38), ("garantia extendida", 25),
+    ("instalacion", 6), ("mantenimiento correctivo", 2)
+]
+FEEDBACK_USER_TYPES = [("cliente", 24), ("tecnico", 22), ("administrador", 16)]
+FEEDBACK_STATUSES = [("pendiente", 43), ("revisado", 19)]
+
+FIRST_NAMES = [
+    "Ana", "Luis", "Sofía", "Carlos", "María", "Javier", "Elena", "Pedro", "Laura", "Diego", "Isabel",
+    "Francisco", "Carmen", "Manuel", "Paula", "Jorge", "Natalia", "Sergio", "Andrea", "Pablo", "Lucía",
+    "Alejandro", "Marta", "David", "Cristina", "Raúl", "Beatriz", "Alberto", "Silvia", "Fernando", "Rocío",
+    "Antonio", "Irene", "Miguel", "Nuria", "Álvaro", "Patricia", "Rubén", "Eva", "Óscar", "Teresa", "Iván",
+]
+LAST_NAMES = [
+    "Torres", "Giménez", "Ramos", "Navarro", "Vargas", "Castillo", "Ruiz", "Moya", "Vidal", "Herrera",
+    "Domínguez", "León", "Santos", "Castro", "Gil", "Marín", "Peña", "Cruz", "Bravo", "García", "López",
+    "Martínez", "Sánchez", "Pérez", "Gómez", "Fernández", "Díaz", "Moreno", "Muñoz", "Álvarez", "Romero",
+    "Alonso", "Gutiérrez", "Serrano", "Blanco", "Molina", "Morales", "Ortega", "Delgado", "Rubio", "Medina",
+]
+CITIES = [
+    "Madrid", "Barcelona", "Valencia", "Sevilla", "Zaragoza", "Málaga", "Murcia", "Palma", "Bilbao",
+    "Alicante", "Córdoba", "Valladolid", "Vigo", "Gijón", "Granada", "A Coruña", "Vitoria", "Santander",
+    "Pamplona", "Salamanca", "Toledo", "Burgos", "Cádiz", "Almería", "Logroño", "Oviedo",
+]
+STREETS = [
+    "Calle Mayor", "Av. de la Libertad", "Plaza de España", "Paseo del Prado", "Gran Vía", "Calle del Sol",
+    "Av. de la Constitución", "Calle Real", "Rambla de Cataluña", "Calle Larios", "Paseo de Gracia",
+    "Av. de Andalucía", "Calle San Fernando", "Calle Colón", "Av. Reyes Católicos", "Calle Alcalá",
+]
+EMAIL_DOMAINS = ["clienteempresa.com", "correo.es", "empresa.es", "instalaciones.com", "hogar.es"]
+ZONES = ["Norte", "Sur", "Este", "Oeste", "Centro"]
+WAREHOUSE_KINDS = ["Principal", "Secundario", "Logístico", "Regional", "de Recambios"]
+
+# Catálogo: (nombre, descripción, rango de precio, especificaciones)
+PRODUCT_FAMILIES = [
+    ("Sistema Split AC {btu} BTU", "Sistema split eficiente para climatizar estancias de hasta {area} m².",
+     (450, 1600), lambda r: {"BTU": r.choice([9000, 12000, 18000, 24000]), "SEER": round(r.uniform(15, 24), 1),
+                             "Refrigerante": r.choice(["R32", "R410a"])}),
+    ("Bomba de Calor Aerotérmica {kw} kW", "Bomba de calor para calefacción y ACS con alta eficiencia estacional.",
+     (3500, 9500), lambda r: {"Potencia_kW": r.choice([6, 8, 11, 14]), "SCOP": round(r.uniform(3.8, 5.2), 1)}),
+    ("Caldera de Condensación {kw} kW", "Caldera de gas de condensación con modulación y bajo NOx.",
+     (1200, 3200), lambda r: {"Potencia_kW": r.choice([24, 28, 35]), "Eficiencia_pct": round(r.uniform(92, 98), 1)}),
+    ("Termostato Inteligente {modelo}", "Termostato wifi programable con control desde la app móvil.",
+     (90, 320), lambda r: {"Conectividad": r.choice(["Wi-Fi", "Zigbee"]), "Programable": True}),
+    ("Filtro {tipo} para Unidad Interior", "Filtro de recambio para mejorar la calidad del aire.",
+     (8, 60), lambda r: {"Tipo": r.choice(["HEPA", "Carbón Activado", "Plisado"]), "Vida_util_meses": r.choice([3, 6, 12])}),
+    ("Panel Solar Monocristalino {w}W", "Panel fotovoltaico de alto rendimiento para autoconsumo.",
+     (150, 420), lambda r: {"Potencia_W": r.choice([400, 450, 500]), "Eficiencia_pct": round(r.uniform(20, 23), 1)}),
+    ("Termo Eléctrico {litros} L", "Acumulador eléctrico de agua caliente sanitaria.",
+     (180, 650), lambda r: {"Capacidad_L": r.choice([50, 80, 100, 150]), "Potencia_kW": r.choice([1.5, 2.0])}),
+    ("Radiador de Panel {dim}", "Radiador de acero para circuitos de agua caliente.",
+     (70, 260), lambda r: {"Material": "Acero", "Potencia_W": r.choice([800, 1200, 1600])}),
+    ("Válvula {tipo}", "Válvula para instalaciones de calefacción y fontanería.",
+     (10, 140), lambda r: {"Diametro_mm": r.choice([15, 22, 28]), "Presion_bar": r.choice([3, 6, 10])}),
+    ("Recuperador de Calor {caudal} m³/h", "Ventilación mecánica con recuperación de calor de alta eficiencia.",
+     (900, 3800), lambda r: {"Caudal_m3h": r.choice([150, 300, 450]), "Eficiencia_pct": round(r.uniform(80, 92), 1)}),
+]
+PRODUCT_VARIANTS = {
+    "btu": ["9000", "12000", "18000", "24000"], "kw": ["6", "8", "11", "14", "24", "28", "35"],
+    "modelo": ["Pro", "Eco", "Plus", "Max"], "tipo": ["HEPA", "de Carbón", "Termostática", "de Seguridad", "Plisado"],
+    "w": ["400", "450", "500"], "litros": ["50", "80", "100", "150"], "dim": ["600x800", "600x1000", "600x1200"],
+    "caudal": ["150", "300", "450"], "area": ["20", "30", "45", "60"],
+}
+
+INTERVENTION_RESULTS = {
+    "instalacion": [
+        "Instalación inicial del equipo {sku}. Puesta en marcha y pruebas OK.",
+        "Montaje y conexionado de {sku}. Verificadas conexiones eléctricas y frigoríficas.",
+    ],
+    "mantenimiento": [
+        "Mantenimiento preventivo de {sku}: limpieza de filtros y revisión de presiones. Todo correcto.",
+        "Revisión anual de {sku}. Ajuste de parámetros y comprobación de consumo.",
+        "Mantenimiento programado de {sku}. Sustituido filtro y verificado funcionamiento.",
+    ],
+    "reparacion": [
+        "Reparación de {sku}: sustituida placa electrónica por fallo intermitente.",
+        "Avería en {sku} por fuga de refrigerante. Localizada, reparada y recargado el circuito.",
+        "Cambio de sensor de temperatura defectuoso en {sku}. Equipo operativo.",
+    ],
+    "retirada": ["Retirada del equipo {sku} por fin de vida útil. Gestionado el reciclaje."],
+}
+CONTRACT_TERMS = {
+    "mantenimiento preventivo": "Contrato de mantenimiento preventivo con revisión anual.",
+    "servicio integral": "Contrato que cubre mantenimiento preventivo y correctivo.",
+    "garantia extendida": "Extensión de garantía del equipo instalado.",
+    "instalacion": "Contrato relacionado con la instalación de un equipo.",
+    "mantenimiento correctivo": "Contrato de reparaciones con tiempo de respuesta garantizado.",
+}
+CHAT_TOPICS = [
+    "Consulta Producto y Pedido", "Presupuesto Instalación", "Duda Accesorios", "Pedido Equipo",
+    "Consulta Mantenimiento", "Información Bomba Calor", "Incidencia Equipo", "Estado del Pedido",
+]
+CLIENT_MESSAGES = [
+    "Hola, estoy interesado en el {name} ({sku}). ¿Tenéis disponibilidad?",
+    "¿El {sku} es adecuado para un salón de unos {area} m²?",
+    "Quería saber el plazo de entrega del pedido {order}.",
+    "¿Podéis incluir la instalación en el presupuesto?",
+    "Perfecto, adelante con el pedido entonces.",
+    "¿Qué mantenimiento necesita el {sku}?",
+    "Recibido, muchas gracias.",
+]
+AGENT_MESSAGES = [
+    "¡Hola! Claro, el {sku} está disponible en almacén.",
+    "Sí, el {name} es adecuado para ese tamaño.",
+    "Te he generado el pedido {order}. Puedes revisarlo en tu área de cliente.",
+    "La instalación la realiza uno de nuestros técnicos en un plazo de 3 a 5 días.",
+    "Recomendamos una revisión anual para mantener la garantía.",
+    "¿Necesitas algo más?",
+]
+FEEDBACK_QUESTIONS = [
+    ("¿Cada cuánto hay que cambiar el filtro del {sku}?", "Se recomienda cada {months} meses, o antes si el indicador de filtro se activa."),
+    ("Error E{code} en el equipo {sku}, ¿qué significa?", "Suele indicar un fallo de sensor; reiniciar el equipo y, si persiste, solicitar visita técnica."),
+    ("¿El {sku} es compatible con el termostato inteligente?", "Sí, mediante el módulo de control wifi del fabricante."),
+    ("¿Qué presión debe marcar el circuito del {sku}?", "Entre 1 y 1,5 bar en frío; por debajo de 1 bar hay que rellenar el circuito."),
+]
+
+START_DATE = date(2018, 1, 1)
+END_DATE = date(2025, 12, 31)
+
+
+def read_schema(path: Path = SCHEMA_PATH) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Lee del esquema las columnas de cada CSV (las de su \\copy, o todas salvo la
+    SERIAL si el \\copy no las enumera) y las tablas referenciadas por cada tabla.
+    """
+    sql = path.read_text(encoding="utf-8")
+    columns: Dict[str, List[str]] = {}
+    serial: Dict[str, List[str]] = {}
+    references: Dict[str, List[str]] = {}
+    for table, body in re.findall(r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);", sql, re.S):
+        columns[table], serial[table], references[table] = [], [], []
+        for line in body.splitlines():
+            match = re.match(r"\s*(\w+)\s+(\w+)", line)
+            if not match or match.group(1).upper() in ("PRIMARY", "UNIQUE", "CONSTRAINT"):
+                continue
+            name, column_type = match.groups()
+            (serial if column_type.upper() == "SERIAL" else columns)[table].append(name)
+            reference = re.search(r"REFERENCES (\w+)", line)
+            if reference:
+                references[table].append(reference.group(1))
+    for table, listed in re.findall(r"^\\copy (\w+)(?: \(([^)]*)\))? FROM", sql, re.M):
+        if listed:
+            columns[table] = [column.strip() for column in listed.split(",")]
+    return columns, references
+
+
+def weighted_picker(rng: random.Random, choices: Sequence[Tuple[Any, float]]):
+    """Selector de valores con pesos (búsqueda binaria sobre los pesos acumulados)"""
+    values = [value for value, _ in choices]
+    cumulative = list(itertools.accumulate(weight for _, weight in choices))
+    total = cumulative[-1]
+    return lambda: values[bisect.bisect_right(cumulative, rng.random() * total)]
+
+
+class SyntheticDataGenerator:
+    """Genera los CSV de data/ a un factor de escala dado, escribiendo en streaming"""
+
+    def __init__(self, scale: float, output_dir: Path, seed: int = 42):
+        self.scale = scale
+        self.output_dir = output_dir
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.columns, self.references = read_schema()
+        self.counts: Dict[str, int] = {table: 0 for table in self.columns}
+        self._writers: Dict[str, csv.DictWriter] = {}
+
+        root = {table: max(1, round(rows * scale)) for table, rows in BASE_ROWS.items()}
+        root["products"] = max(BASE_ROWS["products"], round(BASE_ROWS["products"] * math.sqrt(scale)))
+        root["warehouses"] = max(BASE_ROWS["warehouses"], round(BASE_ROWS["warehouses"] * math.sqrt(scale)))
+        self.root_rows = root
+
+        rng = self.rng
+        self.pick_equipment_status = weighted_picker(rng, EQUIPMENT_STATUSES)
+        self.pick_order_status = weighted_picker(rng, ORDER_STATUSES)
+        self.pick_contract_type = weighted_picker(rng, CONTRACT_TYPES)
+        self.pick_user_type = weighted_picker(rng, FEEDBACK_USER_TYPES)
+        self.pick_feedback_status = weighted_picker(rng, FEEDBACK_STATUSES)
+        # Popularidad de productos tipo Zipf: los primeros del catálogo se venden más
+        self.products: List[Tuple[str, str, float]] = []
+        self.pick_product = None
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+
+    def _poisson(self, mean: float) -> int:
+        """Muestra de Poisson (Knuth; las medias usadas son pequeñas)"""
+        limit, k, product = math.exp(-mean), 0, self.rng.random()
+        while product > limit:
+            k += 1
+            product *= self.rng.random()
+        return k
+
+    def _date(self, start: date = START_DATE, end: date = END_DATE) -> date:
+        return start + timedelta(days=self.rng.randint(0, max((end - start).days, 0)))
+
+    def _person(self) -> Tuple[str, str]:
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        return first, last
+
+    @staticmethod
+    def _slug(text: str) -> str:
+        table = str.maketrans("áéíóúüñÁÉÍÓÚÜÑ", "aeiouunAEIOUUN")
+        return re.sub(r"[^a-z0-9]+", ".", text.translate(table).lower()).strip(".")
+
+    def _phone(self) -> str:
+        return f"+34 6{self.rng.randint(10, 99)} {self.rng.randint(100, 999)} {self.rng.randint(100, 999)}"
+
+    def _write(self, table: str, row: Dict[str, Any]) -> int:
+        """Escribe una fila y devuelve su posición (la clave SERIAL que tendrá al cargarse)"""
+        self._writers[table].writerow(row)
+        self.counts[table] += 1
+        return self.counts[table]
+
+    # ------------------------------------------------------------------
+    # Tablas raíz
+    # ------------------------------------------------------------------
+
+    def _generate_products(self) -> None:
+        for index in range(1, self.root_rows["products"] + 1):
+            name_template, description, (low, high), spec = self.rng.choice(PRODUCT_FAMILIES)
+            variants = {key: self.rng.choice(values) for key, values in PRODUCT_VARIANTS.items()}
+            sku = f"AC{index:06d}"
+            # Precio log-uniforme dentro del rango de la familia
+            price = round(math.exp(self.rng.uniform(math.log(low), math.log(high))), 2)
+            name = name_template.format(**variants)
+            self._write("products", {
+                "sku": sku, "name": name, "description": description.format(**variants),
+                "price": f"{price:.2f}", "spec_json": json.dumps(spec(self.rng), ensure_ascii=False),
+            })
+            self.products.append((sku, name, price))
+        self.pick_product = weighted_picker(
+            self.rng, [(product, 1 / (rank ** 0.8)) for rank, product in enumerate(self.products, start=1)]
+        )
+
+    def _generate_warehouses(self) -> None:
+        for index in range(self.root_rows["warehouses"]):
+            city = CITIES[index % len(CITIES)]
+            kind = WAREHOUSE_KINDS[(index // len(CITIES)) % len(WAREHOUSE_KINDS)]
+            suffix = f" {index // (len(CITIES) * len(WAREHOUSE_KINDS)) + 1}" if index >= len(CITIES) * len(WAREHOUSE_KINDS) else ""
+            self._write("warehouses", {"name": f"Almacén {kind} {city}{suffix}"})
+
+    def _generate_stock(self) -> None:
+        """Cada producto está en unos pocos almacenes; ~5 % de las líneas agotadas"""
+        warehouses = self.counts["warehouses"]
+        for sku, _, price in self.products:
+            stocked = min(warehouses, 2 + self._poisson(1.5))
+            for warehouse_id in sorted(self.rng.sample(range(1, warehouses + 1), stocked)):
+                cheap = price < 100
+                quantity = 0 if self.rng.random() < 0.05 else int(self.rng.lognormvariate(3.5 if cheap else 2.3, 0.8))
+                self._write("stock", {"sku": sku, "warehouse_id": warehouse_id, "quantity": quantity})
+
+    def _generate_technicians(self) -> None:
+        cities = CITIES[:max(1, math.ceil(self.root_rows["technicians"] / 10))]
+        for index in range(1, self.root_rows["technicians"] + 1):
+            first, last = self._person()
+            zone = f"Zona {ZONES[index % len(ZONES)]}"
+            if len(cities) > 1:
+                zone = f"{zone} {cities[index % len(cities)]}"
+            self._write("technicians", {
+                "name": f"{first} {last}", "email": f"{self._slug(first)}.{self._slug(last)}.{index}@example.com",
+                "phone": self._phone(), "zone": zone,
+            })
+
+    def _generate_feedback(self) -> None:
+        for _ in range(self.root_rows["knowledge_feedback"]):
+            question, answer = self.rng.choice(FEEDBACK_QUESTIONS)
+            sku = self.pick_product()[0]
+            values = {"sku": sku, "code": self.rng.randint(1, 99), "months": self.rng.choice([3, 6, 12])}
+            self._write("knowledge_feedback", {
+                "question": question.format(**values), "expected_answer": answer.format(**values),
+                "user_type": self.pick_user_type(), "status": self.pick_feedback_status(),
+            })
+
+    # ------------------------------------------------------------------
+    # Datos por cliente
+    # ------------------------------------------------------------------
+
+    def _generate_client(self, index: int) -> None:
+        first, last = self._person()
+        client_id = self._write("clients", {
+            "name": f"{first} {last}",
+            "email": f"{self._slug(first)}.{self._slug(last)}.{index}@{self.rng.choice(EMAIL_DOMAINS)}",
+            "phone": self._phone(),
+            "address": f"{self.rng.choice(STREETS)} {self.rng.randint(1, 120)}, {self.rng.choice(CITIES)}",
+        })
+        for _ in range(max(1, self._poisson(EQUIPMENT_PER_CLIENT))):
+            self._generate_equipment(client_id)
+        for _ in range(self._poisson(CONTRACTS_PER_CLIENT)):
+            self._generate_contract(client_id)
+        orders = min(int(self.rng.paretovariate(ORDERS_PARETO_ALPHA)), 200)
+        for _ in range(orders):
+            self._generate_order(client_id)
+
+    def _generate_equipment(self, client_id: int) -> None:
+        sku, name, _ = self.pick_product()
+        install_date = self._date()
+        status = self.pick_equipment_status()
+        equipment_id = self._write("installed_equipment", {
+            "client_id": client_id, "sku": sku, "install_date": install_date.isoformat(), "status": status,
+            "config_json": json.dumps({
+                "ubicacion": self.rng.choice(["Salón", "Dormitorio", "Cocina", "Oficina", "Nave", "Cubierta"]),
+                "firmware": f"v{self.rng.randint(1, 4)}.{self.rng.randint(0, 9)}",
+            }, ensure_ascii=False),
+        })
+
+        # Instalación, mantenimiento anual (no siempre registrado) y averías aleatorias
+        visits: List[Tuple[date, str]] = []
+        if self.rng.random() < INSTALLATION_RECORDED:
+            visits.append((install_date, "instalacion"))
+        year = install_date + timedelta(days=365)
+        while year <= END_DATE:
+            if self.rng.random() < MAINTENANCE_RECORDED:
+                visits.append((year + timedelta(days=self.rng.randint(-20, 20)), "mantenimiento"))
+            year += timedelta(days=365)
+        for _ in range(self._poisson(REPAIRS_PER_EQUIPMENT)):
+            visits.append((self._date(install_date), "reparacion"))
+        if status == "retirado":
+            visits.append((self._date(install_date), "retirada"))
+
+        technicians = self.counts["technicians"]
+        for visit_date, visit_type in sorted(visits):
+            self._write("interventions", {
+                "technician_id": self.rng.randint(1, technicians), "client_id": client_id,
+                "equipment_id": equipment_id, "date": visit_date.isoformat(), "type": visit_type,
+                "result": self.rng.choice(INTERVENTION_RESULTS[visit_type]).format(sku=sku), "document_url": None,
+            })
+
+    def _generate_contract(self, client_id: int) -> None:
+        contract_type = self.pick_contract_type()
+        start = self._date()
+        end = start + timedelta(days=365 * self.rng.choice([1, 1, 2, 2, 3, 5]))
+        self._write("contracts", {
+            "client_id": client_id, "start_date": start.isoformat(), "end_date": end.isoformat(),
+            "type": contract_type, "terms": CONTRACT_TERMS[contract_type],
+        })
+
+    def _generate_order(self, client_id: int) -> None:
+        order_number = self.counts["orders"] + 1
+        order_id = f"ORD{order_number:07d}"
+        chat_id = f"CHAT{order_number + 1000:07d}" if self.rng.random() < SESSION_PROBABILITY else None
+
+        items = []
+        for _ in range(max(1, self._poisson(ITEMS_PER_ORDER))):
+            sku, name, price = self.pick_product()
+            quantity = 1 if price > 300 else self.rng.randint(1, 6)
+            items.append((sku, name, quantity, price))
+        total = sum(quantity * price for _, _, quantity, price in items)
+        self._write("orders", {
+            "order_id": order_id, "client_id": client_id, "chat_id": chat_id,
+            "total_amount": f"{total:.2f}", "status": self.pick_order_status(),
+        })
+        for sku, _, quantity, price in items:
+            self._write("order_items", {"order_id": order_id, "product_sku": sku, "quantity": quantity, "price": f"{price:.2f}"})
+
+        if chat_id:
+            self._generate_chat(chat_id, order_id, client_id, items[0])
+
+    def _generate_chat(self, chat_id: str, order_id: str, client_id: int, item: Tuple[str, str, int, float]) -> None:
+        sku, name, _, _ = item
+        start = datetime.combine(self._date(), datetime.min.time()) + timedelta(minutes=self.rng.randint(8 * 60, 20 * 60))
+        messages = []
+        timestamp = start
+        values = {"sku": sku, "name": name, "order": order_id, "area": self.rng.choice([15, 25, 40, 60])}
+        for position in range(max(2, self._poisson(MESSAGES_PER_SESSION))):
+            timestamp += timedelta(seconds=self.rng.randint(20, 600))
+            sender = "cliente" if position % 2 == 0 or self.rng.random() < 0.2 else "agente"
+            template = self.rng.choice(CLIENT_MESSAGES if sender == "cliente" else AGENT_MESSAGES)
+            messages.append((timestamp, sender, template.format(**values)))
+
+        self._write("chat_sessions", {
+            "chat_id": chat_id, "order_id": order_id, "client_id": client_id,
+            "start_timestamp": start.isoformat(sep=" "), "end_timestamp": (timestamp + timedelta(minutes=1)).isoformat(sep=" "),
+            "topic": self.rng.choice(CHAT_TOPICS),
+        })
+        for message_timestamp, sender, text in messages:
+            self._write("chat_messages", {
+                "chat_id": chat_id, "message_timestamp": message_timestamp.isoformat(sep=" "),
+                "sender": sender, "message_text": text,
+            })
+
+    # ------------------------------------------------------------------
+    # Generación
+    # ------------------------------------------------------------------
+
+    def generate(self) -> Dict[str, int]:
+        """Escribe todos los CSV y devuelve las filas por tabla"""
+        generated = [
+            "products", "warehouses", "stock", "technicians", "knowledge_feedback", "clients", "installed_equipment",
+            "interventions", "contracts", "orders", "order_items", "chat_sessions", "chat_messages",
+        ]
+        # Las tablas referenciadas por cada CSV deben generarse antes (o en la misma pasada por cliente)
+        for position, table in enumerate(generated):
+            missing = [parent for parent in self.references[table] if parent not in generated[:position + 1]]
+            if missing:
+                raise ValueError(f"{table} referencia tablas no generadas antes: {', '.join(missing)}")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            for table in generated:
+                handle = stack.enter_context(open(self.output_dir / f"{table}.csv", "w", encoding="utf-8", newline=""))
+                writer = csv.DictWriter(handle, fieldnames=self.columns[table], extrasaction="raise", quoting=csv.QUOTE_MINIMAL)
+                writer.writeheader()
+                self._writers[table] = writer
+
+            self._generate_products()
+            self._generate_warehouses()
+            self._generate_stock()
+            self._generate_technicians()
+            self._generate_feedback()
+            for index in range(1, self.root_rows["clients"] + 1):
+                self._generate_client(index)
+
+        skipped = sorted(set(self.columns) - set(generated))
+        if skipped:
+            logger.info(f"   Tablas del esquema sin CSV (no se generan): {', '.join(skipped)}")
+        counts = {table: self.counts[table] for table in generated}
+        (self.output_dir / "manifest.json").write_text(
+            json.dumps({"scale": self.scale, "seed": self.seed, "rows": counts}, indent=2), encoding="utf-8"
+        )
+        return counts
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos compatibles con DataLoader")
+    parser.add_argument("--scale", type=float, default=1, help="Factor de escala respecto a data/ (1, 100, 10000...)")
+    parser.add_argument("--output-dir", type=Path, help="Directorio de salida (por defecto data/synthetic/x<escala>)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (misma semilla y escala → mismos datos)")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or Path(__file__).parent.parent / "data" / "synthetic" / f"x{args.scale:g}"
+    logger.info(f"🧪 Generando datos sintéticos a escala x{args.scale:g} en {output_dir}")
+    start = time.perf_counter()
+    try:
+        counts = SyntheticDataGenerator(args.scale, output_dir, seed=args.seed).generate()
+    except Exception as e:
+        logger.error(f"💥 Error generando datos: {e}")
+        return 1
+
+    duration = time.perf_counter() - start
+    total = sum(counts.values())
+    for table, rows in counts.items():
+        logger.info(f"   {table}: {rows:,} registros")
+    logger.info(f"✅ {total:,} registros en {duration:.1f}s ({total / duration:,.0f} filas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Servidor local compatible con la API de OpenAI para pruebas de carga sin coste.
+
+Implementa /v1/chat/completions (con y sin streaming SSE), /v1/embeddings y
+/v1/models con el formato de OpenAI, de modo que AIService y RAGService funcionan
+contra él sin cambios poniendo OPENAI_BASE_URL=http://localhost:8100/v1. Las
+peticiones recorren el camino HTTP real (cliente openai, reintentos, pool de
+conexiones), a diferencia de los dobles en proceso.
+
+- Respuestas deterministas: al agente SQL le devuelve el SQL enlatado de la
+  pregunta (CANNED_SQL, o --answers) como respuesta final ReAct; a los prompts de
+  RAG, una respuesta fija; los embeddings son los de HashingEmbedder.
+- Latencia configurable: hasta el primer token (--ttft, distribución
+  fixed|normal|lognormal|exponential:media_ms[:dispersión_ms]), generación a
+  --tokens-per-second y embeddings (--embedding-latency).
+- Fallos inyectados: errores 500 (--error-rate), 429 aleatorios (--rate-limit-rate)
+  y 429 por saturación cuando hay más de --max-concurrency peticiones en curso.
+- GET /stats: peticiones, fallos inyectados y concurrencia máxima observada.
+
+Uso:
+    python scripts/llm_standin_server.py --port 8100 --ttft lognormal:600:250 --tokens-per-second 40
+    OPENAI_BASE_URL=http://localhost:8100/v1 OPENAI_API_KEY=local make dev
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+# Agregar el directorio padre al path para importar el backend
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import numpy as np
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    from backend.core.logging import get_logger
+    from local_embeddings import HashingEmbedder
+except ImportError as e:
+    print(f"❌ Error importando dependencias: {e}")
+    print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
+    sys.exit(1)
+
+logger = get_logger("ainstalia.llm_standin")
+
+# Preguntas en lenguaje natural y el SQL que "genera" el modelo para ellas
+CANNED_SQL: List[Tuple[str, str]] = [
+    ("¿Cuántos clientes tenemos en total?", "SELECT COUNT(*) AS total FROM clients"),
+    ("¿Cuáles son las últimas 5 intervenciones?", "SELECT * FROM interventions ORDER BY date DESC LIMIT 5"),
+    ("¿Cuánto stock tenemos por almacén?", "SELECT warehouse_id, SUM(quantity) AS unidades FROM stock GROUP BY warehouse_id"),
+    ("¿Cuántas órdenes están pendientes?", "SELECT COUNT(*) AS pendientes FROM orders WHERE status = 'pendiente'"),
+    ("¿Cuáles son los productos más vendidos?",
+     "SELECT product_sku, SUM(quantity) AS unidades FROM order_items GROUP BY product_sku ORDER BY unidades DESC LIMIT 10"),
+]
+CANNED_RAG_ANSWER = (
+    "Según la documentación técnica de AInstalia, revise el procedimiento indicado en el manual del equipo. "
+    "Si el problema persiste tras las comprobaciones básicas, solicite la visita de un técnico."
+)
+CANNED_CHAT_ANSWER = "Hola, ¿en qué puedo ayudarte?"
+# Marcas de los prompts de AIService (agente SQL) y RAGService
+SQL_PROMPT_MARKERS = ("sql_db_query", "SQL", "CONSULTA:")
+RAG_PROMPT_MARKER = "CONTEXTO RELEVANTE"
+LATENCY_KINDS = ("fixed", "normal", "lognormal", "exponential")
+
+
+@dataclass
+class LatencyDistribution:
+    """Distribución de latencias en milisegundos"""
+    kind: str = "fixed"
+    mean_ms: float = 0.0
+    spread_ms: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """'lognormal:600:250' → LatencyDistribution('lognormal', 600, 250)"""
+        kind, *values = spec.split(":")
+        if kind not in LATENCY_KINDS:
+            raise argparse.ArgumentTypeError(f"Distribución desconocida: {kind} (usa {', '.join(LATENCY_KINDS)})")
+        numbers = [float(value) for value in values] + [0.0, 0.0]
+        return cls(kind, numbers[0], numbers[1])
+
+    def sample(self, rng: random.Random) -> float:
+        """Latencia en segundos"""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.kind == "normal":
+            value = rng.gauss(self.mean_ms, self.spread_ms)
+        elif self.kind == "lognormal":
+            # Parámetros de la normal subyacente para la media y desviación pedidas
+            sigma2 = math.log(1 + (self.spread_ms / self.mean_ms) ** 2)
+            value = rng.lognormvariate(math.log(self.mean_ms) - sigma2 / 2, math.sqrt(sigma2))
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / self.mean_ms)
+        else:
+            value = self.mean_ms
+        return max(0.0, value) / 1000
+
+
+@dataclass
+class StandInConfig:
+    ttft: LatencyDistribution = field(default_factory=LatencyDistribution)
+    tokens_per_second: float = 0.0  # 0 = sin límite
+    embedding_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_concurrency: int = 0  # 0 = sin límite
+    canned_sql: List[Tuple[str, str]] = field(default_factory=lambda: list(CANNED_SQL))
+    rag_answer: str = CANNED_RAG_ANSWER
+    seed: int = 42
+
+
+def _error(status_code: int, message: str, error_type: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Error con el formato de la API de OpenAI"""
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "param": None, "code": None}},
+        status_code=status_code, headers=headers,
+    )
+
+
+def _count_tokens(text: str) -> int:
+    """Aproximación de tokens: palabras y signos"""
+    return max(1, len(text.split()))
+
+
+def _tokenize_output(text: str) -> List[str]:
+    """Trozos de la respuesta que se emiten uno por token en streaming"""
+    words = text.split(" ")
+    return [word if position == 0 else f" {word}" for position, word in enumerate(words)]
+
+
+class AdmissionMiddleware:
+    """
+    Cuenta las peticiones /v1/ en curso y rechaza con 429 por encima de max_concurrency.
+
+    Middleware ASGI puro: una respuesta en streaming cuenta como activa hasta que
+    se envía su último fragmento, no solo hasta las cabeceras.
+    """
+
+    def __init__(self, app, config: StandInConfig, stats: Dict[str, int]):
+        self.app = app
+        self.config = config
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/v1/"):
+            await self.app(scope, receive, send)
+            return
+        self.stats["requests"] += 1
+        if self.config.max_concurrency and self.stats["active"] >= self.config.max_concurrency:
+            self.stats["overload_429"] += 1
+            response = _error(429, "Demasiadas peticiones en curso", "rate_limit_exceeded", {"retry-after": "1"})
+            await response(scope, receive, send)
+            return
+        self.stats["active"] += 1
+        self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.stats["active"] -= 1
+            self.stats["completed"] += 1
+
+
+def create_app(config: StandInConfig) -> FastAPI:
+    """Aplicación FastAPI con los endpoints compatibles con OpenAI"""
+    app = FastAPI(title="AInstalia - Servidor LLM local")
+    rng = random.Random(config.seed)
+    embedder = HashingEmbedder()
+    stats = {"requests": 0, "completed": 0, "injected_errors": 0, "injected_429": 0, "overload_429": 0,
+             "active": 0, "max_active": 0}
+    app.add_middleware(AdmissionMiddleware, config=config, stats=stats)
+
+    def answer_for(messages: Sequence[Dict[str, Any]]) -> str:
+        """Respuesta determinista según el tipo de prompt"""
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        if RAG_PROMPT_MARKER in prompt:
+            return config.rag_answer
+        if any(marker in prompt for marker in SQL_PROMPT_MARKERS):
+            # Pregunta enlatada presente en el prompt; si no, la que más palabras comparte
+            sql = next((sql for question, sql in config.canned_sql if question in prompt), None)
+            if sql is None:
+                words = set(HashingEmbedder.tokens(prompt))
+                sql = max(config.canned_sql, key=lambda item: len(words & set(HashingEmbedder.tokens(item[0]))))[1]
+            # Formato ReAct: el agente de LangChain lo toma como respuesta final
+            return f"Thought: Ya tengo la consulta.\nFinal Answer: ```sql\n{sql}\n```"
+        return CANNED_CHAT_ANSWER
+
+    def inject_failure() -> Optional[JSONResponse]:
+        """Fallo aleatorio (500 o 429) según las tasas configuradas"""
+        draw = rng.random()
+        if draw < config.error_rate:
+            stats["injected_errors"] += 1
+            return _error(500, "Error interno simulado", "server_error")
+        if draw < config.error_rate + config.rate_limit_rate:
+            stats["injected_429"] += 1
+            return _error(429, "Rate limit simulado", "rate_limit_exceeded", {"retry-after": "1"})
+        return None
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [
+            {"id": model, "object": "model", "created": 0, "owned_by": "ainstalia-local"}
+            for model in ("gpt-4-turbo-preview", "gpt-3.5-turbo", "text-embedding-3-small")
+        ]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = inject_failure()
+        if failure is not None:
+            return failure
+
+        content = answer_for(body.get("messages", []))
+        model = body.get("model", "gpt-3.5-turbo")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        prompt_tokens = sum(_count_tokens(str(message.get("content") or "")) for message in body.get("messages", []))
+        completion_tokens = _count_tokens(content)
+        token_delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+        await asyncio.sleep(config.ttft.sample(rng))
+
+        if not body.get("stream"):
+            await asyncio.sleep(token_delay * completion_tokens)
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        async def events() -> AsyncIterator[bytes]:
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in _tokenize_output(content):
+                await asyncio.sleep(token_delay)
+                yield chunk({"content": piece})
+            yield chunk({}, "stop")
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        failure = inject_failure()
+        if failure is not None:
+            return failure
+
+        inputs = body.get("input", [])
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        # Entradas ya tokenizadas (listas de enteros): se embebe su representación textual
+        texts = [text if isinstance(text, str) else " ".join(map(str, text)) for text in inputs]
+        await asyncio.sleep(config.embedding_latency.sample(rng))
+        vectors = embedder.embed_many(texts)
+        as_base64 = body.get("encoding_format") == "base64"
+        return {
+            "object": "list",
+            "model": body.get("model", "text-embedding-3-small"),
+            "data": [
+                {"object": "embedding", "index": index,
+                 "embedding": base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii") if as_base64 else vector.tolist()}
+                for index, vector in enumerate(vectors)
+            ],
+            "usage": {"prompt_tokens": sum(map(_count_tokens, texts)), "total_tokens": sum(map(_count_tokens, texts))},
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def load_answers(path: Path) -> Dict[str, Any]:
+    """Respuestas enlatadas de un JSON: {"sql": [[pregunta, sql], ...], "rag": "respuesta"}"""
+    answers = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        "canned_sql": [tuple(item) for item in answers.get("sql", CANNED_SQL)],
+        "rag_answer": answers.get("rag", CANNED_RAG_ANSWER),
+    }
+
+
+def main() -> int:
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Servidor local compatible con OpenAI para pruebas de carga")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha")
+    parser.add_argument("--port", type=int, default=8100, help="Puerto de escucha")
+    parser.add_argument("--ttft", type=LatencyDistribution.parse, default=LatencyDistribution("lognormal", 500, 200),
+                        help="Latencia hasta el primer token: tipo:media_ms[:dispersión_ms]")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Velocidad de generación (0 = instantánea)")
+    parser.add_argument("--embedding-latency", type=LatencyDistribution.parse, default=LatencyDistribution("normal", 40, 10),
+                        help="Latencia por petición de embeddings: tipo:media_ms[:dispersión_ms]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de peticiones con error 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fracción de peticiones con 429 aleatorio")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Peticiones simultáneas antes de responder 429 (0 = sin límite)")
+    parser.add_argument("--answers", type=Path, help="JSON con respuestas enlatadas (sql y rag)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de latencias y fallos inyectados")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError as e:
+        logger.error(f"❌ uvicorn no disponible: {e}")
+        return 1
+
+    config = StandInConfig(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        embedding_latency=args.embedding_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+        **(load_answers(args.answers) if args.answers else {}),
+    )
+    logger.info(
+        f"🤖 Servidor LLM local en http://{args.host}:{args.port}/v1 "
+        f"(ttft {config.ttft.kind}:{config.ttft.mean_ms:g}ms, {config.tokens_per_second:g} tokens/s, "
+        f"errores {config.error_rate:.1%}, 429 {config.rate_limit_rate:.1%}, concurrencia máx. {config.max_concurrency or '∞'})"
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,49 @@
 """
 Script optimizado para cargar datos desde archivos CSV a la base de datos PostgreSQL.
 Versión mejorada con logging, validaciones y orden correcto de carga.
+
+Modos de carga (--mode):
+- copy (por defecto en PostgreSQL): cada CSV se lee en streaming, se normalizan los
+  tipos fila a fila y se envía con COPY ... FROM STDIN, sin DataFrames ni INSERT.
+- insert: pandas + to_sql con INSERT multi-fila (cualquier base de datos).
+- stream: lectura por bloques con memoria acotada, validación fila a fila con las
+  filas rechazadas en un fichero aparte (--rejects-dir), upsert sobre la clave
+  primaria (ON CONFLICT) en lugar de vaciar las tablas, y checkpoint por bloque
+  para reanudar una carga interrumpida (--resume).
+- delta: sincronización incremental. Las tablas cuyo CSV no ha cambiado (SHA-256
+  guardado en --manifest) se saltan; el resto se vuelca a una tabla temporal y solo
+  se aplican las filas nuevas, modificadas o eliminadas (INSERT ... ON CONFLICT con
+  IS DISTINCT FROM y DELETE ... WHERE NOT EXISTS), sin TRUNCATE ni bloqueos de tabla.
+
+Las tablas se cargan por niveles derivados de las dependencias declaradas en
+csv_mapping; las de un mismo nivel, en paralelo con conexiones separadas (--workers).
+
+Uso:
+    python scripts/load_data.py [--mode copy|insert|stream] [--workers 4]
+    python scripts/load_data.py --mode stream --chunk-size 10000 --resume
+    python scripts/load_data.py --mode delta
+    python scripts/load_data.py --data-dir data/synthetic/x100
 """
+import argparse
+import csv
+import hashlib
+import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, Float, Integer, MetaData, Numeric, Table, UniqueConstraint,
+    and_, create_engine, delete, exists, func, inspect, or_, select, text, true
+)
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 
 # Agregar el directorio padre al path para importar configuración
@@ -18,6 +53,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 try:
     from backend.core.config import settings
     from backend.core.logging import get_logger
+    from backend.crud.intervention_crud import rebuild_workload_statements
 except ImportError as e:
     print(f"❌ Error importando dependencias: {e}")
     print("💡 Asegúrate de ejecutar desde el directorio raíz del proyecto")
@@ -26,39 +62,233 @@ except ImportError as e:
 # Configurar logger
 logger = get_logger("ainstalia.data_loader")
 
+# Valores del CSV que se cargan como NULL (los mismos que na_values en el modo insert)
+NULL_VALUES = {"", "NULL", "null", "None", "NaN", "nan"}
+# Tamaño de los bloques que se entregan a COPY
+COPY_BUFFER_SIZE = 1 << 16
+
+LOAD_MODES = ("copy", "insert", "stream", "delta")
+
+
+def _coerce_integer(value: str) -> str:
+    """Enteros exportados como flotantes ("3.0") se aceptan si no tienen parte decimal"""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"valor entero inválido: {value!r}")
+    return str(int(number))
+
+
+def _coerce_boolean(value: str) -> str:
+    lowered = value.strip().lower()
+    if lowered in ("true", "t", "1", "yes", "si", "sí"):
+        return "t"
+    if lowered in ("false", "f", "0", "no"):
+        return "f"
+    raise ValueError(f"valor booleano inválido: {value!r}")
+
+
+def _coerce_numeric(value: str) -> str:
+    float(value)  # Solo valida; se envía el texto original para no perder precisión
+    return value.strip()
+
+
+# Normalización por tipo de columna (information_schema.columns.data_type)
+COERCERS: Dict[str, Callable[[str], str]] = {
+    "smallint": _coerce_integer,
+    "integer": _coerce_integer,
+    "bigint": _coerce_integer,
+    "boolean": _coerce_boolean,
+    "numeric": _coerce_numeric,
+    "real": _coerce_numeric,
+    "double precision": _coerce_numeric,
+}
+
+
+def _copy_escape(value: str) -> str:
+    """Escapa un valor para el formato de texto de COPY"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _to_boolean(value: str) -> bool:
+    return _coerce_boolean(value) == "t"
+
+
+def _python_converter(column: Column) -> Callable[[str], Any]:
+    """Conversión de texto del CSV al tipo Python de la columna (modo stream)"""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return _to_boolean
+    if isinstance(column_type, Integer):
+        return lambda value: int(_coerce_integer(value))
+    if isinstance(column_type, Float):
+        return float
+    if isinstance(column_type, Numeric):
+        return lambda value: Decimal(_coerce_numeric(value)) if column_type.asdecimal else float(value)
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column_type, Date):
+        return date.fromisoformat
+    if isinstance(column_type, JSON):
+        return json.loads
+    return str
+
+
+class LoadCheckpoint:
+    """
+    Progreso de las cargas en streaming, guardado en JSON tras cada bloque: por
+    tabla, registros del CSV ya confirmados y huella del fichero (tamaño y mtime)
+    para no reanudar sobre un fichero distinto.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                self.tables = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"⚠️  Checkpoint ilegible, se ignora: {path}")
+
+    @staticmethod
+    def fingerprint(file_path: Path) -> Dict[str, Any]:
+        stat = file_path.stat()
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    def get(self, table_name: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Progreso guardado de la tabla, si corresponde al mismo fichero"""
+        entry = self.tables.get(table_name)
+        if entry and entry.get("file") == self.fingerprint(file_path):
+            return entry
+        return None
+
+    def update(self, table_name: str, file_path: Path, **progress: Any) -> None:
+        with self._lock:
+            self.tables[table_name] = {"file": self.fingerprint(file_path), **progress}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(self.tables, indent=2), encoding="utf-8")
+            temporary.replace(self.path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.tables = {}
+            self.path.unlink(missing_ok=True)
+
+
+class RejectsWriter:
+    """CSV de filas rechazadas (registro, motivo y valores originales); se crea solo si hay rechazos"""
+
+    def __init__(self, path: Path, header: Sequence[str], append: bool = False):
+        self.path = path
+        self.header = ["_record", "_error", *header]
+        self.append = append and path.exists()
+        self.count = 0
+        self._handle = None
+        self._writer = None
+
+    def write(self, record: int, row: Sequence[str], error: str) -> None:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "a" if self.append else "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._handle)
+            if not self.append:
+                self._writer.writerow(self.header)
+        self._writer.writerow([record, error, *row])
+        self.count += 1
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+
+
+class CopyStream:
+    """
+    Objeto tipo fichero (read/readline) sobre un iterador de líneas en formato de
+    texto de COPY, para psycopg2 `copy_expert`: el CSV nunca se carga entero en memoria.
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        size = COPY_BUFFER_SIZE if size is None or size < 0 else size
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if length >= size:
+                break
+        data = "".join(chunks)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            return line
+        return next(self._lines, "")
+
+
 class DataLoader:
     """Cargador optimizado de datos CSV con validaciones y logging"""
     
-    def __init__(self):
-        self.data_dir = Path(__file__).parent.parent / "data"
+    def __init__(
+        self,
+        mode: str = "copy",
+        workers: int = 4,
+        chunk_size: int = 10000,
+        rejects_dir: Optional[Path] = None,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = False,
+        manifest_path: Optional[Path] = None,
+        data_dir: Optional[Path] = None
+    ):
+        self.data_dir = data_dir or Path(__file__).parent.parent / "data"
         self.engine = None
+        self.mode = mode
+        self.workers = workers
+        
+        # Modo stream
+        self.chunk_size = chunk_size
+        self.rejects_dir = rejects_dir or self.data_dir / "rejects"
+        self.checkpoint = LoadCheckpoint(checkpoint_path or self.data_dir / ".load_checkpoint.json")
+        self.resume = resume
+        
+        # Modo delta: huella (SHA-256) de cada CSV sincronizado
+        self.manifest_path = manifest_path or self.data_dir / ".load_manifest.json"
+        self._stats_lock = threading.Lock()
         
-        # Mapeo correcto de archivos CSV a tablas (orden importante por foreign keys)
+        # Mapeo de archivos CSV a tablas con las tablas de las que dependen (foreign keys).
+        # Las tablas se cargan por niveles: cada nivel en paralelo, tras el anterior.
         self.csv_mapping = [
-            # Tablas independientes primero
-            ("clients.csv", "clients"),
-            ("products.csv", "products"),
-            ("technicians.csv", "technicians"),
-            ("warehouses.csv", "warehouses"),
+            # Tablas independientes
+            ("clients.csv", "clients", ()),
+            ("products.csv", "products", ()),
+            ("technicians.csv", "technicians", ()),
+            ("warehouses.csv", "warehouses", ()),
+            ("knowledge_feedback.csv", "knowledge_feedback", ()),
             
             # Tablas que dependen de las anteriores
-            ("installed_equipment.csv", "installed_equipment"),  # Depende de clients, products
-            ("stock.csv", "stock"),  # Depende de products, warehouses
-            ("contracts.csv", "contracts"),  # Depende de clients
-            ("orders.csv", "orders"),  # Depende de clients
-            
-            # Tablas que dependen de orders
-            ("order_items.csv", "order_items"),  # Depende de orders, products
-            
-            # Tablas que dependen de equipment
-            ("interventions.csv", "interventions"),  # Depende de technicians, clients, equipment
+            ("installed_equipment.csv", "installed_equipment", ("clients", "products")),
+            ("stock.csv", "stock", ("products", "warehouses")),
+            ("contracts.csv", "contracts", ("clients",)),
+            ("orders.csv", "orders", ("clients",)),
             
-            # Tablas de chat (dependen de orders, clients)
-            ("chat_sessions.csv", "chat_sessions"),
-            ("chat_messages.csv", "chat_messages"),
+            # Tablas que dependen de orders y equipment
+            ("order_items.csv", "order_items", ("orders", "products")),
+            ("interventions.csv", "interventions", ("technicians", "clients", "installed_equipment")),
             
-            # Tabla independiente al final
-            ("knowledge_feedback.csv", "knowledge_feedback")
+            # Tablas de chat
+            ("chat_sessions.csv", "chat_sessions", ("orders", "clients")),
+            ("chat_messages.csv", "chat_messages", ("chat_sessions",)),
         ]
         
         self.stats = {
@@ -66,7 +296,10 @@ class DataLoader:
             "total_records": 0,
             "errors": 0,
             "start_time": None,
-            "end_time": None
+            "end_time": None,
+            "tables": {},  # tabla → {"records", "seconds", "rows_per_second"}
+            "tiers": [],  # [{"tables", "seconds"}] en orden de carga
+            "delta": {}  # tabla → {"inserted", "updated", "deleted", "rejected"} (modo delta)
         }
     
     def _validate_environment(self) -> bool:
@@ -85,7 +318,7 @@ class DataLoader:
             
         # Verificar archivos CSV
         missing_files = []
-        for csv_file, _ in self.csv_mapping:
+        for csv_file, _, _ in self.csv_mapping:
             file_path = self.data_dir / csv_file
             if not file_path.exists():
                 missing_files.append(csv_file)
@@ -101,10 +334,11 @@ class DataLoader:
         try:
             logger.info("🔌 Conectando a la base de datos...")
             self.engine = create_engine(
-                settings.DATABASE_URL,
+                self._sync_database_url(settings.DATABASE_URL),
                 echo=False,
                 pool_pre_ping=True,
-                pool_recycle=3600
+                pool_recycle=3600,
+                **self._pool_options()
             )
             
             # Probar conexión
@@ -113,13 +347,598 @@ class DataLoader:
                 result.scalar()
             
             logger.info("✅ Conexión a base de datos establecida")
+            if self.mode == "delta" and self.engine.dialect.name not in ("postgresql", "sqlite"):
+                logger.error(f"❌ El modo delta necesita INSERT ... ON CONFLICT (PostgreSQL o SQLite), no {self.engine.dialect.name}")
+                return False
+            if self.engine.dialect.name != "postgresql":
+                if self.mode == "copy":
+                    logger.warning(f"⚠️  COPY solo está disponible en PostgreSQL; usando modo insert con {self.engine.dialect.name}")
+                    self.mode = "insert"
+                # SQLite no admite escrituras concurrentes
+                self.workers = 1
             return True
             
         except Exception as e:
             logger.error(f"❌ Error conectando a la base de datos: {e}")
             return False
     
-    def _load_single_csv(self, csv_file: str, table_name: str) -> Tuple[bool, int]:
+    def _pool_options(self) -> Dict[str, int]:
+        """Una conexión por worker (más la de verificación); SQLite no usa QueuePool"""
+        if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+            return {}
+        return {"pool_size": max(self.workers, 1) + 1, "max_overflow": 0}
+    
+    def _load_tiers(self) -> List[List[Tuple[str, str]]]:
+        """
+        Agrupa csv_mapping en niveles según las dependencias declaradas: cada tabla va
+        en el primer nivel posterior a todos los de sus dependencias.
+        """
+        pending = {table: (csv_file, set(deps)) for csv_file, table, deps in self.csv_mapping}
+        unknown = {dep for _, deps in pending.values() for dep in deps} - set(pending)
+        if unknown:
+            raise ValueError(f"Dependencias no incluidas en csv_mapping: {sorted(unknown)}")
+        
+        tiers: List[List[Tuple[str, str]]] = []
+        loaded = set()
+        while pending:
+            ready = [table for table, (_, deps) in pending.items() if deps <= loaded]
+            if not ready:
+                raise ValueError(f"Dependencias circulares entre: {sorted(pending)}")
+            tiers.append([(pending.pop(table)[0], table) for table in ready])
+            loaded.update(ready)
+        return tiers
+    
+    def _check_dependencies(self) -> None:
+        """Avisa si la base de datos tiene foreign keys no declaradas en csv_mapping"""
+        declared = {table: set(deps) for _, table, deps in self.csv_mapping}
+        inspector = inspect(self.engine)
+        for table, deps in declared.items():
+            try:
+                foreign_keys = inspector.get_foreign_keys(table)
+            except Exception:
+                continue
+            referred = {fk["referred_table"] for fk in foreign_keys} & set(declared)
+            missing = referred - deps - {table}
+            if missing:
+                logger.warning(f"⚠️  {table} referencia {sorted(missing)} sin declararlo en csv_mapping")
+    
+    def _truncate_tables(self, table_names: List[str]) -> None:
+        """
+        Vacía todas las tablas a recargar en una sola sentencia antes de empezar: con
+        cargas en paralelo, los TRUNCATE ... CASCADE por tabla se bloquearían entre sí.
+        """
+        if not table_names:
+            return
+        with self.engine.begin() as conn:
+            if self.engine.dialect.name == "postgresql":
+                conn.execute(text(f"TRUNCATE TABLE {', '.join(table_names)} RESTART IDENTITY CASCADE"))
+            else:
+                for table_name in reversed(table_names):
+                    conn.execute(text(f"DELETE FROM {table_name}"))
+        logger.info(f"🧹 Tablas vaciadas: {', '.join(table_names)}")
+    
+    def _refresh_derived_tables(self, loaded_tables: List[str]) -> None:
+        """Recalcula las tablas derivadas de las cargadas (vaciadas por el TRUNCATE ... CASCADE)"""
+        if "interventions" not in loaded_tables:
+            return
+        with self.engine.begin() as conn:
+            for statement in rebuild_workload_statements():
+                conn.execute(statement)
+        logger.info("🔁 Índice de carga de técnicos recalculado")
+    
+    def _load_tier(self, tier: List[Tuple[str, str]]) -> List[Tuple[str, bool, int]]:
+        """Carga las tablas de un nivel en paralelo, cada una con su propia conexión"""
+        load_csv = {
+            "copy": self._copy_single_csv,
+            "insert": self._load_single_csv,
+            "stream": self._stream_single_csv,
+        }[self.mode]
+        if self.workers <= 1 or len(tier) == 1:
+            return [(table, *load_csv(csv_file, table, truncate=False)) for csv_file, table in tier]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(tier)), thread_name_prefix="loader") as executor:
+            futures = [(table, executor.submit(load_csv, csv_file, table, truncate=False)) for csv_file, table in tier]
+            return [(table, *future.result()) for table, future in futures]
+    
+    def _count_error(self) -> None:
+        with self._stats_lock:
+            self.stats["errors"] += 1
+    
+    @staticmethod
+    def _sync_database_url(database_url: str) -> str:
+        """El script es síncrono: los drivers asíncronos (asyncpg, aiosqlite) se sustituyen"""
+        url = make_url(database_url)
+        if url.drivername in ("postgresql", "postgresql+asyncpg", "postgresql+psycopg"):
+            url = url.set(drivername="postgresql+psycopg2")
+        elif url.drivername == "sqlite+aiosqlite":
+            url = url.set(drivername="sqlite")
+        return url.render_as_string(hide_password=False)
+    
+    def _record_table_stats(self, table_name: str, records: int, seconds: float) -> None:
+        """Guarda y muestra el rendimiento de carga de una tabla"""
+        rows_per_second = records / seconds if seconds > 0 else 0.0
+        with self._stats_lock:
+            self.stats["tables"][table_name] = {
+                "records": records,
+                "seconds": round(seconds, 3),
+                "rows_per_second": round(rows_per_second, 1)
+            }
+        logger.info(f"   ⚡ {table_name}: {records:,} registros en {seconds:.2f}s ({rows_per_second:,.0f} filas/s)")
+    
+    def _column_types(self, conn, table_name: str) -> Dict[str, str]:
+        """Tipos de las columnas de una tabla (information_schema)"""
+        rows = conn.execute(text(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND table_schema = current_schema()"
+        ), {"table": table_name}).all()
+        return {column: data_type for column, data_type in rows}
+    
+    def _copy_lines(self, reader: Iterator[List[str]], coercers: List[Optional[Callable[[str], str]]], counter: Dict[str, int]) -> Iterator[str]:
+        """
+        Convierte filas CSV en líneas de COPY normalizando tipos en una sola pasada.
+        Las líneas con un número de columnas distinto se saltan (como on_bad_lines='skip').
+        """
+        width = len(coercers)
+        for line_number, row in enumerate(reader, start=2):
+            if len(row) != width:
+                counter["skipped"] += 1
+                continue
+            values = []
+            for value, coerce in zip(row, coercers):
+                if value in NULL_VALUES:
+                    values.append("\\N")
+                    continue
+                try:
+                    values.append(_copy_escape(coerce(value) if coerce else value))
+                except ValueError as e:
+                    raise ValueError(f"línea {line_number}: {e}") from None
+            counter["records"] += 1
+            yield "\t".join(values) + "\n"
+    
+    def _copy_single_csv(self, csv_file: str, table_name: str, truncate: bool = True) -> Tuple[bool, int]:
+        """Carga un CSV con COPY ... FROM STDIN en streaming (una transacción por tabla)"""
+        file_path = self.data_dir / csv_file
+        
+        if not file_path.exists():
+            logger.warning(f"⚠️  Archivo no encontrado: {csv_file}")
+            return False, 0
+        
+        logger.info(f"📁 Cargando {csv_file} → tabla {table_name} (COPY)")
+        start = time.perf_counter()
+        raw_connection = self.engine.raw_connection()
+        try:
+            with open(file_path, encoding="utf-8", newline="") as handle:
+                reader = csv.reader(handle, skipinitialspace=True)
+                header = next(reader, None)
+                if not header:
+                    logger.warning(f"   ⚠️  Archivo {csv_file} está vacío")
+                    return True, 0
+                
+                with self.engine.connect() as conn:
+                    column_types = self._column_types(conn, table_name)
+                unknown = [column for column in header if column not in column_types]
+                if unknown:
+                    raise ValueError(f"columnas inexistentes en {table_name}: {unknown}")
+                coercers = [COERCERS.get(column_types[column]) for column in header]
+                
+                counter = {"records": 0, "skipped": 0}
+                columns = ", ".join(f'"{column}"' for column in header)
+                cursor = raw_connection.cursor()
+                if truncate:
+                    cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE")
+                cursor.copy_expert(
+                    f"COPY {table_name} ({columns}) FROM STDIN",
+                    CopyStream(self._copy_lines(reader, coercers, counter)),
+                    size=COPY_BUFFER_SIZE
+                )
+                raw_connection.commit()
+            
+            record_count = counter["records"]
+            if counter["skipped"]:
+                logger.warning(f"   ⚠️  {counter['skipped']} líneas malformadas omitidas en {csv_file}")
+            logger.info(f"   ✅ {table_name} cargada exitosamente ({record_count} registros)")
+            self._record_table_stats(table_name, record_count, time.perf_counter() - start)
+            return True, record_count
+            
+        except Exception as e:
+            raw_connection.rollback()
+            logger.error(f"   ❌ Error cargando {csv_file} con COPY: {e}")
+            self._count_error()
+            return False, 0
+        
+        finally:
+            raw_connection.close()
+    
+    @staticmethod
+    def _conflict_key(table: Table, columns: Sequence[str]) -> Optional[List[str]]:
+        """Clave del upsert: la primaria o, si no viene en el CSV, una única cuyas columnas sí vengan"""
+        candidates = [[column.name for column in table.primary_key.columns]]
+        candidates += [
+            [column.name for column in index.columns] for index in table.indexes if index.unique
+        ]
+        candidates += [
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+        ]
+        for key in candidates:
+            if key and all(column in columns for column in key):
+                return key
+        return None
+    
+    def _upsert_statement(self, table: Table, columns: Sequence[str], key: Optional[List[str]]):
+        """INSERT ... ON CONFLICT (clave) DO UPDATE en PostgreSQL y SQLite; INSERT simple sin clave"""
+        dialect = self.engine.dialect.name
+        if key is None or dialect not in ("postgresql", "sqlite"):
+            return table.insert()
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(table)
+        updates = {column: statement.excluded[column] for column in columns if column not in key}
+        if not updates:
+            return statement.on_conflict_do_nothing(index_elements=key)
+        return statement.on_conflict_do_update(index_elements=key, set_=updates)
+    
+    @staticmethod
+    def _convert_row(
+        row: Sequence[str], header: Sequence[str], converters: Sequence[Callable[[str], Any]], required: Sequence[bool]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Valida y convierte una fila; devuelve (registro, None) o (None, motivo del rechazo)"""
+        if len(row) != len(header):
+            return None, f"{len(row)} columnas, se esperaban {len(header)}"
+        record = {}
+        for column, value, convert, is_required in zip(header, row, converters, required):
+            if value in NULL_VALUES:
+                if is_required:
+                    return None, f"{column}: valor obligatorio"
+                record[column] = None
+                continue
+            try:
+                record[column] = convert(value)
+            except (ValueError, TypeError) as e:
+                return None, f"{column}: {e}"
+        return record, None
+    
+    def _write_chunk(self, statement, chunk: List[Tuple[int, Sequence[str], Dict[str, Any]]], rejects: RejectsWriter) -> int:
+        """
+        Escribe un bloque en una transacción. Si la base de datos lo rechaza (foreign
+        key, CHECK...) se reintenta fila a fila con savepoints y las fallidas van a rechazos.
+        """
+        with self.engine.begin() as conn:
+            try:
+                with conn.begin_nested():
+                    conn.execute(statement, [record for _, _, record in chunk])
+                return len(chunk)
+            except SQLAlchemyError:
+                pass
+            written = 0
+            for record_number, row, record in chunk:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(statement, [record])
+                    written += 1
+                except SQLAlchemyError as e:
+                    rejects.write(record_number, row, str(getattr(e, "orig", e)).splitlines()[0])
+            return written
+    
+    def _keyless_tables(self, tiers: List[List[Tuple[str, str]]]) -> List[str]:
+        """Tablas cuyo CSV no trae la clave primaria ni una única: no admiten upsert"""
+        keyless = []
+        for tier in tiers:
+            for csv_file, table_name in tier:
+                file_path = self.data_dir / csv_file
+                if not file_path.exists():
+                    continue
+                with open(file_path, encoding="utf-8", newline="") as handle:
+                    header = next(csv.reader(handle, skipinitialspace=True), None) or []
+                table = Table(table_name, MetaData(), autoload_with=self.engine)
+                if self._conflict_key(table, header) is None:
+                    keyless.append(table_name)
+        return keyless
+    
+    def _stream_single_csv(self, csv_file: str, table_name: str, truncate: bool = False) -> Tuple[bool, int]:
+        """
+        Carga un CSV por bloques de chunk_size filas con upsert, rechazos a fichero y
+        checkpoint por bloque. La memoria usada depende del bloque, no del fichero.
+        """
+        file_path = self.data_dir / csv_file
+        
+        if not file_path.exists():
+            logger.warning(f"⚠️  Archivo no encontrado: {csv_file}")
+            return False, 0
+        
+        progress = self.checkpoint.get(table_name, file_path) if self.resume else None
+        if progress and progress.get("done"):
+            logger.info(f"⏭️  {table_name}: ya cargada según el checkpoint ({progress['loaded']:,} registros)")
+            return True, 0
+        start_record = progress["records"] if progress else 0
+        loaded_before = loaded = progress["loaded"] if progress else 0
+        
+        logger.info(f"📁 Cargando {csv_file} → tabla {table_name} (stream, bloques de {self.chunk_size:,})")
+        if start_record:
+            logger.info(f"   ↪️  Reanudando tras el registro {start_record:,}")
+        start = time.perf_counter()
+        rejects = None
+        try:
+            table = Table(table_name, MetaData(), autoload_with=self.engine)
+            with open(file_path, encoding="utf-8", newline="") as handle:
+                reader = csv.reader(handle, skipinitialspace=True)
+                header = next(reader, None)
+                if not header:
+                    logger.warning(f"   ⚠️  Archivo {csv_file} está vacío")
+                    return True, 0
+                unknown = [column for column in header if column not in table.c]
+                if unknown:
+                    raise ValueError(f"columnas inexistentes en {table_name}: {unknown}")
+                
+                columns = [table.c[column] for column in header]
+                converters = [_python_converter(column) for column in columns]
+                required = [
+                    not column.nullable and column.server_default is None and column.default is None
+                    for column in columns
+                ]
+                key = self._conflict_key(table, header)
+                statement = self._upsert_statement(table, header, key)
+                rejects = RejectsWriter(self.rejects_dir / f"{table_name}.rejects.csv", header, append=start_record > 0)
+                rejected_before = progress["rejected"] if progress else 0
+                
+                record_number = start_record
+                for _ in islice(reader, start_record):
+                    pass
+                chunk: List[Tuple[int, Sequence[str], Dict[str, Any]]] = []
+                for row in reader:
+                    record_number += 1
+                    record, error = self._convert_row(row, header, converters, required)
+                    if error:
+                        rejects.write(record_number, row, error)
+                        continue
+                    chunk.append((record_number, row, record))
+                    if len(chunk) >= self.chunk_size:
+                        loaded += self._write_chunk(statement, chunk, rejects)
+                        chunk = []
+                        self.checkpoint.update(
+                            table_name, file_path, records=record_number, loaded=loaded,
+                            rejected=rejected_before + rejects.count, done=False
+                        )
+                if chunk:
+                    loaded += self._write_chunk(statement, chunk, rejects)
+                self.checkpoint.update(
+                    table_name, file_path, records=record_number, loaded=loaded,
+                    rejected=rejected_before + rejects.count, done=True
+                )
+            
+            if rejects.count:
+                logger.warning(f"   ⚠️  {rejects.count:,} filas rechazadas → {rejects.path}")
+            record_count = loaded - loaded_before
+            logger.info(f"   ✅ {table_name} cargada exitosamente ({record_count} registros)")
+            self._record_table_stats(table_name, record_count, time.perf_counter() - start)
+            return True, record_count
+            
+        except Exception as e:
+            logger.error(f"   ❌ Error cargando {csv_file} en streaming: {e}")
+            self._count_error()
+            return False, 0
+        
+        finally:
+            if rejects is not None:
+                rejects.close()
+    
+    @staticmethod
+    def _file_sha256(file_path: Path) -> str:
+        """Huella del fichero, leída por bloques"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except ValueError:
+            logger.warning(f"⚠️  Manifiesto ilegible, se sincronizan todas las tablas: {self.manifest_path}")
+            return {}
+    
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.manifest_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        temporary.replace(self.manifest_path)
+    
+    @staticmethod
+    def _positional_key(table: Table, columns: Sequence[str]) -> Optional[str]:
+        """
+        Clave entera autoincremental que no viene en el CSV: su valor es la posición del
+        registro, igual que al cargar la tabla vacía con RESTART IDENTITY (las
+        referencias de los demás CSV, p. ej. client_id, ya cuentan con ello).
+        """
+        primary_key = list(table.primary_key.columns)
+        if len(primary_key) == 1 and primary_key[0].name not in columns and isinstance(primary_key[0].type, Integer):
+            return primary_key[0].name
+        return None
+    
+    def _stage_delta(self, conn, csv_file: str, table_name: str) -> Dict[str, Any]:
+        """Vuelca el CSV a una tabla temporal con las mismas columnas (y la clave) que la tabla destino"""
+        table = Table(table_name, MetaData(), autoload_with=conn)
+        rejects = None
+        with open(self.data_dir / csv_file, encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle, skipinitialspace=True)
+            header = next(reader, None) or []
+            unknown = [column for column in header if column not in table.c]
+            if unknown:
+                raise ValueError(f"columnas inexistentes en {table_name}: {unknown}")
+            
+            key = self._conflict_key(table, header)
+            positional = None if key else self._positional_key(table, header)
+            if key is None and positional is None:
+                raise ValueError(f"{table_name}: el CSV no incluye clave primaria ni única")
+            key = key or [positional]
+            columns = [positional, *header] if positional else list(header)
+            
+            stage = Table(
+                f"_delta_{table_name}", MetaData(),
+                *[Column(column, table.c[column].type) for column in columns],
+                prefixes=["TEMPORARY"]
+            )
+            stage.drop(conn, checkfirst=True)
+            stage.create(conn)
+            
+            source = [table.c[column] for column in header]
+            converters = [_python_converter(column) for column in source]
+            required = [not column.nullable and column.server_default is None for column in source]
+            rejects = RejectsWriter(self.rejects_dir / f"{table_name}.rejects.csv", header)
+            chunk = []
+            try:
+                for record_number, row in enumerate(reader, start=1):
+                    record, error = self._convert_row(row, header, converters, required)
+                    if error:
+                        rejects.write(record_number, row, error)
+                        continue
+                    if positional:
+                        record[positional] = record_number
+                    chunk.append(record)
+                    if len(chunk) >= self.chunk_size:
+                        conn.execute(stage.insert(), chunk)
+                        chunk = []
+                if chunk:
+                    conn.execute(stage.insert(), chunk)
+            finally:
+                rejects.close()
+        
+        return {
+            "table": table, "stage": stage, "columns": columns, "key": key,
+            "positional": positional, "rejected": rejects.count, "rejects_path": rejects.path
+        }
+    
+    def _apply_delta_upserts(self, conn, staged: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Inserta las filas nuevas y actualiza solo las que cambian (IS DISTINCT FROM): las
+        filas idénticas no se reescriben. Devuelve (insertadas, actualizadas).
+        """
+        table, stage, columns, key = staged["table"], staged["stage"], staged["columns"], staged["key"]
+        key_match = and_(*[stage.c[column] == table.c[column] for column in key])
+        inserted = conn.execute(
+            select(func.count()).select_from(stage).where(~exists().where(key_match))
+        ).scalar()
+        
+        if self.engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        # WHERE true: SQLite necesita desambiguar INSERT ... SELECT ... ON CONFLICT
+        statement = dialect_insert(table).from_select(columns, select(*[stage.c[column] for column in columns]).where(true()))
+        value_columns = [column for column in columns if column not in key]
+        if value_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=key,
+                set_={column: statement.excluded[column] for column in value_columns},
+                where=or_(*[table.c[column].is_distinct_from(statement.excluded[column]) for column in value_columns])
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=key)
+        changed = conn.execute(statement).rowcount
+        
+        if staged["positional"] and self.engine.dialect.name == "postgresql":
+            # Los valores explícitos de la clave no avanzan la secuencia
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:table, :column), "
+                f"(SELECT COALESCE(MAX({staged['positional']}), 0) + 1 FROM {table.name}), false)"
+            ), {"table": table.name, "column": staged["positional"]})
+        return inserted, changed - inserted
+    
+    def _apply_delta_deletes(self, conn, staged: Dict[str, Any]) -> int:
+        """Elimina las filas que ya no están en el CSV"""
+        table, stage, key = staged["table"], staged["stage"], staged["key"]
+        key_match = and_(*[stage.c[column] == table.c[column] for column in key])
+        return conn.execute(delete(table).where(~exists().where(key_match))).rowcount
+    
+    def _sync_delta(self, tiers: List[List[Tuple[str, str]]]) -> Tuple[int, int, List[str]]:
+        """
+        Sincroniza solo las tablas cuyo CSV ha cambiado. Altas y cambios en orden de
+        dependencias y bajas en orden inverso (primero los hijos), todo con una sola
+        conexión para conservar las tablas temporales. Devuelve (tablas, cambios, tablas cambiadas).
+        """
+        manifest = self._read_manifest()
+        pending = []
+        for tier in tiers:
+            for csv_file, table_name in tier:
+                file_path = self.data_dir / csv_file
+                if not file_path.exists():
+                    logger.warning(f"⚠️  Archivo no encontrado, {table_name} no se sincroniza: {csv_file}")
+                    continue
+                digest = self._file_sha256(file_path)
+                if manifest.get(table_name, {}).get("sha256") == digest:
+                    logger.info(f"⏭️  {table_name}: sin cambios")
+                    continue
+                pending.append((csv_file, table_name, digest))
+        
+        if not pending:
+            logger.info("✅ Ninguna tabla ha cambiado")
+            return 0, 0, []
+        
+        start = time.perf_counter()
+        staged: Dict[str, Dict[str, Any]] = {}
+        timings: Dict[str, float] = {}
+        with self.engine.connect() as conn:
+            for csv_file, table_name, digest in pending:
+                logger.info(f"🔄 Sincronizando {csv_file} → tabla {table_name} (delta)")
+                table_start = time.perf_counter()
+                try:
+                    with conn.begin():
+                        entry = self._stage_delta(conn, csv_file, table_name)
+                        entry["inserted"], entry["updated"] = self._apply_delta_upserts(conn, entry)
+                except Exception as e:
+                    logger.error(f"   ❌ Error sincronizando {csv_file}: {e}")
+                    self._count_error()
+                    continue
+                entry["sha256"] = digest
+                staged[table_name] = entry
+                timings[table_name] = time.perf_counter() - table_start
+            
+            for table_name in reversed(list(staged)):
+                entry = staged[table_name]
+                table_start = time.perf_counter()
+                entry["deleted"] = 0
+                if entry["rejected"]:
+                    # Una fila rechazada falta en la tabla temporal: no debe borrarse la existente
+                    logger.warning(
+                        f"   ⚠️  {table_name}: {entry['rejected']:,} filas rechazadas → {entry['rejects_path']}; "
+                        "no se aplican bajas ni se actualiza el manifiesto"
+                    )
+                else:
+                    try:
+                        with conn.begin():
+                            entry["deleted"] = self._apply_delta_deletes(conn, entry)
+                    except Exception as e:
+                        logger.error(f"   ❌ Error eliminando filas de {table_name}: {e}")
+                        self._count_error()
+                        continue
+                    manifest[table_name] = {"sha256": entry["sha256"], "synced_at": datetime.utcnow().isoformat()}
+                    self._write_manifest(manifest)
+                timings[table_name] += time.perf_counter() - table_start
+            
+            for entry in staged.values():
+                entry["stage"].drop(conn, checkfirst=True)
+            conn.commit()
+        
+        total_changes = 0
+        for table_name, entry in staged.items():
+            changes = {field: entry.get(field, 0) for field in ("inserted", "updated", "deleted", "rejected")}
+            self.stats["delta"][table_name] = changes
+            total_changes += changes["inserted"] + changes["updated"] + changes["deleted"]
+            logger.info(
+                f"   ✅ {table_name}: +{changes['inserted']:,} ~{changes['updated']:,} -{changes['deleted']:,}"
+                + (f" ({changes['rejected']:,} rechazadas)" if changes["rejected"] else "")
+            )
+            self._record_table_stats(
+                table_name, changes["inserted"] + changes["updated"] + changes["deleted"], timings[table_name]
+            )
+        self.stats["tiers"].append({"tables": list(staged), "seconds": round(time.perf_counter() - start, 3)})
+        return len(staged), total_changes, list(staged)
+    
+    def _load_single_csv(self, csv_file: str, table_name: str, truncate: bool = True) -> Tuple[bool, int]:
         """Carga un archivo CSV individual"""
         file_path = self.data_dir / csv_file
         
@@ -130,6 +949,7 @@ class DataLoader:
         try:
             # Leer CSV con configuración optimizada y manejo de errores
             logger.info(f"📁 Cargando {csv_file} → tabla {table_name}")
+            start = time.perf_counter()
             
             df = pd.read_csv(
                 file_path,
@@ -147,30 +967,27 @@ class DataLoader:
                 logger.warning(f"   ⚠️  Archivo {csv_file} está vacío")
                 return True, 0
             
-            # Verificar si la tabla ya tiene datos
-            with self.engine.connect() as conn:
+            # Vaciado y carga en la misma transacción; to_sql recibe una conexión
+            # (pandas >= 2.2 ya no acepta un Engine de SQLAlchemy 2.0 < 2.0.29)
+            with self.engine.begin() as conn:
                 existing_count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
-                if existing_count > 0:
+                if existing_count > 0 and truncate:
                     logger.info(f"   📋 Tabla {table_name} ya tiene {existing_count} registros")
-                    # Usar 'append' siempre, pero limpiar datos primero con TRUNCATE
                     logger.info(f"   🧹 Limpiando tabla {table_name} antes de recargar...")
                     conn.execute(text(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE"))
-                    conn.commit()
-                    if_exists_mode = 'append'
-                else:
-                    if_exists_mode = 'append'
-            
-            # Cargar datos con configuración optimizada
-            df.to_sql(
-                table_name,
-                self.engine,
-                if_exists=if_exists_mode,
-                index=False,
-                method='multi',
-                chunksize=1000  # Procesar en lotes para mejorar rendimiento
-            )
+                
+                # Cargar datos con configuración optimizada
+                df.to_sql(
+                    table_name,
+                    conn,
+                    if_exists='append',
+                    index=False,
+                    method='multi',
+                    chunksize=1000  # Procesar en lotes para mejorar rendimiento
+                )
             
             logger.info(f"   ✅ {table_name} cargada exitosamente ({record_count} registros)")
+            self._record_table_stats(table_name, record_count, time.perf_counter() - start)
             return True, record_count
             
         except pd.errors.EmptyDataError:
@@ -195,7 +1012,8 @@ class DataLoader:
                 
                 record_count = len(df)
                 if record_count > 0:
-                    df.to_sql(table_name, self.engine, if_exists='append', index=False, method='multi')
+                    with self.engine.begin() as conn:
+                        df.to_sql(table_name, conn, if_exists='append', index=False, method='multi')
                     logger.info(f"   ✅ {table_name} cargada con modo permisivo ({record_count} registros)")
                     return True, record_count
                 else:
@@ -204,17 +1022,17 @@ class DataLoader:
                     
             except Exception as e2:
                 logger.error(f"   ❌ Error en carga permisiva de {csv_file}: {e2}")
-                self.stats["errors"] += 1
+                self._count_error()
                 return False, 0
             
         except SQLAlchemyError as e:
             logger.error(f"   ❌ Error SQL cargando {csv_file}: {e}")
-            self.stats["errors"] += 1
+            self._count_error()
             return False, 0
             
         except Exception as e:
             logger.error(f"   ❌ Error inesperado cargando {csv_file}: {e}")
-            self.stats["errors"] += 1
+            self._count_error()
             return False, 0
     
     def _verify_data_integrity(self) -> None:
@@ -225,7 +1043,7 @@ class DataLoader:
         tables_summary = []
         
         with self.engine.connect() as conn:
-            for csv_file, table_name in self.csv_mapping:
+            for csv_file, table_name, _ in self.csv_mapping:
                 try:
                     result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
                     count = result.scalar()
@@ -243,12 +1061,29 @@ class DataLoader:
         logger.info(f"\n📈 Total de registros en base de datos: {total_records:,}")
         self.stats["total_records"] = total_records
     
+    def _log_timing_summary(self) -> None:
+        """Tiempos por nivel y por tabla, y suma de tiempos por tabla frente al tiempo real"""
+        logger.info("\n⏱️  Tiempos de carga:")
+        for level, tier in enumerate(self.stats["tiers"], start=1):
+            logger.info(f"   Nivel {level} ({tier['seconds']:.2f}s):")
+            for table_name in tier["tables"]:
+                table = self.stats["tables"].get(table_name)
+                if table:
+                    logger.info(
+                        f"      {table_name}: {table['seconds']:.2f}s, "
+                        f"{table['records']:,} registros ({table['rows_per_second']:,.0f} filas/s)"
+                    )
+        sequential = sum(table["seconds"] for table in self.stats["tables"].values())
+        wall_clock = sum(tier["seconds"] for tier in self.stats["tiers"])
+        if wall_clock > 0:
+            logger.info(f"   Suma por tabla {sequential:.2f}s, tiempo real {wall_clock:.2f}s (x{sequential / wall_clock:.1f})")
+    
     def load_all_data(self) -> bool:
         """Método principal para cargar todos los datos"""
         self.stats["start_time"] = time.time()
         
         try:
-            logger.info("🚀 Iniciando carga optimizada de datos CSV...")
+            logger.info(f"🚀 Iniciando carga optimizada de datos CSV (modo {self.mode})...")
             
             # Validaciones previas
             if not self._validate_environment():
@@ -257,16 +1092,43 @@ class DataLoader:
             if not self._connect_database():
                 return False
             
-            # Cargar archivos en orden correcto
+            # Cargar por niveles de dependencia; las tablas de un nivel, en paralelo
+            tiers = self._load_tiers()
+            self._check_dependencies()
+            if self.mode == "stream":
+                # Upsert sobre las tablas existentes; solo se vacían las que no traen clave
+                # en el CSV (al reanudar ya se vaciaron en la ejecución interrumpida)
+                if not self.resume:
+                    self.checkpoint.clear()
+                    keyless = self._keyless_tables(tiers)
+                    if keyless:
+                        logger.warning(f"⚠️  Sin clave en el CSV, se vacían y recargan: {', '.join(keyless)}")
+                    self._truncate_tables(keyless)
+            elif self.mode != "delta":
+                self._truncate_tables([
+                    table for tier in tiers for csv_file, table in tier if (self.data_dir / csv_file).exists()
+                ])
             loaded_count = 0
             total_records = 0
+            loaded_tables = []
             
-            for csv_file, table_name in self.csv_mapping:
-                success, records = self._load_single_csv(csv_file, table_name)
-                if success:
-                    loaded_count += 1
-                    total_records += records
+            if self.mode == "delta":
+                loaded_count, total_records, loaded_tables = self._sync_delta(tiers)
+            else:
+                for level, tier in enumerate(tiers, start=1):
+                    logger.info(f"\n🧩 Nivel {level}: {', '.join(table for _, table in tier)} ({min(self.workers, len(tier))} en paralelo)")
+                    tier_start = time.perf_counter()
+                    for table_name, success, records in self._load_tier(tier):
+                        if success:
+                            loaded_count += 1
+                            total_records += records
+                            loaded_tables.append(table_name)
+                    self.stats["tiers"].append({
+                        "tables": [table for _, table in tier],
+                        "seconds": round(time.perf_counter() - tier_start, 3)
+                    })
             
+            self._refresh_derived_tables(loaded_tables)
             self.stats["loaded_files"] = loaded_count
             
             # Verificar integridad final
@@ -280,6 +1142,9 @@ class DataLoader:
             logger.info(f"📊 Archivos procesados: {loaded_count}/{len(self.csv_mapping)}")
             logger.info(f"📈 Total registros cargados: {total_records:,}")
             logger.info(f"⏱️  Tiempo total: {duration:.2f} segundos")
+            if total_records and duration > 0:
+                logger.info(f"⚡ Rendimiento global: {total_records / duration:,.0f} filas/s")
+            self._log_timing_summary()
             logger.info(f"❌ Errores: {self.stats['errors']}")
             
             return self.stats["errors"] == 0
@@ -295,7 +1160,32 @@ class DataLoader:
 
 def main():
     """Función principal del script"""
-    loader = DataLoader()
+    parser = argparse.ArgumentParser(description="Carga los CSV de data/ (o de --data-dir) en la base de datos")
+    parser.add_argument(
+        "--mode", choices=LOAD_MODES, default="copy",
+        help="copy: COPY en streaming (PostgreSQL); insert: pandas + INSERT multi-fila; stream: bloques con upsert y checkpoint; delta: solo filas cambiadas"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4,
+        help="Tablas cargadas en paralelo dentro de cada nivel de dependencias (1 = secuencial)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Filas por bloque (modo stream)")
+    parser.add_argument("--rejects-dir", type=Path, help="Directorio de filas rechazadas (modo stream; por defecto data/rejects)")
+    parser.add_argument("--checkpoint", type=Path, help="Fichero de checkpoint (modo stream; por defecto data/.load_checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="Reanudar una carga en streaming interrumpida")
+    parser.add_argument("--manifest", type=Path, help="Huellas de los CSV sincronizados (modo delta; por defecto data/.load_manifest.json)")
+    parser.add_argument("--data-dir", type=Path, help="Directorio de los CSV (por defecto data/; p. ej. los de generate_synthetic_data.py)")
+    args = parser.parse_args()
+    loader = DataLoader(
+        mode=args.mode,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        rejects_dir=args.rejects_dir,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        manifest_path=args.manifest,
+        data_dir=args.data_dir
+    )
     
     try:
         success = loader.load_all_data()
@@ -0,0 +1,62 @@
+"""
+Embeddings deterministas locales para benchmarks y pruebas de carga.
+
+Sin red ni modelo: cada palabra y cada bigrama del texto normalizado (minúsculas,
+sin tildes ni palabras vacías) se asigna por hash a una posición con signo de un
+vector de `dimensions` componentes, que se normaliza (L2). Textos que comparten
+vocabulario quedan cerca, de modo que la recuperación por similitud se comporta
+de forma razonable, y el resultado es idéntico entre ejecuciones y procesos.
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+STOPWORDS = frozenset(
+    "a al algo ante como con cual cuando de del desde donde el ella en entre es esta este esto hay la las "
+    "le lo los mas me mi muy no o para pero por que se ser si sin sobre su sus tambien te tu un una uno unos "
+    "y ya".split()
+)
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_][a-z0-9]+)*")
+
+
+class HashingEmbedder:
+    """Embedder determinista por hashing de palabras y bigramas"""
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        # Posición y signo por término (el vocabulario de un corpus es pequeño)
+        self._slots: Dict[str, Tuple[int, float]] = {}
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        """Palabras normalizadas, sin tildes ni palabras vacías"""
+        normalized = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+        return [token for token in TOKEN_PATTERN.findall(normalized) if token not in STOPWORDS]
+
+    def _slot(self, term: str) -> Tuple[int, float]:
+        slot = self._slots.get(term)
+        if slot is None:
+            digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+            slot = (int.from_bytes(digest[:4], "little") % self.dimensions, 1.0 if digest[4] & 1 else -1.0)
+            self._slots[term] = slot
+        return slot
+
+    def embed(self, text: str) -> np.ndarray:
+        """Vector float32 normalizado de un texto"""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        tokens = self.tokens(text)
+        for term in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            position, sign = self._slot(term)
+            vector[position] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Matriz (n, dimensions) con los vectores de varios textos"""
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix